@@ -1,11 +1,19 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+# Pack sounds/ and hexagram_images/ into one indexed file so the onefile build
+# extracts a single asset instead of dozens of loose files on every launch
+sys.path.insert(0, SPECPATH)
+from asset_pack import build_asset_pack
+build_asset_pack(os.path.join(SPECPATH, 'assets.hxpk'), SPECPATH)
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('sounds', 'sounds'), ('hexagram_images', 'hexagram_images')],
+    datas=[('assets.hxpk', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,182 @@
+"""Watchlist alerts fired when a level enters a hexagram and/or moving line.
+
+A level's state is block k = floor(counter / unit) of a periodic sequence, so
+"level L enters hexagram h" means entering any block k with k % 64 == h - 1
+(unit = one cycle), "enters line n" means k % 6 == n - 1 (unit = one line), and
+both together mean k % 384 == (h - 1) * 6 + n - 1. The next entry time follows
+from a few divisions, so every alert sits in a heap keyed by its next firing
+tick and an idle tick only looks at the heap top.
+
+Conditions that are not a fixed target (PredicateAlert) are indexed by the
+levels they read and only evaluated on the ticks where one of those levels
+changes hexagram or moving line.
+"""
+import heapq
+import itertools
+import threading
+import constants
+from hexagram_calculator import CYCLE_TICKS, LEVEL_COUNT, LINE_TICKS, datetime_to_ticks
+
+
+class Alert:
+	"""Fire when `level` enters `hexagram` and/or moving `line`.
+
+	Actions: `sound` is a SoundManager cue key (e.g. 'level3'), `osc_address`
+	gets `osc_value` sent to it, and `notify` shows a desktop notification.
+	"""
+
+	def __init__(self, level, hexagram=None, line=None, sound=None, osc_address=None, osc_value=True, notify=True, label=None):
+		if hexagram is None and line is None:
+			raise ValueError("An alert needs a hexagram, a line or both")
+		if not 1 <= level <= LEVEL_COUNT or not (hexagram is None or 1 <= hexagram <= 64) or not (line is None or 1 <= line <= 6):
+			raise ValueError("Level must be 1-6, hexagram 1-64 and line 1-6")
+		self.level = level
+		self.hexagram = hexagram
+		self.line = line
+		self.sound = sound
+		self.osc_address = osc_address
+		self.osc_value = osc_value
+		self.notify = notify
+		self.label = label or self.describe()
+		self.next_fire = None
+		# Block size, period in blocks and the block residue being watched
+		if line is None:
+			self.unit, self.period, self.residue = CYCLE_TICKS[level - 1], 64, hexagram - 1
+		elif hexagram is None:
+			self.unit, self.period, self.residue = LINE_TICKS[level - 1], 6, line - 1
+		else:
+			self.unit, self.period, self.residue = LINE_TICKS[level - 1], 384, (hexagram - 1) * 6 + line - 1
+
+	def describe(self):
+		parts = []
+		if self.hexagram is not None:
+			parts.append(f"hexagram {self.hexagram}")
+		if self.line is not None:
+			parts.append(f"line {self.line}")
+		return f"Level {self.level} enters {' and '.join(parts)}"
+
+	def next_entry(self, now_ticks, zero_ticks):
+		"""First tick after now_ticks (both ticks since the epoch) at which the watched block is entered"""
+		unit, period, residue = self.unit, self.period, self.residue
+		if now_ticks < zero_ticks:
+			# Counter falling: block k is entered at counter (k + 1) * unit - 1, i.e. t = zero - (k + 1) * unit + 1
+			latest = (zero_ticks - now_ticks) // unit - 1
+			block = latest - (latest - residue) % period
+			if block >= 0:
+				return zero_ticks - (block + 1) * unit + 1
+		# Counter rising: block k (k >= 1) is entered at t = zero + k * unit
+		earliest = max(1, (now_ticks - zero_ticks) // unit + 1)
+		return zero_ticks + (earliest + (residue - earliest) % period) * unit
+
+
+class PredicateAlert:
+	"""Fire when predicate(snapshot) becomes true; it is only checked when one of `levels` changes"""
+
+	def __init__(self, levels, predicate, label, sound=None, osc_address=None, osc_value=True, notify=True):
+		self.levels = tuple(levels)
+		self.predicate = predicate
+		self.label = label
+		self.sound = sound
+		self.osc_address = osc_address
+		self.osc_value = osc_value
+		self.notify = notify
+		self.active = False
+
+
+class AlertManager:
+	def __init__(self, sound_manager, vrchat_manager, notify=None):
+		self.sound_manager = sound_manager
+		self.vrchat_manager = vrchat_manager
+		self.notify = notify
+		self.lock = threading.Lock()
+		self.alerts = []
+		self.heap = []  # (next fire tick, sequence, alert)
+		self.sequence = itertools.count()
+		self.predicate_alerts = {level: [] for level in range(1, LEVEL_COUNT + 1)}
+		self.previous_state = None
+		self.zero_ticks = None
+		self.now_ticks = None
+
+	def add(self, alert):
+		with self.lock:
+			if isinstance(alert, PredicateAlert):
+				for level in alert.levels:
+					self.predicate_alerts[level].append(alert)
+			else:
+				self.alerts.append(alert)
+				if self.zero_ticks is not None:
+					self.schedule(alert)
+
+	def remove(self, alert):
+		with self.lock:
+			if isinstance(alert, PredicateAlert):
+				for level in alert.levels:
+					self.predicate_alerts[level].remove(alert)
+				return
+			self.alerts.remove(alert)
+			self.heap = [entry for entry in self.heap if entry[2] is not alert]
+			heapq.heapify(self.heap)
+
+	def schedule(self, alert):
+		alert.next_fire = alert.next_entry(self.now_ticks, self.zero_ticks)
+		heapq.heappush(self.heap, (alert.next_fire, next(self.sequence), alert))
+
+	def reschedule_all(self):
+		self.heap = []
+		for alert in self.alerts:
+			self.schedule(alert)
+
+	def on_tick(self, snapshot):
+		"""Fire due alerts; called with every tick's snapshot"""
+		zero_ticks = datetime_to_ticks(constants.ZERO_DATETIME)
+		now_ticks = zero_ticks - snapshot.ticks_to_zero
+		fired = []
+		with self.lock:
+			if zero_ticks != self.zero_ticks or self.now_ticks is None or now_ticks < self.now_ticks:
+				# New zero date, first tick or clock set back: every precomputed time is stale
+				self.zero_ticks, self.now_ticks = zero_ticks, now_ticks
+				self.reschedule_all()
+				self.previous_state = None
+			self.now_ticks = now_ticks
+			heap = self.heap
+			while heap and heap[0][0] <= now_ticks:
+				_, _, alert = heapq.heappop(heap)
+				fired.append(alert)
+				self.schedule(alert)
+			fired.extend(self.changed_predicate_alerts(snapshot))
+		for alert in fired:
+			self.fire(alert)
+
+	def changed_predicate_alerts(self, snapshot):
+		"""Evaluate predicate alerts of the levels whose hexagram or line changed this tick"""
+		state = tuple((snapshot.hexagram_number(level), snapshot.moving_line(level)) for level in range(1, LEVEL_COUNT + 1))
+		previous, self.previous_state = self.previous_state, state
+		candidates = set()
+		for level in range(1, LEVEL_COUNT + 1):
+			if previous is None or previous[level - 1] != state[level - 1]:
+				candidates.update(self.predicate_alerts[level])
+		fired = []
+		for alert in candidates:
+			active = bool(alert.predicate(snapshot))
+			# The first evaluation only records the state, so enabling alerts does not fire them all
+			if active and not alert.active and previous is not None:
+				fired.append(alert)
+			alert.active = active
+		return fired
+
+	def fire(self, alert):
+		print(f"[AlertManager] {alert.label}")
+		if alert.sound:
+			self.sound_manager.play_cues([alert.sound])
+		if alert.osc_address:
+			try:
+				self.vrchat_manager.send_osc(alert.osc_address, alert.osc_value)
+			except Exception as e:
+				print(f"[AlertManager] Error sending {alert.osc_address}: {e}")
+		if alert.notify and self.notify is not None:
+			self.notify(alert.label)
+
+	def upcoming(self):
+		"""(next fire tick, alert) pairs, soonest first"""
+		with self.lock:
+			return [(next_fire, alert) for next_fire, _, alert in sorted(self.heap, key=lambda entry: entry[:2])]
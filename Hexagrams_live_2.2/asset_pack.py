@@ -0,0 +1,111 @@
+"""Single-file indexed asset pack for sounds and hexagram images.
+
+Layout (little endian):
+    header  : magic b'HXPK', u16 version, u32 entry count
+    index   : per entry u16 key length, u64 offset, u64 size, key bytes (UTF-8)
+    data    : asset bytes, each at its absolute offset
+
+Keys are paths relative to the project directory with forward slashes, e.g.
+'sounds/level1.mp3' or 'hexagram_images/hexagram01.gif'. The reader memory-maps
+the pack, so an asset is a slice of the mapping and nothing is unpacked.
+
+Build a pack with:
+    python asset_pack.py [output] [directory ...]
+"""
+import mmap
+import os
+import struct
+import sys
+import constants
+
+MAGIC = b'HXPK'
+VERSION = 1
+HEADER = struct.Struct('<4sHI')
+ENTRY = struct.Struct('<HQQ')
+PACKED_DIRECTORIES = ('sounds', 'hexagram_images')
+
+
+class AssetPack:
+	def __init__(self, path):
+		self.path = path
+		self.file = open(path, 'rb')
+		self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+		self.index = {}
+		magic, version, count = HEADER.unpack_from(self.map, 0)
+		if magic != MAGIC or version != VERSION:
+			self.close()
+			raise ValueError(f"{path} is not a version {VERSION} asset pack")
+		position = HEADER.size
+		for _ in range(count):
+			key_length, offset, size = ENTRY.unpack_from(self.map, position)
+			position += ENTRY.size
+			key = bytes(self.map[position:position + key_length]).decode('utf-8')
+			position += key_length
+			self.index[key] = (offset, size)
+
+	def __contains__(self, key):
+		return key in self.index
+
+	def keys(self):
+		return self.index.keys()
+
+	def view(self, key):
+		"""Zero-copy memoryview of an asset"""
+		offset, size = self.index[key]
+		return memoryview(self.map)[offset:offset + size]
+
+	def read(self, key):
+		offset, size = self.index[key]
+		return self.map[offset:offset + size]
+
+	def close(self):
+		self.map.close()
+		self.file.close()
+
+
+def build_asset_pack(output_path, root_dir=constants.PROJECT_ROOT, directories=PACKED_DIRECTORIES):
+	"""Write every file under the given directories into one pack; returns the entry count"""
+	entries = []
+	for directory in directories:
+		for dirpath, _dirnames, filenames in os.walk(os.path.join(root_dir, directory)):
+			for filename in sorted(filenames):
+				path = os.path.join(dirpath, filename)
+				key = os.path.relpath(path, root_dir).replace(os.sep, '/')
+				entries.append((key.encode('utf-8'), path, os.path.getsize(path)))
+	entries.sort()
+
+	offset = HEADER.size + sum(ENTRY.size + len(key) for key, _path, _size in entries)
+	with open(output_path, 'wb') as pack:
+		pack.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+		for key, _path, size in entries:
+			pack.write(ENTRY.pack(len(key), offset, size))
+			pack.write(key)
+			offset += size
+		for _key, path, _size in entries:
+			with open(path, 'rb') as asset:
+				pack.write(asset.read())
+	return len(entries)
+
+
+_default_pack = None
+_default_pack_checked = False
+
+
+def get_asset_pack():
+	"""The application's asset pack, or None when running from loose asset files"""
+	global _default_pack, _default_pack_checked
+	if not _default_pack_checked:
+		_default_pack_checked = True
+		if os.path.exists(constants.ASSET_PACK_PATH):
+			try:
+				_default_pack = AssetPack(constants.ASSET_PACK_PATH)
+			except (OSError, ValueError) as e:
+				print(f"Error opening asset pack {constants.ASSET_PACK_PATH}: {e}")
+	return _default_pack
+
+
+if __name__ == "__main__":
+	output = sys.argv[1] if len(sys.argv) > 1 else constants.ASSET_PACK_PATH
+	directories = sys.argv[2:] or PACKED_DIRECTORIES
+	count = build_asset_pack(output, directories=directories)
+	print(f"Packed {count} assets into {output}")
@@ -0,0 +1,127 @@
+"""Run the app's periodic work as asyncio tasks on the Tk thread.
+
+Instead of two daemon threads waking every 50-100 ms, the calculation tick and
+the chatbox sender are tasks on one event loop. Tk owns the thread: the loop is
+stepped from root.after, and each step is scheduled for when the next task is
+due, so the process only wakes when a task has work. The runtime tracks its
+tasks' deadlines itself and steps the loop with call_soon(stop) and
+run_forever, so only public loop API is used. OSC goes out through a
+non-blocking datagram transport on the same loop. Shutdown cancels the tasks
+and waits for them, then closes the transport and the loop.
+"""
+import asyncio
+import math
+import constants
+from vrchat_manager import VRChatManager
+from avatar_parameters import AvatarParameterStream
+from pythonosc import osc_message_builder
+
+# Step delay when no task is waiting on a deadline (only during start-up and shutdown)
+IDLE_STEP_MS = 100
+# Loop iterations run per Tk callback before handing control back to Tk
+MAX_ITERATIONS_PER_STEP = 10
+
+
+class AsyncVRChatManager(VRChatManager):
+	"""VRChatManager writing datagrams to an asyncio transport instead of a blocking socket"""
+
+	def __init__(self):
+		self.transport = None
+		self.avatar_parameters = AvatarParameterStream()
+
+	async def connect(self, loop):
+		self.transport, _ = await loop.create_datagram_endpoint(
+			asyncio.DatagramProtocol, remote_addr=(constants.VRCHAT_IP, constants.VRCHAT_PORT)
+		)
+
+	def send_osc(self, address, args):
+		message = osc_message_builder.OscMessageBuilder(address=address)
+		for arg in args if isinstance(args, (list, tuple)) else [args]:
+			message.add_arg(arg)
+		self.send_datagram(message.build().dgram)
+
+	def send_osc_bundle(self, messages):
+		self.send_datagram(self.build_bundle(messages).dgram)
+
+	def send_datagram(self, datagram):
+		if self.transport is not None:
+			self.transport.sendto(datagram)
+
+	def close(self):
+		if self.transport is not None:
+			self.transport.close()
+			self.transport = None
+
+
+class AsyncRuntime:
+	def __init__(self, app):
+		self.app = app
+		self.root = app.gui_manager.root
+		self.loop = asyncio.new_event_loop()
+		self.tasks = []
+		self.deadlines = {}  # Task index -> loop time its callback is next due
+		self.after_id = None
+		self.wakeups = 0
+
+	def start(self):
+		if isinstance(self.app.vrchat_manager, AsyncVRChatManager):
+			self.loop.run_until_complete(self.app.vrchat_manager.connect(self.loop))
+		periodic = ((constants.TICK_INTERVAL, self.app.tick), (constants.CHATBOX_INTERVAL, self.app.send_chatbox_message))
+		for index, (interval, callback) in enumerate(periodic):
+			self.deadlines[index] = self.loop.time()
+			self.tasks.append(self.loop.create_task(self.every(index, interval, callback)))
+		self.after_id = self.root.after(0, self.step)
+
+	async def every(self, index, interval, callback):
+		"""Call callback every interval seconds on a fixed schedule; a late call does not bunch up the next ones"""
+		next_run = self.loop.time()
+		while True:
+			try:
+				callback()
+			except Exception as e:
+				print(f"[AsyncRuntime] Error in {callback.__name__}: {e}")
+			next_run += interval
+			now = self.loop.time()
+			if next_run < now:
+				next_run = now
+			self.deadlines[index] = next_run
+			await asyncio.sleep(next_run - now)
+
+	def step(self):
+		"""Run the loop until every task that was due has run, then come back when the next one is due"""
+		self.after_id = None
+		self.wakeups += 1
+		# A timer firing only makes its task ready, and the task runs on the following iteration
+		for _ in range(MAX_ITERATIONS_PER_STEP):
+			self.loop.call_soon(self.loop.stop)
+			self.loop.run_forever()
+			if not self.due():
+				break
+		self.after_id = self.root.after(self.next_step_ms(), self.step)
+
+	def due(self):
+		now = self.loop.time()
+		return any(deadline <= now for deadline in self.deadlines.values())
+
+	def next_step_ms(self):
+		if not self.deadlines:
+			return IDLE_STEP_MS
+		return max(0, math.ceil((min(self.deadlines.values()) - self.loop.time()) * 1000))
+
+	def stop(self):
+		"""Cancel the tasks, wait for them to finish and close the loop"""
+		if self.after_id is not None:
+			try:
+				self.root.after_cancel(self.after_id)
+			except Exception:
+				pass
+			self.after_id = None
+		for task in self.tasks:
+			task.cancel()
+		if self.tasks:
+			self.loop.run_until_complete(asyncio.gather(*self.tasks, return_exceptions=True))
+		self.tasks = []
+		self.deadlines.clear()
+		self.app.vrchat_manager.close()
+		self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+		self.loop.close()
@@ -0,0 +1,54 @@
+"""Per-level avatar parameters for VRChat, sent only when they change.
+
+Each level drives three parameters under constants.AVATAR_PARAMETER_PREFIX:
+L<n>Hexagram (int 1-64), L<n>Line (int 1-6) and L<n>Progress (float 0-1, the
+fraction of the current hexagram already elapsed). Hexagram and line values go
+out on the tick they change. Progress drifts every tick, so it is sent at most
+every AVATAR_PROGRESS_INTERVAL seconds and only after moving by
+AVATAR_PROGRESS_STEP, or immediately when the hexagram changes.
+"""
+import constants
+from hexagram_calculator import CYCLE_TICKS, LEVEL_COUNT
+
+
+class AvatarParameterStream:
+	def __init__(self, prefix=None):
+		prefix = prefix or constants.AVATAR_PARAMETER_PREFIX
+		# (hexagram, line, progress) addresses per level, built once
+		self.addresses = {
+			level: (f"{prefix}L{level}Hexagram", f"{prefix}L{level}Line", f"{prefix}L{level}Progress")
+			for level in range(1, LEVEL_COUNT + 1)
+		}
+		self.last_sent = {}
+		self.last_progress_time = {}
+
+	def reset(self):
+		"""Forget what was sent, so the next tick sends every parameter again"""
+		self.last_sent.clear()
+		self.last_progress_time.clear()
+
+	def changes(self, snapshot, now):
+		"""(address, value) pairs that differ from what the avatar last received"""
+		messages = []
+		last_sent = self.last_sent
+		for level, (hexagram_address, line_address, progress_address) in self.addresses.items():
+			hexagram_number = snapshot.hexagram_number(level)
+			hexagram_changed = last_sent.get(hexagram_address) != hexagram_number
+			if hexagram_changed:
+				messages.append((hexagram_address, hexagram_number))
+				last_sent[hexagram_address] = hexagram_number
+			moving_line = snapshot.moving_line(level)
+			if last_sent.get(line_address) != moving_line:
+				messages.append((line_address, moving_line))
+				last_sent[line_address] = moving_line
+
+			progress = snapshot.ticks_into_hexagram(level) / CYCLE_TICKS[level - 1]
+			last_progress = last_sent.get(progress_address)
+			if (hexagram_changed or last_progress is None or (
+				abs(progress - last_progress) >= constants.AVATAR_PROGRESS_STEP
+				and now - self.last_progress_time.get(level, 0.0) >= constants.AVATAR_PROGRESS_INTERVAL
+			)):
+				messages.append((progress_address, progress))
+				last_sent[progress_address] = progress
+				self.last_progress_time[level] = now
+		return messages
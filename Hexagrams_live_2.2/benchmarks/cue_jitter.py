@@ -0,0 +1,117 @@
+"""Cue latency under artificial GUI load: in-process cues vs. the isolated worker layout.
+
+Run from the project directory:
+    python benchmarks/cue_jitter.py [--seconds 10] [--interval 0.05]
+
+A background thread burns the GIL the way a slow Tk frame does, while a cue
+thread fires on a fixed schedule. Each cue does the kind of pure-Python work
+the sound/OSC path does (building an OSC packet). Latency is measured from the
+scheduled cue time until that work has finished, either in the same process
+or inside a WorkerProcess.
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worker_processes import WorkerProcess
+
+
+def cue_work(message):
+	"""Roughly what formatting and packing one OSC message costs in Python"""
+	payload = bytearray()
+	for _ in range(40):
+		encoded = message.encode('utf-8')
+		payload += encoded + b'\0' * (4 - len(encoded) % 4)
+	return len(payload)
+
+
+def gui_load(stop_event, frame_seconds):
+	"""Simulate slow Tk frames: long pure-Python bursts holding the GIL"""
+	while not stop_event.is_set():
+		end = time.perf_counter() + frame_seconds
+		while time.perf_counter() < end:
+			sum(i * i for i in range(200))
+
+
+def benchmark_worker_main(connection, results):
+	latencies = []
+	while True:
+		try:
+			command, payload = connection.recv()
+		except EOFError:
+			break
+		if command == 'stop':
+			break
+		scheduled, message = payload
+		cue_work(message)
+		latencies.append(time.time() - scheduled)
+	results.put(latencies)
+
+
+def run_cues(seconds, interval, handle_cue):
+	start = time.time() + interval
+	count = int(seconds / interval)
+	for index in range(count):
+		scheduled = start + index * interval
+		delay = scheduled - time.time()
+		if delay > 0:
+			time.sleep(delay)
+		handle_cue(scheduled, f"Level {index % 6 + 1} cue {index}")
+
+
+def measure(isolated, seconds, interval, frame_seconds):
+	stop_event = threading.Event()
+	load_thread = threading.Thread(target=gui_load, args=(stop_event, frame_seconds), daemon=True)
+	latencies = []
+	worker = None
+	results = None
+	if isolated:
+		results = multiprocessing.Queue()
+		worker = WorkerProcess('BenchmarkWorker', benchmark_worker_main, (results,))
+		worker.start()
+
+		def handle_cue(scheduled, message):
+			worker.send('cue', (scheduled, message))
+	else:
+		def handle_cue(scheduled, message):
+			cue_work(message)
+			latencies.append(time.time() - scheduled)
+
+	load_thread.start()
+	try:
+		run_cues(seconds, interval, handle_cue)
+	finally:
+		stop_event.set()
+		load_thread.join()
+	if worker is not None:
+		worker.send('stop')
+		latencies = results.get(timeout=10)
+		worker.stop()
+	return latencies
+
+
+def report(name, latencies):
+	millis = sorted(latency * 1000 for latency in latencies)
+	p99 = millis[min(len(millis) - 1, int(len(millis) * 0.99))]
+	print(f"{name:<10} cues={len(millis):5d} mean={statistics.mean(millis):7.2f} ms "
+		f"stdev={statistics.pstdev(millis):7.2f} ms p99={p99:7.2f} ms max={millis[-1]:7.2f} ms")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--seconds", type=float, default=10.0)
+	parser.add_argument("--interval", type=float, default=0.05, help="seconds between cues")
+	parser.add_argument("--frame", type=float, default=0.03, help="length of each simulated GUI frame")
+	args = parser.parse_args()
+	report("in-process", measure(False, args.seconds, args.interval, args.frame))
+	report("isolated", measure(True, args.seconds, args.interval, args.frame))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,260 @@
+"""GUI render benchmark: the real GUIManager under a virtual X server and a virtual clock.
+
+Run from the project directory (Xvfb must be installed unless DISPLAY is set):
+    python benchmarks/gui_benchmark.py --update-baseline  # record benchmarks/gui_baseline.json
+    python benchmarks/gui_benchmark.py                    # compare against it
+
+Timings depend on the machine, so record the baseline on the machine that will
+run the comparison, from a known-good commit, and re-record it whenever a
+change is meant to move the numbers.
+
+Each scenario feeds the GUI snapshots for virtual instants, so runs are
+repeatable whatever the wall clock says. For every frame it records the
+main-thread time spent in the GUI (including the idle redraw) and the number of
+Tcl commands executed; tracemalloc gives the peak Python memory per scenario.
+Tcl command counts are deterministic, so they carry the tightest tolerance. The
+run exits with status 1 when a scenario regresses past the baseline, or when
+the baseline is missing or does not cover a scenario.
+"""
+import argparse
+import datetime
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gui_baseline.json')
+# Allowed growth over the baseline before a scenario counts as a regression
+TOLERANCES = {'p95_ms': 0.5, 'tcl_commands_per_frame': 0.1, 'peak_kib': 0.25}
+START = datetime.datetime(2026, 1, 1, 12)
+FRAME = datetime.timedelta(milliseconds=50)
+
+
+def start_virtual_display():
+	"""Start Xvfb on a free display number unless a display is already available"""
+	if os.environ.get('DISPLAY'):
+		return None
+	if shutil.which('Xvfb') is None:
+		sys.exit("No DISPLAY and Xvfb is not installed")
+	for number in range(99, 120):
+		if os.path.exists(f'/tmp/.X11-unix/X{number}') or os.path.exists(f'/tmp/.X{number}-lock'):
+			continue
+		process = subprocess.Popen(
+			['Xvfb', f':{number}', '-screen', '0', '1600x1000x24', '-nolisten', 'tcp'],
+			stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+		)
+		for _ in range(50):
+			if os.path.exists(f'/tmp/.X11-unix/X{number}'):
+				os.environ['DISPLAY'] = f':{number}'
+				return process
+			if process.poll() is not None:
+				break
+			time.sleep(0.1)
+		process.terminate()
+	sys.exit("Could not start Xvfb")
+
+
+class VirtualClock:
+	"""Stands in for the time module inside gui_manager, so render throttling follows the scenario's clock"""
+
+	def __init__(self):
+		self.now = START
+		self.seconds = 1000.0
+
+	def advance(self, delta):
+		self.now += delta
+		self.seconds += delta.total_seconds()
+
+	def monotonic(self):
+		return self.seconds
+
+	def perf_counter(self):
+		return time.perf_counter()
+
+
+class NullSoundManager:
+	def __init__(self):
+		self.cues = 0
+
+	def play_cues(self, sound_keys):
+		self.cues += len(sound_keys)
+
+
+class NullVRChatManager:
+	def __init__(self):
+		from avatar_parameters import AvatarParameterStream
+		self.avatar_parameters = AvatarParameterStream()
+
+
+class GUIBenchmark:
+	def __init__(self):
+		import constants
+		import gui_manager
+		from hexagram_calculator import HexagramCalculator
+		self.constants = constants
+		self.clock = VirtualClock()
+		gui_manager.time = self.clock
+		self.calculator = HexagramCalculator()
+		self.gui = gui_manager.GUIManager(NullSoundManager(), self.calculator, NullVRChatManager())
+		self.root = self.gui.root
+		self.seed_previous_hexagrams()
+		self.root.update()
+
+	def seed_previous_hexagrams(self):
+		self.gui.seed_transitions(self.calculator.get_snapshot(self.constants.ZERO_DATETIME - self.clock.now))
+
+	def tcl_command_count(self):
+		return int(self.root.tk.call('info', 'cmdcount'))
+
+	def frame(self, action):
+		commands = self.tcl_command_count()
+		started = time.perf_counter()
+		action()
+		self.root.update_idletasks()
+		elapsed = time.perf_counter() - started
+		return elapsed, self.tcl_command_count() - commands
+
+	def tick(self):
+		"""What the app's tick thread does each frame, at the virtual instant"""
+		snapshot = self.calculator.get_snapshot(self.constants.ZERO_DATETIME - self.clock.now)
+		self.gui.update_display(snapshot, input_datetime=self.clock.now)
+
+	def run_scenario(self, name, frames):
+		"""frames yields one callable per frame; returns the scenario's metrics"""
+		self.root.update()
+		tracemalloc.start()
+		times, commands = [], []
+		for action in frames:
+			elapsed, command_count = self.frame(action)
+			times.append(elapsed * 1000)
+			commands.append(command_count)
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		times.sort()
+		return {
+			'frames': len(times),
+			'mean_ms': round(statistics.mean(times), 3),
+			'p95_ms': round(times[int(len(times) * 0.95) - 1], 3),
+			'max_ms': round(times[-1], 3),
+			'tcl_commands_per_frame': round(statistics.mean(commands), 1),
+			'peak_kib': round(peak / 1024, 1),
+		}
+
+	def steady_state(self, frames=400):
+		for _ in range(frames):
+			self.clock.advance(FRAME)
+			yield self.tick
+
+	def level_boundaries(self, frames_per_boundary=40):
+		"""Step across hexagram changes of levels 2-5, where image labels must change"""
+		from hexagram_calculator import ticks_to_timedelta
+		for level in (2, 3, 4, 5):
+			snapshot = self.calculator.get_snapshot(self.constants.ZERO_DATETIME - self.clock.now)
+			# Jump to half the frames before this level's next hexagram change
+			self.clock.advance(ticks_to_timedelta(snapshot.ticks_to_hexagram_change(level)) - FRAME * (frames_per_boundary // 2))
+			self.seed_previous_hexagrams()
+			for _ in range(frames_per_boundary):
+				self.clock.advance(FRAME)
+				yield self.tick
+
+	def zero_date_changes(self, changes=40):
+		dates = ["2055-07-16", "2012-12-21", "2100-01-01 06:30:00", "1999-09-09"]
+		for index in range(changes):
+			def change(date_text=dates[index % len(dates)]):
+				self.gui.zero_date_entry.delete(0, 'end')
+				self.gui.zero_date_entry.insert(0, date_text)
+				self.gui.update_zero_datetime(now=self.clock.now)
+			self.clock.advance(FRAME)
+			yield change
+		self.constants.ZERO_DATETIME = datetime.datetime(2055, 7, 16)
+		self.seed_previous_hexagrams()
+
+	def checker_bursts(self, bursts=10, lookups=20):
+		"""Typed lookups far apart, then scrubber drags near each one"""
+		for burst in range(bursts):
+			instant = START + datetime.timedelta(days=burst * 397, seconds=burst * 3607)
+			def lookup(instant=instant):
+				self.gui.date_entry.delete(0, 'end')
+				self.gui.date_entry.insert(0, f"{instant:%Y-%m-%d}")
+				self.gui.time_entry.delete(0, 'end')
+				self.gui.time_entry.insert(0, f"{instant:%H:%M:%S}")
+				self.gui.check_hexagrams()
+			yield lookup
+			for step in range(1, lookups):
+				def scrub(value=step / lookups):
+					self.gui.scrub_value = value
+					self.gui.evaluate_scrub()
+				yield scrub
+
+	def close(self):
+		self.gui.cleanup()
+
+
+def compare(results, baseline):
+	"""Regressions past the tolerances; a scenario or metric missing from the baseline counts as one"""
+	regressions = []
+	for scenario, metrics in results.items():
+		reference = baseline.get(scenario)
+		if reference is None:
+			regressions.append(f"{scenario}: not in the baseline; re-record it with --update-baseline")
+			continue
+		for metric, tolerance in TOLERANCES.items():
+			if metric not in reference:
+				regressions.append(f"{scenario}: {metric} not in the baseline; re-record it with --update-baseline")
+			elif metrics[metric] > reference[metric] * (1 + tolerance):
+				regressions.append(f"{scenario}: {metric} {metrics[metric]} > baseline {reference[metric]} (+{tolerance:.0%})")
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--update-baseline", action="store_true")
+	parser.add_argument("--baseline", default=BASELINE_PATH)
+	args = parser.parse_args()
+
+	display = start_virtual_display()
+	try:
+		benchmark = GUIBenchmark()
+		scenarios = (
+			("steady_state", benchmark.steady_state),
+			("level_boundaries", benchmark.level_boundaries),
+			("zero_date_change", benchmark.zero_date_changes),
+			("checker_bursts", benchmark.checker_bursts),
+		)
+		results = {}
+		for name, frames in scenarios:
+			results[name] = benchmark.run_scenario(name, frames())
+			metrics = results[name]
+			print(
+				f"{name:<18} {metrics['frames']:4d} frames  mean {metrics['mean_ms']:7.3f} ms  p95 {metrics['p95_ms']:7.3f} ms  "
+				f"max {metrics['max_ms']:7.3f} ms  {metrics['tcl_commands_per_frame']:7.1f} Tcl cmds/frame  peak {metrics['peak_kib']:8.1f} KiB"
+			)
+		benchmark.close()
+	finally:
+		if display is not None:
+			display.terminate()
+
+	if args.update_baseline:
+		with open(args.baseline, 'w', encoding='utf-8') as baseline_file:
+			json.dump(results, baseline_file, indent=1)
+		print(f"Baseline written to {args.baseline}")
+		return
+	if not os.path.exists(args.baseline):
+		print(f"ERROR no baseline at {args.baseline}; nothing was compared. Run with --update-baseline to record one")
+		sys.exit(1)
+	with open(args.baseline, encoding='utf-8') as baseline_file:
+		regressions = compare(results, json.load(baseline_file))
+	for regression in regressions:
+		print(f"REGRESSION {regression}")
+	sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,112 @@
+"""Per-tick allocation and time of the engine: tuple list (get_hexagrams) vs. snapshot.
+
+Run from the project directory:
+    python benchmarks/tick_allocations.py [--ticks 20000]
+
+Each mode computes a tick the way its consumers need it. The list mode also
+redoes the moving-line arithmetic every consumer used to repeat; the snapshot
+mode reads the precomputed integers.
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import constants
+from constants import HEXAGRAM_NAMES
+from hexagram_calculator import HexagramCalculator
+
+CYCLES = [
+	datetime.timedelta(seconds=1.9775390625),
+	datetime.timedelta(minutes=2, seconds=6.5625),
+	datetime.timedelta(hours=2, minutes=15),
+	datetime.timedelta(days=6),
+	datetime.timedelta(days=384),
+	datetime.timedelta(days=24576)  # 384 days * 64
+]
+
+
+def get_hexagrams(time_to_zero):
+	"""The engine's former per-tick result: a (level, cycle_length, "h", number, name, seconds into cycle) tuple per level"""
+	hexagrams = []
+	total_seconds = abs(time_to_zero.total_seconds())
+
+	for level in range(6):
+		cycle_length = CYCLES[level]
+		if level == 0:
+			level_2_cycle_length = CYCLES[1]
+			cycle_number_level_2 = int(total_seconds // level_2_cycle_length.total_seconds())
+			cycle_number = (cycle_number_level_2 * 64 + int((total_seconds % level_2_cycle_length.total_seconds()) // cycle_length.total_seconds())) % 64
+		else:
+			cycle_number = int(total_seconds // cycle_length.total_seconds()) % 64
+
+		time_since_last_change = total_seconds % cycle_length.total_seconds()
+		hexagram_number = (cycle_number % 64) + 1
+		hexagrams.append((
+			level + 1,
+			cycle_length,
+			"h",
+			hexagram_number,
+			HEXAGRAM_NAMES[hexagram_number - 1],
+			time_since_last_change
+		))
+
+	return hexagrams
+
+
+def tuple_tick(calculator, time_to_zero):
+	hexagrams = get_hexagrams(time_to_zero)
+	total = 0
+	for level, cycle_length, _, hexagram_number, _, time_since_last_change in hexagrams:
+		line_change_interval = cycle_length.total_seconds() / 6
+		total += hexagram_number + int((time_since_last_change // line_change_interval) + 1)
+		total += int(time_since_last_change % line_change_interval)
+	return hexagrams, total
+
+
+def snapshot_tick(calculator, time_to_zero):
+	snapshot = calculator.get_snapshot(time_to_zero)
+	total = 0
+	for level in range(1, 7):
+		total += snapshot.hexagram_number(level) + snapshot.moving_line(level)
+		total += snapshot.ticks_to_line_change(level)
+	return snapshot, total
+
+
+def measure(tick, ticks):
+	calculator = HexagramCalculator()
+	start = constants.ZERO_DATETIME - datetime.datetime(2025, 1, 1)
+	step = datetime.timedelta(milliseconds=50)
+	tick(calculator, start)
+
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	retained = []
+	for index in range(1000):
+		retained.append(tick(calculator, start + index * step)[0])
+	retained_bytes = (tracemalloc.get_traced_memory()[0] - before) / 1000
+	tracemalloc.stop()
+	del retained
+
+	began = time.perf_counter()
+	for index in range(ticks):
+		tick(calculator, start + index * step)
+	elapsed_us = (time.perf_counter() - began) / ticks * 1e6
+	return retained_bytes, elapsed_us
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--ticks", type=int, default=20000)
+	args = parser.parse_args()
+	for name, tick in (("tuples", tuple_tick), ("snapshot", snapshot_tick)):
+		retained_bytes, elapsed_us = measure(tick, args.ticks)
+		print(f"{name:<9} {retained_bytes:8.0f} bytes held per tick  {elapsed_us:7.2f} us per tick")
+
+
+if __name__ == "__main__":
+	main()
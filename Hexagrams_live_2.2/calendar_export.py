@@ -0,0 +1,205 @@
+"""Export upcoming hexagram and moving-line changes as iCalendar events.
+
+A level's changes are the entries into blocks of one cycle (hexagram) or one
+line (moving line). A block of u ticks is entered at zero + 1 - m*u before the
+zero date and at zero + m*u after it, so each level's event times are a range
+of m and the levels are merged lazily by time. Events are written in chunks of
+CALENDAR_CHUNK_EVENTS, so memory stays flat however long the span is.
+
+    python calendar_export.py hexagrams.ics --years 30
+    python calendar_export.py --serve    # http://127.0.0.1:8765/hexagrams.ics
+
+Times are written as floating local times, the same wall clock the app uses.
+UIDs depend only on the zero date, level and instant, so a subscribed feed
+updates events in place instead of duplicating them.
+"""
+import argparse
+import datetime
+import heapq
+import http.server
+import urllib.parse
+import constants
+from hexagram_calculator import CYCLE_TICKS, LINE_TICKS, datetime_to_ticks, snapshot_at_ticks, ticks_to_datetime
+from hexagram_data import short_label
+
+# RFC 5545 limits content lines to 75 octets
+MAX_LINE_OCTETS = 75
+
+
+def level_changes(level, lines, start_ticks, end_ticks, zero_ticks):
+	"""(ticks, level, m) for each hexagram change of level in [start, end), or each moving-line change with lines=True.
+
+	m counts blocks from the zero date, so with lines=True the hexagram also
+	changes where m % 6 == 0.
+	"""
+	unit = LINE_TICKS[level - 1] if lines else CYCLE_TICKS[level - 1]
+	for m in range((zero_ticks + 1 - start_ticks) // unit, max(1, (zero_ticks + 1 - end_ticks) // unit + 1) - 1, -1):
+		yield zero_ticks + 1 - m * unit, level, m
+	for m in range(max(1, -((zero_ticks - start_ticks) // unit)), (end_ticks - 1 - zero_ticks) // unit + 1):
+		yield zero_ticks + m * unit, level, m
+
+
+def _escape(text):
+	return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line):
+	"""Split a content line into 75-octet pieces without cutting a UTF-8 sequence"""
+	encoded = line.encode('utf-8')
+	if len(encoded) <= MAX_LINE_OCTETS:
+		return line + "\r\n"
+	pieces = []
+	limit = MAX_LINE_OCTETS
+	while len(encoded) > limit:
+		cut = limit
+		while encoded[cut] & 0xC0 == 0x80:
+			cut -= 1
+		pieces.append(encoded[:cut].decode('utf-8'))
+		encoded = encoded[cut:]
+		# Continuation lines start with a space, which counts towards their 75 octets
+		limit = MAX_LINE_OCTETS - 1
+	pieces.append(encoded.decode('utf-8'))
+	return "\r\n ".join(pieces) + "\r\n"
+
+
+def format_event(ticks, level, hexagram_change, zero_datetime, zero_ticks, stamp):
+	snapshot = snapshot_at_ticks(zero_ticks - ticks)
+	hexagram = short_label(snapshot.hexagram_number(level))
+	line = snapshot.moving_line(level)
+	if hexagram_change:
+		summary = f"L{level} enters {hexagram}, line {line}"
+	else:
+		summary = f"L{level} moving line {line} ({hexagram})"
+	description = f"Level {level}: {snapshot.hexagram_name(level)}, moving line {line} (zero date {zero_datetime})"
+	start = ticks_to_datetime(ticks)
+	# Only the summary and description can reach the line limit
+	return (
+		"BEGIN:VEVENT\r\n"
+		f"UID:{zero_datetime:%Y%m%dT%H%M%S}-L{level}-{'H' if hexagram_change else 'L'}{ticks}@hexagrams-live\r\n"
+		f"DTSTAMP:{stamp}\r\n"
+		f"DTSTART:{start:%Y%m%dT%H%M%S}\r\n"
+		f"DURATION:PT{constants.CALENDAR_EVENT_MINUTES}M\r\n"
+		+ _fold(f"SUMMARY:{_escape(summary)}")
+		+ _fold(f"DESCRIPTION:{_escape(description)}")
+		+ "TRANSP:TRANSPARENT\r\nEND:VEVENT\r\n"
+	)
+
+
+def calendar_chunks(start, end, zero_datetime=None, hexagram_levels=None, line_levels=None, chunk_events=None):
+	"""Yield an iCalendar document for [start, end) as text chunks of chunk_events events each"""
+	if zero_datetime is None:
+		zero_datetime = constants.ZERO_DATETIME
+	if hexagram_levels is None:
+		hexagram_levels = constants.CALENDAR_HEXAGRAM_LEVELS
+	if line_levels is None:
+		line_levels = constants.CALENDAR_LINE_LEVELS
+	chunk_events = chunk_events or constants.CALENDAR_CHUNK_EVENTS
+	zero_ticks = datetime_to_ticks(zero_datetime)
+	start_ticks, end_ticks = datetime_to_ticks(start), datetime_to_ticks(end)
+	stamp = f"{datetime.datetime.now(datetime.timezone.utc):%Y%m%dT%H%M%SZ}"
+
+	# A level with line events already covers its hexagram changes (m % 6 == 0)
+	streams = [level_changes(level, True, start_ticks, end_ticks, zero_ticks) for level in sorted(set(line_levels))]
+	streams += [
+		((ticks, level, m * 6) for ticks, level, m in level_changes(level, False, start_ticks, end_ticks, zero_ticks))
+		for level in sorted(set(hexagram_levels) - set(line_levels))
+	]
+
+	chunk = [_fold(content) for content in (
+		"BEGIN:VCALENDAR",
+		"VERSION:2.0",
+		"PRODID:-//Hexagrams Live//Calendar Export//EN",
+		"CALSCALE:GREGORIAN",
+		f"X-WR-CALNAME:{_escape(f'Hexagrams (zero date {zero_datetime:%Y-%m-%d})')}",
+		"REFRESH-INTERVAL;VALUE=DURATION:P1D",
+		"X-PUBLISHED-TTL:P1D",
+	)]
+	for ticks, level, m in heapq.merge(*streams):
+		chunk.append(format_event(ticks, level, m % 6 == 0, zero_datetime, zero_ticks, stamp))
+		if len(chunk) >= chunk_events:
+			yield "".join(chunk)
+			chunk = []
+	chunk.append("END:VCALENDAR\r\n")
+	yield "".join(chunk)
+
+
+def export_calendar(path, start, end, zero_datetime=None, hexagram_levels=None, line_levels=None):
+	with open(path, 'w', encoding='utf-8', newline='') as calendar_file:
+		for chunk in calendar_chunks(start, end, zero_datetime, hexagram_levels, line_levels):
+			calendar_file.write(chunk)
+
+
+def _levels(text):
+	levels = tuple(int(level) for level in text.split(",") if level.strip())
+	if not all(1 <= level <= 6 for level in levels):
+		raise ValueError("Levels must be 1-6")
+	return levels
+
+
+class CalendarFeedHandler(http.server.BaseHTTPRequestHandler):
+	"""GET /hexagrams.ics[?zero=YYYY-MM-DD&levels=3,4&line_levels=5&days=365] streams a feed from today onwards"""
+
+	def do_GET(self):
+		url = urllib.parse.urlsplit(self.path)
+		if url.path != "/hexagrams.ics":
+			self.send_error(404)
+			return
+		query = urllib.parse.parse_qs(url.query, keep_blank_values=True)
+		try:
+			zero_datetime = datetime.datetime.fromisoformat(query['zero'][0]) if 'zero' in query else None
+			hexagram_levels = _levels(query['levels'][0]) if 'levels' in query else None
+			line_levels = _levels(query['line_levels'][0]) if 'line_levels' in query else None
+			days = int(query['days'][0]) if 'days' in query else constants.CALENDAR_FEED_DAYS
+		except ValueError as e:
+			self.send_error(400, str(e))
+			return
+		# Starting at midnight keeps today's past events in the feed and the UIDs stable between refreshes
+		start = datetime.datetime.combine(datetime.date.today(), datetime.time())
+		self.send_response(200)
+		self.send_header("Content-Type", "text/calendar; charset=utf-8")
+		self.end_headers()
+		try:
+			for chunk in calendar_chunks(start, start + datetime.timedelta(days=days), zero_datetime, hexagram_levels, line_levels):
+				self.wfile.write(chunk.encode('utf-8'))
+		except (BrokenPipeError, ConnectionResetError):
+			pass
+
+	def log_message(self, format, *args):
+		print(f"[CalendarFeed] {self.address_string()} {format % args}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Export hexagram changes as an iCalendar file or feed")
+	parser.add_argument("output", nargs="?", help=".ics file to write (omit with --serve)")
+	parser.add_argument("--zero", type=datetime.datetime.fromisoformat, default=constants.ZERO_DATETIME)
+	parser.add_argument("--start", type=datetime.datetime.fromisoformat, default=None, help="default: now")
+	parser.add_argument("--years", type=float, default=1.0)
+	parser.add_argument("--levels", type=_levels, default=constants.CALENDAR_HEXAGRAM_LEVELS, help="levels whose hexagram changes are exported")
+	parser.add_argument("--line-levels", type=_levels, default=constants.CALENDAR_LINE_LEVELS, help="levels whose moving-line changes are exported")
+	parser.add_argument("--serve", action="store_true", help="serve /hexagrams.ics instead of writing a file")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=constants.CALENDAR_FEED_PORT)
+	args = parser.parse_args()
+
+	if args.serve:
+		constants.ZERO_DATETIME = args.zero
+		constants.CALENDAR_HEXAGRAM_LEVELS = args.levels
+		constants.CALENDAR_LINE_LEVELS = args.line_levels
+		server = http.server.ThreadingHTTPServer((args.host, args.port), CalendarFeedHandler)
+		print(f"[CalendarFeed] Serving http://{args.host}:{args.port}/hexagrams.ics")
+		try:
+			server.serve_forever()
+		except KeyboardInterrupt:
+			pass
+		server.server_close()
+		return
+	if not args.output:
+		parser.error("an output file is required unless --serve is given")
+	start = args.start or datetime.datetime.now().replace(microsecond=0)
+	end = start + datetime.timedelta(days=args.years * 365.25)
+	export_calendar(args.output, start, end, args.zero, args.levels, args.line_levels)
+	print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+	main()
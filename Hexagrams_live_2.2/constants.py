@@ -1,14 +1,15 @@
 import datetime
 import os
+import sys
 
 # Base paths
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 SOUNDS_DIR = os.path.join(PROJECT_ROOT, 'sounds')
 IMAGES_DIR = os.path.join(PROJECT_ROOT, 'hexagram_images')
-
-# Create directories if they don't exist
-os.makedirs(SOUNDS_DIR, exist_ok=True)
-os.makedirs(IMAGES_DIR, exist_ok=True)
+ASSET_PACK_PATH = os.path.join(PROJECT_ROOT, 'assets.hxpk')
+# Writable directory for files the app creates. A onefile build runs from a temporary
+# extraction directory deleted on exit, so use the folder holding the executable instead.
+DATA_DIR = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else PROJECT_ROOT
 
 # Global flags
 EXIT_FLAG = False
@@ -19,6 +20,21 @@ AUDIO_PLAYBACK_ALLOWED = True
 SEND_CHECK_TO_VRCHAT_ENABLED = False
 USE_INPUT_DATE_TIME = False
 CURRENT_PAGE = 1
+ISOLATED_WORKERS = False
+ASYNCIO_RUNTIME = False
+
+# Seconds between calculation ticks and between chatbox messages
+TICK_INTERVAL = 0.05
+CHATBOX_INTERVAL = 2.0
+# VRChat cuts chatbox messages longer than this
+CHATBOX_MAX_LENGTH = 144
+
+# Runtime profiling (off unless toggled with Ctrl+Shift+P, SIGUSR1 or --profile)
+PROFILE_ON_START = False
+PROFILE_DIR = os.path.join(DATA_DIR, 'profiles')
+PROFILE_SAMPLE_INTERVAL = 0.01
+PROFILE_TRACEBACK_DEPTH = 12
+PROFILE_TOP_ENTRIES = 25
 
 # Audio state flags
 PLAY_AUDIO_LEVEL_1_ENABLED = False
@@ -37,6 +53,9 @@ PLAY_AUDIO_LEVEL_5_LINE_ENABLED = True
 PLAY_AUDIO_LEVEL_6_ENABLED = False
 PLAY_AUDIO_LEVEL_6_LINE_ENABLED = False
 
+# Most sounds the mixer plays at once; lower-priority voices are stolen beyond this
+MAX_AUDIO_VOICES = 6
+
 # Previous hexagram tracking
 previous_hexagrams = {
     'level_1': None,
@@ -51,13 +70,64 @@ previous_hexagrams = {
     'level_5_line': None
 }
 
+# Seconds between main display redraws needed by the finest timer each level shows
+# (level 1 counts milliseconds, the others whole seconds)
+LEVEL_RENDER_INTERVALS = {1: 0.05, 2: 0.25, 3: 0.25, 4: 0.25, 5: 0.25, 6: 0.25}
+
 # Initial zero datetime
 ZERO_DATETIME = datetime.datetime(2055, 7, 16)
 
+# Checker scrubber: drag ranges around the anchor date (days either side),
+# milliseconds between evaluations while dragging, and instants kept cached
+CHECKER_SCRUB_SPANS = {"1 day": 1, "1 month": 30, "1 year": 365, "10 years": 3652, "100 years": 36525}
+CHECKER_SCRUB_INTERVAL_MS = 50
+CHECKER_CACHE_SIZE = 512
+CHECKER_RESULT_ROWS = 10
+CHECKER_RESULT_POLL_MS = 200
+
+# Timeline window: levels drawn as bands, tile size in pixels and tiles kept rendered
+TIMELINE_LEVELS = (3, 4, 5, 6)
+TIMELINE_TILE_WIDTH = 256
+TIMELINE_BAND_HEIGHT = 36
+TIMELINE_TILE_CACHE_SIZE = 512
+
+# Alerts registered at startup, as Alert keyword arguments, e.g.
+# {'level': 3, 'hexagram': 24, 'sound': 'level3'} or {'level': 5, 'line': 6, 'osc_address': '/avatar/parameters/HexagramAlert'}
+ALERTS = []
+ALERT_NOTIFICATION_SECONDS = 8
+
+# Zero dates shown side by side in the comparison panel
+COMPARISON_ZERO_DATETIMES = [
+    datetime.datetime(2055, 7, 16),
+    datetime.datetime(2012, 12, 21),
+]
+# Seconds between comparison panel redraws (its finest field is the level 1 moving line)
+COMPARISON_RENDER_INTERVAL = 0.25
+
+# Calendar export (calendar_export.py): levels whose hexagram / moving-line changes become
+# events, event length, events per written chunk, and the local feed's span and port
+CALENDAR_HEXAGRAM_LEVELS = (3, 4, 5, 6)
+CALENDAR_LINE_LEVELS = (4, 5, 6)
+CALENDAR_EVENT_MINUTES = 15
+CALENDAR_CHUNK_EVENTS = 1000
+CALENDAR_FEED_DAYS = 365
+CALENDAR_FEED_PORT = 8765
+
 # VRChat configuration
 VRCHAT_IP = "127.0.0.1"
 VRCHAT_PORT = 9000
 
+# Headless session server (session_server.py): timer wheel tick and size, seconds between stats
+SESSION_WHEEL_RESOLUTION = 0.1
+SESSION_WHEEL_SLOTS = 256
+SESSION_STATS_INTERVAL = 60
+
+# Avatar parameters streamed alongside the chatbox text
+SEND_AVATAR_PARAMETERS_ENABLED = False
+AVATAR_PARAMETER_PREFIX = "/avatar/parameters/Hexagram"
+AVATAR_PROGRESS_INTERVAL = 0.2  # Seconds between progress updates of one level
+AVATAR_PROGRESS_STEP = 1 / 255  # Smallest progress change worth sending (synced floats are 8 bit)
+
 # GUI Theme colors
 DARK_THEME = {
     'background': '#2e2e2e',
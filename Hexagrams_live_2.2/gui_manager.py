@@ -1,10 +1,36 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+import base64
 import datetime
+from collections import OrderedDict
 import math
 import constants
 import webbrowser
 import os
+import threading
+import time
+from asset_pack import get_asset_pack
+from alerts import Alert
+from hexagram_calculator import CYCLE_TICKS, TICKS_PER_DAY, TICKS_PER_HOUR, TICKS_PER_MILLISECOND, TICKS_PER_SECOND, datetime_to_ticks, ticks_to_datetime
+from hexagram_data import short_label
+from hexagram_search import SnapshotExpression, search
+from results_view import IntervalRows, ResultsView, TransitionRows
+from timeline_view import TimelineView
+from zero_date_comparison import COMPARISON_HEADER, ZeroDateComparison, parse_zero_dates
+from zero_date_solver import OBSERVATION_FORMAT, format_interval, parse_observation, representative_zero_date, solve_zero_dates
+
+# Heading, hexagram countdown, moving line and derived hexagrams
+LINES_PER_LEVEL = 4
+
+# Cycle length as printed in each level's heading
+LEVEL_CYCLE_LABELS = {
+    1: f"{CYCLE_TICKS[0] / TICKS_PER_SECOND:.4f} s",
+    2: f"{CYCLE_TICKS[1] / TICKS_PER_SECOND} s",
+    3: f"{CYCLE_TICKS[2] / TICKS_PER_HOUR:.2f} h",
+    4: f"{CYCLE_TICKS[3] / TICKS_PER_DAY:.2f} days",
+    5: f"{CYCLE_TICKS[4] / TICKS_PER_DAY:.2f} days",
+    6: f"{CYCLE_TICKS[5] / TICKS_PER_DAY:.2f} days",
+}
 
 class GUIManager:
     def __init__(self, sound_manager, hexagram_calculator, vrchat_manager):
@@ -13,6 +39,20 @@ class GUIManager:
         self.vrchat_manager = vrchat_manager
         self.calculator_window = None
         self.sound_menu_window = None
+        self.comparison_window = None
+        self.timeline_view = None
+        self.alerts_window = None
+        self.alert_manager = None
+        self.comparison_labels = []
+        self.comparison_visible = False
+        self.last_comparison_render_time = 0.0
+        self.comparison = ZeroDateComparison(constants.COMPARISON_ZERO_DATETIMES)
+        self.check_cache = OrderedDict()  # (zero date, instant) -> (snapshot, display lines)
+        self.check_displayed_hexagrams = {}
+        self.text_widget_lines = {}  # Lines currently shown per Text widget
+        self.scrub_anchor = None
+        self.scrub_value = 0.0
+        self.scrub_pending = False
         self.zero_datetime = datetime.datetime(2055, 7, 16)  # Default zero date
         self.audio_playback_allowed = False
         self.hexagram_images = {}  # Store loaded images
@@ -20,6 +60,12 @@ class GUIManager:
         self.output_labels = []  # Store labels for the main display
         self.level6_moving_line_days = None
         self.level6_moving_line_num = None
+        self.displayed_hexagrams = {}  # Hexagram number currently shown per level image
+        self.window_visible = True
+        self.visible_levels = set(range(1, 7))
+        self.last_render_time = 0.0
+        self.frames_rendered = 0
+        self.frames_skipped = 0
         self.setup_main_window()
 
     def setup_main_window(self):
@@ -72,13 +118,16 @@ class GUIManager:
         self.setup_style()
         self.create_widgets()
         self.root.after(1000, self.enable_audio_playback)
+
+        # Redraws stop while the window is minimized or fully covered
+        for sequence in ("<Map>", "<Unmap>", "<Visibility>"):
+            self.root.bind(sequence, self.on_window_state_change, add="+")
+        self.output_frame.bind("<Configure>", self.on_output_configure)
         
-        # Set initial window size and position
+        # Set initial window size and position; the screen size needs no layout pass, so this is one geometry call
         initial_width = 1280
         initial_height = 820
         self.root.minsize(800, 600)
-        self.root.geometry(f"{initial_width}x{initial_height}")
-        self.root.update_idletasks()
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
         x = (screen_width - initial_width) // 2
@@ -117,16 +166,33 @@ class GUIManager:
         self.update_button.pack(side=tk.LEFT, padx=5)
 
     def load_hexagram_image(self, number):
-        image_path = os.path.join(constants.IMAGES_DIR, f'hexagram{number:02d}.gif')
-        if number not in self.hexagram_images and os.path.exists(image_path):
-            try:
+        if number in self.hexagram_images:
+            return self.hexagram_images[number]
+        file_name = f'hexagram{number:02d}.gif'
+        pack = get_asset_pack()
+        pack_key = f'hexagram_images/{file_name}'
+        image_path = os.path.join(constants.IMAGES_DIR, file_name)
+        try:
+            if pack is not None and pack_key in pack:
+                photo = tk.PhotoImage(data=base64.b64encode(pack.view(pack_key)))
+            elif os.path.exists(image_path):
                 photo = tk.PhotoImage(file=image_path)
-                self.hexagram_images[number] = photo.subsample(2, 2)
-            except tk.TclError:
-                print(f"Error loading image: {image_path}")
+            else:
                 return None
+            self.hexagram_images[number] = photo.subsample(2, 2)
+        except tk.TclError:
+            print(f"Error loading image: {file_name}")
+            return None
         return self.hexagram_images.get(number)
 
+    def preload_hexagram_images(self, numbers):
+        """Decode the given images one per idle callback, so later hexagram changes never wait on a decode"""
+        numbers = [number for number in numbers if number not in self.hexagram_images]
+        if not numbers or not self.root:
+            return
+        self.load_hexagram_image(numbers.pop(0))
+        self.root.after_idle(self.preload_hexagram_images, numbers)
+
     def create_display_area(self):
         self.display_frame = ttk.Frame(self.content_frame)
         self.display_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -146,7 +212,7 @@ class GUIManager:
         self.output_frame = ttk.Frame(self.display_frame)
         self.output_frame.pack(fill=tk.BOTH, expand=True)
         
-        for i in range(21):
+        for i in range(3 + 6 * LINES_PER_LEVEL):
             label = ttk.Label(self.output_frame, text="", anchor="w", justify="left", font=("Courier", 10))
             label.pack(fill=tk.X, pady=0)
             self.output_labels.append(label)
@@ -162,6 +228,13 @@ class GUIManager:
         )
         self.send_to_vrchat_button.pack(side=tk.LEFT, padx=5)
 
+        self.avatar_parameters_button = ttk.Button(
+            self.control_buttons,
+            text="Avatar Parameters: ON" if constants.SEND_AVATAR_PARAMETERS_ENABLED else "Avatar Parameters: OFF",
+            command=self.toggle_avatar_parameters
+        )
+        self.avatar_parameters_button.pack(side=tk.LEFT, padx=5)
+
         self.page_button = ttk.Button(self.control_buttons, text=f"Page {constants.CURRENT_PAGE}", command=self.toggle_page)
         self.page_button.pack(side=tk.LEFT, padx=5)
 
@@ -171,6 +244,15 @@ class GUIManager:
         self.calculator_button = ttk.Button(self.control_buttons, text="Zero Date Calculator", command=self.open_calculator)
         self.calculator_button.pack(side=tk.LEFT, padx=5)
 
+        self.comparison_button = ttk.Button(self.control_buttons, text="Compare Zero Dates", command=self.open_comparison)
+        self.comparison_button.pack(side=tk.LEFT, padx=5)
+
+        self.timeline_button = ttk.Button(self.control_buttons, text="Timeline", command=self.open_timeline)
+        self.timeline_button.pack(side=tk.LEFT, padx=5)
+
+        self.alerts_button = ttk.Button(self.control_buttons, text="Alerts", command=self.open_alerts)
+        self.alerts_button.pack(side=tk.LEFT, padx=5)
+
         self.copy_button = ttk.Button(self.control_buttons, text="Copy to Clipboard", command=self.copy_to_clipboard)
         self.copy_button.pack(side=tk.LEFT, padx=5)
 
@@ -194,6 +276,22 @@ class GUIManager:
         self.check_button = ttk.Button(self.input_frame, text="Check Hexagrams", command=self.check_hexagrams)
         self.check_button.pack(side=tk.LEFT, padx=5)
 
+        self.scrub_frame = ttk.Frame(self.check_panel)
+        self.scrub_frame.pack(fill=tk.X, pady=5)
+
+        # The span also bounds the change lists and searches below
+        self.scrub_label = ttk.Label(self.scrub_frame, text="Span:")
+        self.scrub_label.pack(side=tk.LEFT, padx=5)
+        self.scrub_span = tk.StringVar(value="1 year")
+        self.scrub_span_box = ttk.Combobox(
+            self.scrub_frame, textvariable=self.scrub_span,
+            values=list(constants.CHECKER_SCRUB_SPANS), state="readonly", width=10
+        )
+        self.scrub_span_box.pack(side=tk.LEFT, padx=5)
+        self.scrub_span_box.bind("<<ComboboxSelected>>", self.reset_scrubber)
+        self.scrub_scale = ttk.Scale(self.scrub_frame, from_=-1.0, to=1.0, orient=tk.HORIZONTAL, command=self.on_scrub)
+        self.scrub_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
         self.check_display_frame = ttk.Frame(self.check_panel)
         self.check_display_frame.pack(fill=tk.BOTH, expand=True, pady=5)
 
@@ -218,273 +316,313 @@ class GUIManager:
         self.check_text.pack(fill=tk.BOTH, expand=True, pady=5)
         self.check_text.configure(state='disabled')
 
+        self.results_controls = ttk.Frame(self.check_panel)
+        self.results_controls.pack(fill=tk.X, pady=5)
+        ttk.Label(self.results_controls, text="Changes of level:").pack(side=tk.LEFT, padx=5)
+        self.results_level = tk.StringVar(value="4")
+        ttk.Combobox(
+            self.results_controls, textvariable=self.results_level,
+            values=[str(level) for level in range(1, 7)], state="readonly", width=3
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.results_controls, text="List", command=self.list_transitions).pack(side=tk.LEFT, padx=5)
+        ttk.Label(self.results_controls, text="Find:").pack(side=tk.LEFT, padx=5)
+        self.find_entry = ttk.Entry(self.results_controls)
+        self.find_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.find_entry.bind("<Return>", lambda event: self.find_intervals())
+        ttk.Button(self.results_controls, text="Find", command=self.find_intervals).pack(side=tk.LEFT, padx=5)
+
+        self.results_status = ttk.Label(self.check_panel, text="")
+        self.results_status.pack(fill=tk.X, padx=5)
+        self.results_view = ResultsView(
+            self.check_panel, constants.CHECKER_RESULT_ROWS,
+            on_status=lambda text: self.results_status.config(text=text)
+        )
+        self.results_view.pack(fill=tk.BOTH, expand=True, pady=5)
+
     def copy_to_clipboard(self):
         content = "\n".join(label.cget("text") for label in self.output_labels if label.cget("text"))
         self.root.clipboard_clear()
         self.root.clipboard_append(content)
 
-    def update_display(self, hexagrams, time_to_zero, text_widget=None, input_datetime=None):
+    def update_display(self, snapshot, text_widget=None, input_datetime=None):
         if text_widget is None:
-            self.update_main_display(hexagrams, time_to_zero, input_datetime)
+            # Sound cues and VRChat values follow every tick; only the redraw is throttled
+            self.process_transitions(snapshot)
+            if self.should_render():
+                self.update_main_display(snapshot, input_datetime)
+            # The comparison window is throttled on its own, so it keeps updating while the main window is minimized
+            if self.comparison_window is not None and self.should_render_comparison():
+                self.update_comparison_display(snapshot)
         else:
-            self.update_check_display(hexagrams, time_to_zero, text_widget, input_datetime)
+            self.update_check_display(snapshot, text_widget, input_datetime)
+
+    def seed_transitions(self, snapshot):
+        """Take the snapshot's hexagrams and moving lines as already announced, so they play no cues"""
+        for level in range(1, 7):
+            constants.previous_hexagrams[f'level_{level}'] = snapshot.hexagram_number(level)
+            constants.previous_hexagrams[f'level_{level}_line'] = snapshot.moving_line(level)
+
+    def process_transitions(self, snapshot):
+        """Play sounds for hexagram/line changes and keep the level 6 VRChat values current"""
+        cues = []
+        for level in range(1, 7):
+            hexagram_number = snapshot.hexagram_number(level)
+            moving_line = snapshot.moving_line(level)
+            if constants.previous_hexagrams.get(f'level_{level}') != hexagram_number and getattr(constants, f'PLAY_AUDIO_LEVEL_{level}_ENABLED'):
+                constants.previous_hexagrams[f'level_{level}'] = hexagram_number
+                cues.append(f'level{level}')
+            if constants.previous_hexagrams.get(f'level_{level}_line') != moving_line and getattr(constants, f'PLAY_AUDIO_LEVEL_{level}_LINE_ENABLED'):
+                constants.previous_hexagrams[f'level_{level}_line'] = moving_line
+                cues.append(f'level{level}_line')
+        self.level6_moving_line_days = snapshot.ticks_to_line_change(6) // TICKS_PER_DAY
+        self.level6_moving_line_num = snapshot.moving_line(6)
+        # Coincident changes at nested levels go out together as one voice
+        self.sound_manager.play_cues(cues)
+
+    def get_render_interval(self):
+        """Seconds between redraws for the finest visible timer, or None when nothing is visible"""
+        if not self.window_visible or not self.visible_levels:
+            return None
+        return min(constants.LEVEL_RENDER_INTERVALS[level] for level in self.visible_levels)
+
+    def should_render(self):
+        interval = self.get_render_interval()
+        now = time.monotonic()
+        if interval is None or now - self.last_render_time < interval - 0.005:
+            self.frames_skipped += 1
+            return False
+        self.last_render_time = now
+        self.frames_rendered += 1
+        return True
+
+    def should_render_comparison(self):
+        now = time.monotonic()
+        if not self.comparison_visible or now - self.last_comparison_render_time < constants.COMPARISON_RENDER_INTERVAL - 0.005:
+            return False
+        self.last_comparison_render_time = now
+        return True
+
+    def request_render(self):
+        """Make the next tick redraw regardless of the current render interval"""
+        self.last_render_time = 0.0
+        self.last_comparison_render_time = 0.0
+
+    def visible_after(self, event, visible):
+        """Whether a toplevel is visible after a Map, Unmap or Visibility event"""
+        if event.type == tk.EventType.Unmap:
+            return False
+        if event.type == tk.EventType.Map:
+            return True
+        if event.type == tk.EventType.Visibility:
+            return event.state != 'VisibilityFullyObscured'
+        return visible
+
+    def on_window_state_change(self, event):
+        if event.widget is not self.root:
+            return
+        self.window_visible = self.visible_after(event, self.window_visible)
+        if self.window_visible:
+            self.request_render()
 
-    def update_main_display(self, hexagrams, time_to_zero, input_datetime=None):
-        for hexagram in hexagrams:
-            level, _, _, hexagram_number, _, _ = hexagram
+    def on_comparison_state_change(self, event):
+        if event.widget is not self.comparison_window:
+            return
+        self.comparison_visible = self.visible_after(event, self.comparison_visible)
+        if self.comparison_visible:
+            self.request_render()
+
+    def on_output_configure(self, event=None):
+        """Track which levels still have their timer rows inside the visible output area"""
+        frame_height = self.output_frame.winfo_height()
+        visible_levels = set()
+        for level in range(1, 7):
+            if self.output_labels[3 + (level - 1) * LINES_PER_LEVEL].winfo_y() < frame_height:
+                visible_levels.add(level)
+        self.visible_levels = visible_levels
+        self.request_render()
+
+    def format_timer(self, level, ticks):
+        """Countdown text in the precision each level's display uses"""
+        if level == 1:
+            return f"{ticks // TICKS_PER_MILLISECOND:03d}ms"
+        seconds = ticks // TICKS_PER_SECOND
+        if level == 2:
+            return f"{seconds:02d}s"
+        if level == 3:
+            return f"{seconds // 60:02d}:{seconds % 60:02d}"
+        days, seconds = divmod(seconds, 86400)
+        return f"{days:02d}d {seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+    def build_display_lines(self, snapshot, input_datetime=None):
+        """Header plus LINES_PER_LEVEL lines per level, shared by the main display and the Checker"""
+        now = input_datetime or datetime.datetime.now()
+        message_lines = [
+            f"Hexagrams for: {now.date()} - {now.time()}",
+            f"Days to 0: {round(snapshot.ticks_to_zero / TICKS_PER_DAY, 4)}",
+            f"Zero Date: {constants.ZERO_DATETIME}",
+        ]
+        for level in range(1, 7):
+            hex_timer = self.format_timer(level, snapshot.ticks_to_hexagram_change(level))
+            line_timer = self.format_timer(level, snapshot.ticks_to_line_change(level))
+            message_lines.append(f"Level {level}: {LEVEL_CYCLE_LABELS[level]}, Hexagram {snapshot.hexagram_number(level)} - {snapshot.hexagram_name(level)}")
+            message_lines.append(f"Level {level} changes in: {hex_timer}")
+            message_lines.append(f"Level {level}: Moving Line = ({snapshot.moving_line(level)}) Changes in: {line_timer}")
+            message_lines.append(
+                f"Level {level}: Changing to {short_label(snapshot.changed_hexagram(level))}, "
+                f"Nuclear {short_label(snapshot.nuclear_hexagram(level))}, Inverse {short_label(snapshot.inverse_hexagram(level))}"
+            )
+        return message_lines
+
+    def update_main_display(self, snapshot, input_datetime=None):
+        for level, label in self.hexagram_labels.items():
+            hexagram_number = snapshot.hexagram_number(level)
+            if self.displayed_hexagrams.get(level) == hexagram_number:
+                continue
             image = self.load_hexagram_image(hexagram_number)
-            if image and level in self.hexagram_labels:
-                self.hexagram_labels[level].configure(image=image)
-                self.hexagram_labels[level].image = image
-        
-        message_lines = []
-        if not hexagrams:
-            message_lines.append("No hexagrams found for the current date.")
-        else:
-            current_date = input_datetime.date() if input_datetime else datetime.datetime.now().date()
-            current_time = input_datetime.time() if input_datetime else datetime.datetime.now().time()
-            days_to_zero = round(time_to_zero.total_seconds() / 86400, 4)
-            message_lines.append(f"Hexagrams for: {current_date} - {current_time}")
-            message_lines.append(f"Days to 0: {days_to_zero}")
-            message_lines.append(f"Zero Date: {constants.ZERO_DATETIME}")
-            
-            for level, cycle_length, _, hexagram_number, hexagram_name, time_since_last_change in hexagrams:
-                moving_line = int((time_since_last_change // (cycle_length.total_seconds() / 6)) + 1)
-                time_until_next_hexagram_change = time_since_last_change % cycle_length.total_seconds()
-                line_change_interval = cycle_length.total_seconds() / 6
-                time_until_next_line_change = time_since_last_change % line_change_interval
-                
-                if level == 1:
-                    milliseconds = int(time_until_next_hexagram_change * 1000)
-                    hex_timer = f"{milliseconds:03d}ms"
-                    line_milliseconds = int(time_until_next_line_change * 1000)
-                    line_timer = f"{line_milliseconds:03d}ms"
-                    message_lines.append(f"Level {level}: {cycle_length.total_seconds():.4f} s, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level 1 changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                    if constants.previous_hexagrams.get(f'level_{level}') != hexagram_number and constants.PLAY_AUDIO_LEVEL_1_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}'] = hexagram_number
-                        self.sound_manager.play_level_sound(1)
-                    if constants.previous_hexagrams.get(f'level_{level}_line') != moving_line and constants.PLAY_AUDIO_LEVEL_1_LINE_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}_line'] = moving_line
-                        self.sound_manager.play_line_sound(1)
-                elif level == 2:
-                    seconds = int(time_until_next_hexagram_change)
-                    hex_timer = f"{seconds:02d}s"
-                    line_seconds = int(time_until_next_line_change)
-                    line_timer = f"{line_seconds:02d}s"
-                    message_lines.append(f"Level {level}: {cycle_length.total_seconds()} s, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level 2 changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                    if constants.previous_hexagrams.get(f'level_{level}') != hexagram_number and constants.PLAY_AUDIO_LEVEL_2_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}'] = hexagram_number
-                        self.sound_manager.play_level_sound(2)
-                    if constants.previous_hexagrams.get(f'level_{level}_line') != moving_line and constants.PLAY_AUDIO_LEVEL_2_LINE_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}_line'] = moving_line
-                        self.sound_manager.play_line_sound(2)
-                elif level == 3:
-                    total_seconds = time_until_next_hexagram_change
-                    minutes = int(total_seconds // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_minutes = int(line_total_seconds // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 3600:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} h, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level 3 changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                    if constants.previous_hexagrams.get(f'level_{level}') != hexagram_number and constants.PLAY_AUDIO_LEVEL_3_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}'] = hexagram_number
-                        self.sound_manager.play_level_sound(3)
-                    if constants.previous_hexagrams.get(f'level_{level}_line') != moving_line and constants.PLAY_AUDIO_LEVEL_3_LINE_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}_line'] = moving_line
-                        self.sound_manager.play_line_sound(3)
-                elif level == 4:
-                    total_seconds = time_until_next_hexagram_change
-                    days = int(total_seconds // 86400)
-                    hours = int((total_seconds % 86400) // 3600)
-                    minutes = int((total_seconds % 3600) // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{days:02d}d {hours:02d}:{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_days = int(line_total_seconds // 86400)
-                    line_hours = int((line_total_seconds % 86400) // 3600)
-                    line_minutes = int((line_total_seconds % 3600) // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_days:02d}d {line_hours:02d}:{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 86400:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} days, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level {level} changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                    if constants.previous_hexagrams.get(f'level_{level}') != hexagram_number and constants.PLAY_AUDIO_LEVEL_4_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}'] = hexagram_number
-                        self.sound_manager.play_level_sound(4)
-                    if constants.previous_hexagrams.get(f'level_{level}_line') != moving_line and constants.PLAY_AUDIO_LEVEL_4_LINE_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}_line'] = moving_line
-                        self.sound_manager.play_line_sound(4)
-                elif level == 5:
-                    total_seconds = time_until_next_hexagram_change
-                    days = int(total_seconds // 86400)
-                    hours = int((total_seconds % 86400) // 3600)
-                    minutes = int((total_seconds % 3600) // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{days:02d}d {hours:02d}:{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_days = int(line_total_seconds // 86400)
-                    line_hours = int((line_total_seconds % 86400) // 3600)
-                    line_minutes = int((line_total_seconds % 3600) // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_days:02d}d {line_hours:02d}:{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 86400:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} days, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level {level} changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                    if constants.previous_hexagrams.get(f'level_{level}') != hexagram_number and constants.PLAY_AUDIO_LEVEL_5_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}'] = hexagram_number
-                        self.sound_manager.play_level_sound(5)
-                    if constants.previous_hexagrams.get(f'level_{level}_line') != moving_line and constants.PLAY_AUDIO_LEVEL_5_LINE_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}_line'] = moving_line
-                        self.sound_manager.play_line_sound(5)
-                elif level == 6:
-                    total_seconds = time_until_next_hexagram_change
-                    days = int(total_seconds // 86400)
-                    hours = int((total_seconds % 86400) // 3600)
-                    minutes = int((total_seconds % 3600) // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{days:02d}d {hours:02d}:{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_days = int(line_total_seconds // 86400)
-                    line_hours = int((line_total_seconds % 86400) // 3600)
-                    line_minutes = int((line_total_seconds % 3600) // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_days:02d}d {line_hours:02d}:{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 86400:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} days, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level {level} changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                    # Store for VRChat sync
-                    self.level6_moving_line_days = line_days
-                    self.level6_moving_line_num = moving_line
-                    if constants.previous_hexagrams.get(f'level_{level}') != hexagram_number and constants.PLAY_AUDIO_LEVEL_6_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}'] = hexagram_number
-                        self.sound_manager.play_level_sound(6)
-                    if constants.previous_hexagrams.get(f'level_{level}_line') != moving_line and constants.PLAY_AUDIO_LEVEL_6_LINE_ENABLED:
-                        constants.previous_hexagrams[f'level_{level}_line'] = moving_line
-                        self.sound_manager.play_line_sound(6)
-
-        for i, line in enumerate(message_lines[:len(self.output_labels)]):
-            if self.output_labels[i].cget("text") != line:
-                self.output_labels[i].config(text=line)
-        for i in range(len(message_lines), len(self.output_labels)):
-            if self.output_labels[i].cget("text") != "":
-                self.output_labels[i].config(text="")
-
-    def update_check_display(self, hexagrams, time_to_zero, text_widget, input_datetime=None):
-        message_lines = []
-        if not hexagrams:
-            message_lines.append("No hexagrams found for the specified date.")
+            if image:
+                label.configure(image=image)
+                label.image = image
+                self.displayed_hexagrams[level] = hexagram_number
+
+        self.set_label_texts(self.output_labels, self.build_display_lines(snapshot, input_datetime))
+
+    def set_label_texts(self, labels, lines):
+        """Reconfigure only the labels whose text changed; labels past the last line are cleared"""
+        for i, label in enumerate(labels):
+            line = lines[i] if i < len(lines) else ""
+            if label.cget("text") != line:
+                label.config(text=line)
+
+    def update_comparison_display(self, snapshot):
+        # The main snapshot fixes the instant, so every zero date is read at the same tick
+        now_ticks = datetime_to_ticks(constants.ZERO_DATETIME) - snapshot.ticks_to_zero
+        self.set_label_texts(self.comparison_labels, self.comparison.format_rows(now_ticks))
+
+    def update_check_display(self, snapshot, text_widget, input_datetime=None):
+        self.write_text_lines(text_widget, self.build_display_lines(snapshot, input_datetime))
+
+    def write_text_lines(self, text_widget, lines):
+        """Replace only the lines that changed; a different line count rewrites the widget"""
+        shown = self.text_widget_lines.get(str(text_widget))
+        text_widget.configure(state='normal')
+        if shown is None or len(shown) != len(lines):
+            text_widget.delete("1.0", tk.END)
+            text_widget.insert(tk.END, "\n".join(lines) + "\n")
+            text_widget.see(tk.END)
         else:
-            current_date = input_datetime.date() if input_datetime else datetime.datetime.now().date()
-            current_time = input_datetime.time() if input_datetime else datetime.datetime.now().time()
-            days_to_zero = round(time_to_zero.total_seconds() / 86400, 4)
-            message_lines.append(f"Hexagrams for: {current_date} - {current_time}")
-            message_lines.append(f"Days to 0: {days_to_zero}")
-            message_lines.append(f"Zero Date: {constants.ZERO_DATETIME}")
-            
-            for level, cycle_length, _, hexagram_number, hexagram_name, time_since_last_change in hexagrams:
-                moving_line = int((time_since_last_change // (cycle_length.total_seconds() / 6)) + 1)
-                time_until_next_hexagram_change = time_since_last_change % cycle_length.total_seconds()
-                line_change_interval = cycle_length.total_seconds() / 6
-                time_until_next_line_change = time_since_last_change % line_change_interval
-                
-                if level == 1:
-                    milliseconds = int(time_until_next_hexagram_change * 1000)
-                    hex_timer = f"{milliseconds:03d}ms"
-                    line_milliseconds = int(time_until_next_line_change * 1000)
-                    line_timer = f"{line_milliseconds:03d}ms"
-                    message_lines.append(f"Level {level}: {cycle_length.total_seconds():.4f} s, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level 1 changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                elif level == 2:
-                    seconds = int(time_until_next_hexagram_change)
-                    hex_timer = f"{seconds:02d}s"
-                    line_seconds = int(time_until_next_line_change)
-                    line_timer = f"{line_seconds:02d}s"
-                    message_lines.append(f"Level {level}: {cycle_length.total_seconds()} s, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level 2 changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                elif level == 3:
-                    total_seconds = time_until_next_hexagram_change
-                    minutes = int(total_seconds // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_minutes = int(line_total_seconds // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 3600:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} h, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level 3 changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                elif level == 4:
-                    total_seconds = time_until_next_hexagram_change
-                    days = int(total_seconds // 86400)
-                    hours = int((total_seconds % 86400) // 3600)
-                    minutes = int((total_seconds % 3600) // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{days:02d}d {hours:02d}:{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_days = int(line_total_seconds // 86400)
-                    line_hours = int((line_total_seconds % 86400) // 3600)
-                    line_minutes = int((line_total_seconds % 3600) // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_days:02d}d {line_hours:02d}:{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 86400:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} days, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level {level} changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                elif level == 5:
-                    total_seconds = time_until_next_hexagram_change
-                    days = int(total_seconds // 86400)
-                    hours = int((total_seconds % 86400) // 3600)
-                    minutes = int((total_seconds % 3600) // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{days:02d}d {hours:02d}:{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_days = int(line_total_seconds // 86400)
-                    line_hours = int((line_total_seconds % 86400) // 3600)
-                    line_minutes = int((line_total_seconds % 3600) // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_days:02d}d {line_hours:02d}:{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 86400:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} days, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level {level} changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-                elif level == 6:
-                    total_seconds = time_until_next_hexagram_change
-                    days = int(total_seconds // 86400)
-                    hours = int((total_seconds % 86400) // 3600)
-                    minutes = int((total_seconds % 3600) // 60)
-                    seconds = int(total_seconds % 60)
-                    hex_timer = f"{days:02d}d {hours:02d}:{minutes:02d}:{seconds:02d}"
-                    line_total_seconds = time_until_next_line_change
-                    line_days = int(line_total_seconds // 86400)
-                    line_hours = int((line_total_seconds % 86400) // 3600)
-                    line_minutes = int((line_total_seconds % 3600) // 60)
-                    line_seconds = int(line_total_seconds % 60)
-                    line_timer = f"{line_days:02d}d {line_hours:02d}:{line_minutes:02d}:{line_seconds:02d}"
-                    cycle_length_str = f"{cycle_length.total_seconds() / 86400:.2f}"
-                    message_lines.append(f"Level {level}: {cycle_length_str} days, Hexagram {hexagram_number} - {hexagram_name}")
-                    message_lines.append(f"Level {level} changes in: {hex_timer}")
-                    message_lines.append(f"Level {level}: Moving Line = ({moving_line}) Changes in: {line_timer}")
-        
+            for row, (old_line, line) in enumerate(zip(shown, lines), start=1):
+                if old_line != line:
+                    text_widget.delete(f"{row}.0", f"{row}.end")
+                    text_widget.insert(f"{row}.0", line)
+        text_widget.configure(state='disabled')
+        self.text_widget_lines[str(text_widget)] = list(lines)
+
+    def write_text_message(self, text_widget, message):
         text_widget.configure(state='normal')
         text_widget.delete("1.0", tk.END)
-        text_widget.insert(tk.END, "\n".join(message_lines) + "\n")
+        text_widget.insert(tk.END, message)
         text_widget.configure(state='disabled')
-        text_widget.see(tk.END)
+        self.text_widget_lines.pop(str(text_widget), None)
+
+    def evaluate_check(self, input_datetime):
+        """Snapshot and display lines for a Checker instant, cached so scrubbing back over it is free"""
+        key = (constants.ZERO_DATETIME, input_datetime)
+        cached = self.check_cache.get(key)
+        if cached is not None:
+            self.check_cache.move_to_end(key)
+            return cached
+        snapshot = self.hexagram_calculator.get_snapshot(constants.ZERO_DATETIME - input_datetime)
+        cached = (snapshot, self.build_display_lines(snapshot, input_datetime))
+        self.check_cache[key] = cached
+        if len(self.check_cache) > constants.CHECKER_CACHE_SIZE:
+            self.check_cache.popitem(last=False)
+        return cached
+
+    def show_check(self, input_datetime):
+        snapshot, lines = self.evaluate_check(input_datetime)
+        for level, label in self.check_hexagram_labels.items():
+            hexagram_number = snapshot.hexagram_number(level)
+            if self.check_displayed_hexagrams.get(level) == hexagram_number:
+                continue
+            image = self.load_hexagram_image(hexagram_number)
+            if image:
+                label.configure(image=image)
+                label.image = image
+                self.check_displayed_hexagrams[level] = hexagram_number
+        self.write_text_lines(self.check_text, lines)
+        self.root.after_idle(self.prefetch_neighbor_images, snapshot)
+
+    def prefetch_neighbor_images(self, snapshot):
+        """Load the hexagrams either side of each level's current one before a drag reaches them"""
+        for level in range(1, 7):
+            hexagram_number = snapshot.hexagram_number(level)
+            self.load_hexagram_image(hexagram_number % 64 + 1)
+            self.load_hexagram_image((hexagram_number - 2) % 64 + 1)
+
+    def read_check_datetime(self):
+        return datetime.datetime.strptime(f"{self.date_entry.get()} {self.time_entry.get()}", "%Y-%m-%d %H:%M:%S")
+
+    def reset_scrubber(self, event=None):
+        """Re-centre the scrubber on the Checker entries, or on now if they are empty or invalid"""
+        try:
+            self.scrub_anchor = self.read_check_datetime()
+        except ValueError:
+            self.scrub_anchor = datetime.datetime.now().replace(microsecond=0)
+        self.scrub_value = 0.0
+        self.scrub_scale.set(0.0)
+
+    def on_scrub(self, value):
+        # Dragging fires far faster than the display needs; evaluate the latest value once per frame
+        self.scrub_value = float(value)
+        if not self.scrub_pending:
+            self.scrub_pending = True
+            self.root.after(constants.CHECKER_SCRUB_INTERVAL_MS, self.evaluate_scrub)
+
+    def evaluate_scrub(self):
+        self.scrub_pending = False
+        if self.scrub_anchor is None:
+            self.reset_scrubber()
+        span_seconds = constants.CHECKER_SCRUB_SPANS[self.scrub_span.get()] * 86400
+        # Snap to 1/1000 of the span so nearby drag positions share cache entries
+        step = max(1, span_seconds // 1000)
+        input_datetime = self.scrub_anchor + datetime.timedelta(seconds=round(self.scrub_value * span_seconds / step) * step)
+        self.date_entry.delete(0, tk.END)
+        self.date_entry.insert(0, f"{input_datetime:%Y-%m-%d}")
+        self.time_entry.delete(0, tk.END)
+        self.time_entry.insert(0, f"{input_datetime:%H:%M:%S}")
+        self.show_check(input_datetime)
+
+    def results_range(self):
+        """The Checker instant (now if the entries are empty or invalid) and the end of the selected span"""
+        try:
+            start = self.read_check_datetime()
+        except ValueError:
+            start = datetime.datetime.now().replace(microsecond=0)
+        return start, start + datetime.timedelta(days=constants.CHECKER_SCRUB_SPANS[self.scrub_span.get()])
+
+    def list_transitions(self):
+        start, end = self.results_range()
+        self.results_view.set_source(TransitionRows(
+            int(self.results_level.get()), datetime_to_ticks(start), datetime_to_ticks(end),
+            datetime_to_ticks(constants.ZERO_DATETIME)
+        ))
+
+    def find_intervals(self):
+        """Stream the intervals of the span where the Find expression holds; it may read levels from the selected one up"""
+        expression = self.find_entry.get().strip()
+        if not expression:
+            return
+        try:
+            compile(expression, '<predicate>', 'eval')
+        except SyntaxError as e:
+            self.results_status.config(text=f"Invalid expression: {e.msg}")
+            return
+        start, end = self.results_range()
+        cancel = threading.Event()
+        self.results_view.set_source(IntervalRows(search(
+            SnapshotExpression(expression), start, end, constants.ZERO_DATETIME,
+            finest_level=int(self.results_level.get()), cancel=cancel
+        ), cancel))
 
     def toggle_send_to_vrchat(self):
         constants.SEND_TO_VRCHAT_ENABLED = not constants.SEND_TO_VRCHAT_ENABLED
@@ -492,52 +630,50 @@ class GUIManager:
             text="Send to VRChat: ON" if constants.SEND_TO_VRCHAT_ENABLED else "Send to VRChat: OFF"
         )
 
+    def toggle_avatar_parameters(self):
+        constants.SEND_AVATAR_PARAMETERS_ENABLED = not constants.SEND_AVATAR_PARAMETERS_ENABLED
+        if constants.SEND_AVATAR_PARAMETERS_ENABLED:
+            # The avatar may have reset while streaming was off, so start from a full update
+            self.vrchat_manager.avatar_parameters.reset()
+        self.avatar_parameters_button.config(
+            text="Avatar Parameters: ON" if constants.SEND_AVATAR_PARAMETERS_ENABLED else "Avatar Parameters: OFF"
+        )
+
     def toggle_page(self):
-        constants.CURRENT_PAGE = 2 if constants.CURRENT_PAGE == 1 else 1
+        constants.CURRENT_PAGE = constants.CURRENT_PAGE % 3 + 1
         self.page_button.config(text=f"Page {constants.CURRENT_PAGE}")
 
-    def update_zero_datetime(self):
+    def update_zero_datetime(self, now=None):
+        """Apply the zero date entry; now is the instant to show, the current time by default"""
         try:
-            date_str = self.zero_date_entry.get()
-            new_datetime = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-            constants.ZERO_DATETIME = datetime.datetime(new_datetime.year, new_datetime.month, new_datetime.day)
-            current_datetime = datetime.datetime.now()
-            time_to_zero = constants.ZERO_DATETIME - current_datetime
-            hexagrams = self.hexagram_calculator.get_hexagrams(time_to_zero)
-            for level in range(1, 7):
-                for hexagram in hexagrams:
-                    if hexagram[0] == level:
-                        constants.previous_hexagrams[f'level_{level}'] = hexagram[3]
-                        moving_line = int((hexagram[5] // (hexagram[1].total_seconds() / 6)) + 1)
-                        constants.previous_hexagrams[f'level_{level}_line'] = moving_line
+            date_str = self.zero_date_entry.get().strip()
+            # A bare date means midnight; solver results may also carry a time of day
+            constants.ZERO_DATETIME = datetime.datetime.fromisoformat(date_str)
+            current_datetime = now or datetime.datetime.now()
+            snapshot = self.hexagram_calculator.get_snapshot(constants.ZERO_DATETIME - current_datetime)
+            self.seed_transitions(snapshot)
             self.audio_playback_allowed = False
-            self.update_display(hexagrams, time_to_zero)
+            self.request_render()
+            self.update_display(snapshot, input_datetime=now)
             self.root.after(100, self.enable_audio_playback)
         except ValueError:
-            print("Invalid date format. Please enter a date in the format YYYY-MM-DD.")
+            print("Invalid date format. Please enter a date as YYYY-MM-DD or YYYY-MM-DD HH:MM:SS.")
 
     def check_hexagrams(self):
-        date_str = self.date_entry.get()
-        time_str = self.time_entry.get()
         try:
-            input_datetime = datetime.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-            time_to_zero = constants.ZERO_DATETIME - input_datetime
-            hexagrams = self.hexagram_calculator.get_hexagrams(time_to_zero)
-            for hexagram in hexagrams:
-                level, _, _, hexagram_number, _, _ = hexagram
-                image = self.load_hexagram_image(hexagram_number)
-                if image and level in self.check_hexagram_labels:
-                    self.check_hexagram_labels[level].configure(image=image)
-                    self.check_hexagram_labels[level].image = image
-            self.update_display(hexagrams, time_to_zero, self.check_text, input_datetime)
+            input_datetime = self.read_check_datetime()
         except ValueError:
-            self.check_text.configure(state='normal')
-            self.check_text.delete("1.0", tk.END)
-            self.check_text.insert(tk.END, "Invalid date or time format.\nPlease enter date as YYYY-MM-DD and time as HH:MM:SS.")
-            self.check_text.configure(state='disabled')
+            self.write_text_message(self.check_text, "Invalid date or time format.\nPlease enter date as YYYY-MM-DD and time as HH:MM:SS.")
             for level in range(1, 7):
                 if level in self.check_hexagram_labels:
                     self.check_hexagram_labels[level].configure(image='')
+            self.check_displayed_hexagrams.clear()
+            return
+        self.show_check(input_datetime)
+        # Later drags scrub around the date just checked
+        self.scrub_anchor = input_datetime
+        self.scrub_value = 0.0
+        self.scrub_scale.set(0.0)
 
     def enable_audio_playback(self):
         self.audio_playback_allowed = True
@@ -590,6 +726,253 @@ class GUIManager:
         result_entry = ttk.Entry(frame, state="readonly")
         result_entry.pack(pady=5)
 
+        solver_results = []
+
+        def solve_observations():
+            solver_listbox.delete(0, tk.END)
+            solver_results.clear()
+            try:
+                observations = [
+                    parse_observation(line)
+                    for line in observations_text.get("1.0", tk.END).splitlines() if line.strip()
+                ]
+                window_start = datetime.datetime.fromisoformat(window_start_entry.get().strip())
+                window_end = datetime.datetime.fromisoformat(window_end_entry.get().strip())
+                if not observations:
+                    raise ValueError("Enter at least one observation.")
+                started = time.perf_counter()
+                intervals, truncated = solve_zero_dates(observations, window_start, window_end)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            except ValueError as e:
+                solver_status.config(text=str(e))
+                return
+            solver_results.extend(intervals)
+            for start, end in intervals:
+                solver_listbox.insert(tk.END, format_interval(start, end))
+            status = f"{len(intervals)} matching zero-date intervals in {elapsed_ms:.1f} ms"
+            if truncated:
+                status += " (truncated: add observations or narrow the window)"
+            solver_status.config(text=status)
+
+        def use_selected_zero_date():
+            selection = solver_listbox.curselection()
+            if not selection:
+                return
+            zero_date = representative_zero_date(*solver_results[selection[0]])
+            self.zero_date_entry.delete(0, tk.END)
+            self.zero_date_entry.insert(0, str(zero_date))
+            self.update_zero_datetime()
+
+        solver_frame = ttk.Frame(self.calculator_window)
+        solver_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+
+        ttk.Label(solver_frame, text="Solve from observations, one per line:").pack(anchor="w")
+        ttk.Label(solver_frame, text=OBSERVATION_FORMAT).pack(anchor="w")
+        observations_text = tk.Text(
+            solver_frame, width=50, height=5,
+            background=constants.DARK_THEME['text_bg'],
+            foreground=constants.DARK_THEME['foreground']
+        )
+        observations_text.pack(fill=tk.X, pady=5)
+
+        window_frame = ttk.Frame(solver_frame)
+        window_frame.pack(fill=tk.X)
+        ttk.Label(window_frame, text="Search from:").pack(side=tk.LEFT, padx=5)
+        window_start_entry = ttk.Entry(window_frame, width=12)
+        window_start_entry.pack(side=tk.LEFT)
+        window_start_entry.insert(0, "1900-01-01")
+        ttk.Label(window_frame, text="to:").pack(side=tk.LEFT, padx=5)
+        window_end_entry = ttk.Entry(window_frame, width=12)
+        window_end_entry.pack(side=tk.LEFT)
+        window_end_entry.insert(0, "2200-01-01")
+        ttk.Button(window_frame, text="Solve", command=solve_observations).pack(side=tk.LEFT, padx=5)
+
+        solver_status = ttk.Label(solver_frame, text="")
+        solver_status.pack(anchor="w", pady=5)
+        solver_listbox = tk.Listbox(
+            solver_frame, height=8,
+            background=constants.DARK_THEME['text_bg'],
+            foreground=constants.DARK_THEME['foreground']
+        )
+        solver_listbox.pack(fill=tk.BOTH, expand=True)
+        ttk.Button(solver_frame, text="Use Selected Zero Date", command=use_selected_zero_date).pack(pady=5)
+
+    def open_comparison(self):
+        if self.comparison_window and tk.Toplevel.winfo_exists(self.comparison_window):
+            self.comparison_window.lift()
+            return
+
+        self.comparison_window = tk.Toplevel(self.root)
+        self.comparison_window.title("Compare Zero Dates")
+        self.comparison_window.configure(background=constants.DARK_THEME['background'])
+        self.comparison_window.protocol("WM_DELETE_WINDOW", self.close_comparison)
+        self.comparison_visible = True
+        for sequence in ("<Map>", "<Unmap>", "<Visibility>"):
+            self.comparison_window.bind(sequence, self.on_comparison_state_change, add="+")
+
+        frame = ttk.Frame(self.comparison_window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        ttk.Label(frame, text="Zero dates, one per line (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS):").pack(anchor="w")
+        zero_dates_text = tk.Text(
+            frame, width=40, height=5,
+            background=constants.DARK_THEME['text_bg'],
+            foreground=constants.DARK_THEME['foreground']
+        )
+        zero_dates_text.pack(fill=tk.X, pady=5)
+        zero_dates_text.insert("1.0", "\n".join(str(zero_datetime) for zero_datetime in self.comparison.zero_datetimes))
+        status_label = ttk.Label(frame, text="")
+
+        def apply_zero_dates():
+            try:
+                zero_datetimes = parse_zero_dates(zero_dates_text.get("1.0", tk.END))
+            except ValueError as e:
+                status_label.config(text=str(e))
+                return
+            constants.COMPARISON_ZERO_DATETIMES = zero_datetimes
+            self.comparison.set_zero_datetimes(zero_datetimes)
+            self.create_comparison_rows(rows_frame)
+            status_label.config(text=f"Comparing {len(zero_datetimes)} zero dates")
+            self.request_render()
+
+        ttk.Button(frame, text="Apply", command=apply_zero_dates).pack(anchor="w")
+        status_label.pack(anchor="w", pady=5)
+
+        ttk.Label(frame, text=COMPARISON_HEADER, font=("Courier", 10)).pack(anchor="w")
+        rows_frame = ttk.Frame(frame)
+        rows_frame.pack(fill=tk.BOTH, expand=True)
+        self.create_comparison_rows(rows_frame)
+        self.request_render()
+
+    def create_comparison_rows(self, rows_frame):
+        """One label per zero date; the rows are rebuilt only when the list changes"""
+        for label in self.comparison_labels:
+            label.destroy()
+        self.comparison_labels = []
+        for _ in self.comparison.zero_datetimes:
+            label = ttk.Label(rows_frame, text="", anchor="w", font=("Courier", 10))
+            label.pack(fill=tk.X)
+            self.comparison_labels.append(label)
+
+    def close_comparison(self):
+        window = self.comparison_window
+        self.comparison_window = None
+        self.comparison_visible = False
+        self.comparison_labels = []
+        window.destroy()
+
+    def open_timeline(self):
+        if self.timeline_view and self.timeline_view.exists():
+            self.timeline_view.lift()
+            return
+        self.timeline_view = TimelineView(self.root)
+
+    def open_alerts(self):
+        if self.alerts_window and tk.Toplevel.winfo_exists(self.alerts_window):
+            self.alerts_window.lift()
+            return
+
+        self.alerts_window = tk.Toplevel(self.root)
+        self.alerts_window.title("Alerts")
+        self.alerts_window.configure(background=constants.DARK_THEME['background'])
+
+        frame = ttk.Frame(self.alerts_window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        form = ttk.Frame(frame)
+        form.pack(fill=tk.X)
+        ttk.Label(form, text="Level:").grid(row=0, column=0, sticky="e", padx=5, pady=2)
+        level_box = ttk.Combobox(form, values=[str(level) for level in range(1, 7)], state="readonly", width=5)
+        level_box.set("3")
+        level_box.grid(row=0, column=1, sticky="w")
+        ttk.Label(form, text="Hexagram (1-64, optional):").grid(row=1, column=0, sticky="e", padx=5, pady=2)
+        hexagram_entry = ttk.Entry(form, width=8)
+        hexagram_entry.grid(row=1, column=1, sticky="w")
+        ttk.Label(form, text="Moving line (1-6, optional):").grid(row=2, column=0, sticky="e", padx=5, pady=2)
+        line_entry = ttk.Entry(form, width=8)
+        line_entry.grid(row=2, column=1, sticky="w")
+        ttk.Label(form, text="OSC address (optional):").grid(row=3, column=0, sticky="e", padx=5, pady=2)
+        osc_entry = ttk.Entry(form, width=40)
+        osc_entry.grid(row=3, column=1, sticky="w")
+        play_sound = tk.BooleanVar(value=True)
+        play_sound_button = ttk.Checkbutton(form, text="Play the level's sound", variable=play_sound)
+        play_sound_button.grid(row=4, column=1, sticky="w")
+
+        def alert_sound(level):
+            """The level's cue, or None for a level without one (level 6)"""
+            sound = f'level{level}'
+            return sound if sound in self.sound_manager.sound_files else None
+
+        def update_play_sound_button(event=None):
+            play_sound_button.state(['!disabled'] if alert_sound(int(level_box.get())) else ['disabled'])
+
+        level_box.bind("<<ComboboxSelected>>", update_play_sound_button)
+        update_play_sound_button()
+        show_notification = tk.BooleanVar(value=True)
+        ttk.Checkbutton(form, text="Show a notification", variable=show_notification).grid(row=5, column=1, sticky="w")
+        status_label = ttk.Label(frame, text="")
+
+        alerts_listbox = tk.Listbox(
+            frame, width=70, height=10,
+            background=constants.DARK_THEME['text_bg'],
+            foreground=constants.DARK_THEME['foreground']
+        )
+        listed_alerts = []
+
+        def refresh_alerts():
+            alerts_listbox.delete(0, tk.END)
+            listed_alerts.clear()
+            for next_fire, alert in self.alert_manager.upcoming():
+                listed_alerts.append(alert)
+                alerts_listbox.insert(tk.END, f"{alert.label} - next {ticks_to_datetime(next_fire):%Y-%m-%d %H:%M:%S}")
+
+        def add_alert():
+            try:
+                level = int(level_box.get())
+                hexagram = int(hexagram_entry.get()) if hexagram_entry.get().strip() else None
+                line = int(line_entry.get()) if line_entry.get().strip() else None
+                alert = Alert(
+                    level, hexagram, line,
+                    sound=alert_sound(level) if play_sound.get() else None,
+                    osc_address=osc_entry.get().strip() or None,
+                    notify=show_notification.get()
+                )
+            except ValueError as e:
+                status_label.config(text=str(e))
+                return
+            self.alert_manager.add(alert)
+            status_label.config(text=f"Added: {alert.label}")
+            refresh_alerts()
+
+        def remove_alert():
+            selection = alerts_listbox.curselection()
+            if selection:
+                self.alert_manager.remove(listed_alerts[selection[0]])
+                refresh_alerts()
+
+        ttk.Button(frame, text="Add Alert", command=add_alert).pack(anchor="w", pady=5)
+        status_label.pack(anchor="w")
+        alerts_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="Remove Selected", command=remove_alert).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Refresh", command=refresh_alerts).pack(side=tk.LEFT, padx=5)
+        refresh_alerts()
+
+    def show_notification(self, message):
+        """Alert popup; safe to call from the tick thread"""
+        self.root.after(0, self.create_notification, message)
+
+    def create_notification(self, message):
+        self.root.bell()
+        popup = tk.Toplevel(self.root)
+        popup.title("Hexagram Alert")
+        popup.configure(background=constants.DARK_THEME['background'])
+        popup.attributes("-topmost", True)
+        ttk.Label(popup, text=message, font=("Courier", 12)).pack(padx=20, pady=(20, 10))
+        ttk.Button(popup, text="OK", command=popup.destroy).pack(pady=(0, 20))
+        popup.after(constants.ALERT_NOTIFICATION_SECONDS * 1000, popup.destroy)
+
     def open_sound_menu(self):
         if self.sound_menu_window and tk.Toplevel.winfo_exists(self.sound_menu_window):
             self.sound_menu_window.lift()
@@ -635,9 +1018,14 @@ class GUIManager:
     def run(self):
         self.root.mainloop()
 
+    def frame_counts(self):
+        """Redraws done and skipped by the render throttle, for the profiler report"""
+        return {'frames_rendered': self.frames_rendered, 'frames_skipped': self.frames_skipped}
+
     def cleanup(self):
         """
         Gracefully destroy the Tkinter root window and perform any additional cleanup if needed.
         """
+        self.results_view.close()
         if self.root:
             self.root.destroy()
\ No newline at end of file
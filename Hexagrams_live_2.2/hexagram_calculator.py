@@ -1,42 +1,124 @@
 import datetime
+from array import array
 from constants import HEXAGRAM_NAMES
+from hexagram_data import CHANGED_HEXAGRAMS, INVERSE_HEXAGRAMS, NUCLEAR_HEXAGRAMS, SHORT_NAMES
+
+# Exact integer time base. One tick is 1/32 microsecond, which makes every cycle
+# and moving-line length a whole number of ticks, down to level 1 lines of
+# 2025/6144 s.
+TICKS_PER_MICROSECOND = 32
+TICKS_PER_MILLISECOND = 1000 * TICKS_PER_MICROSECOND
+TICKS_PER_SECOND = 1000 * TICKS_PER_MILLISECOND
+TICKS_PER_MINUTE = 60 * TICKS_PER_SECOND
+TICKS_PER_HOUR = 60 * TICKS_PER_MINUTE
+TICKS_PER_DAY = 24 * TICKS_PER_HOUR
+
+LEVEL_COUNT = 6
+# Level 1 lasts 1.9775390625 s and every level is 64 of the one below it
+CYCLE_TICKS = tuple(63281250 * 64 ** level for level in range(LEVEL_COUNT))
+LINE_TICKS = tuple(cycle // 6 for cycle in CYCLE_TICKS)
+
+# Per-level fields of a HexagramSnapshot, in array order
+HEXAGRAM_NUMBER, MOVING_LINE, HEXAGRAM_CHANGE_TICKS, LINE_CHANGE_TICKS = range(4)
+FIELD_COUNT = 4
+_EMPTY_VALUES = array('q', [0] * (FIELD_COUNT * LEVEL_COUNT))
+
+
+def timedelta_to_ticks(delta):
+	return ((delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds) * TICKS_PER_MICROSECOND
+
+
+def ticks_to_timedelta(ticks):
+	return datetime.timedelta(microseconds=ticks // TICKS_PER_MICROSECOND)
+
+
+# Absolute instants are handled as ticks since this epoch
+EPOCH = datetime.datetime(2000, 1, 1)
+
+
+def datetime_to_ticks(value):
+	return timedelta_to_ticks(value - EPOCH)
+
+
+def ticks_to_datetime(ticks):
+	return EPOCH + ticks_to_timedelta(ticks)
+
+
+class HexagramSnapshot:
+	"""Every level's state for one instant, derived once per tick.
+
+	The per-level integers sit in one flat array, FIELD_COUNT per level. The two
+	'change' fields hold the ticks left in the current hexagram and moving line,
+	which is what the displays show as 'changes in'. Levels are numbered 1-6.
+	"""
+	__slots__ = ('ticks_to_zero', 'values')
+
+	def __init__(self, ticks_to_zero, values):
+		self.ticks_to_zero = ticks_to_zero
+		self.values = values
+
+	def hexagram_number(self, level):
+		return self.values[(level - 1) * FIELD_COUNT + HEXAGRAM_NUMBER]
+
+	def hexagram_name(self, level):
+		return HEXAGRAM_NAMES[self.values[(level - 1) * FIELD_COUNT + HEXAGRAM_NUMBER] - 1]
+
+	def short_name(self, level):
+		return SHORT_NAMES[self.values[(level - 1) * FIELD_COUNT + HEXAGRAM_NUMBER]]
+
+	def changed_hexagram(self, level):
+		"""Hexagram produced when the current moving line changes"""
+		base = (level - 1) * FIELD_COUNT
+		return CHANGED_HEXAGRAMS[self.values[base + HEXAGRAM_NUMBER] * 6 + self.values[base + MOVING_LINE] - 1]
+
+	def nuclear_hexagram(self, level):
+		return NUCLEAR_HEXAGRAMS[self.values[(level - 1) * FIELD_COUNT + HEXAGRAM_NUMBER]]
+
+	def inverse_hexagram(self, level):
+		return INVERSE_HEXAGRAMS[self.values[(level - 1) * FIELD_COUNT + HEXAGRAM_NUMBER]]
+
+	def moving_line(self, level):
+		return self.values[(level - 1) * FIELD_COUNT + MOVING_LINE]
+
+	def ticks_to_hexagram_change(self, level):
+		return self.values[(level - 1) * FIELD_COUNT + HEXAGRAM_CHANGE_TICKS]
+
+	def ticks_to_line_change(self, level):
+		return self.values[(level - 1) * FIELD_COUNT + LINE_CHANGE_TICKS]
+
+	def ticks_into_hexagram(self, level):
+		"""Ticks of the current hexagram already elapsed, on either side of the zero date
+
+		Before the zero date the counter runs down, so the change field is the time
+		left; after it the counter runs up and the change field is the time elapsed.
+		"""
+		remainder = self.values[(level - 1) * FIELD_COUNT + HEXAGRAM_CHANGE_TICKS]
+		if self.ticks_to_zero < 0:
+			return remainder
+		return CYCLE_TICKS[level - 1] - remainder
+
+
+def snapshot_at_ticks(ticks_to_zero):
+	counter = abs(ticks_to_zero)
+	values = array('q', _EMPTY_VALUES)
+	base = 0
+	for cycle, line in zip(CYCLE_TICKS, LINE_TICKS):
+		cycle_number, remainder = divmod(counter, cycle)
+		moving_line, line_remainder = divmod(remainder, line)
+		values[base] = cycle_number % 64 + 1
+		values[base + 1] = moving_line + 1
+		values[base + 2] = remainder
+		values[base + 3] = line_remainder
+		base += FIELD_COUNT
+	return HexagramSnapshot(ticks_to_zero, values)
+
+
+def snapshots_at_ticks(ticks_to_zero_values):
+	"""One snapshot per counter"""
+	return [snapshot_at_ticks(ticks_to_zero) for ticks_to_zero in ticks_to_zero_values]
+
 
 class HexagramCalculator:
-	def __init__(self):
-		self.cycles = [
-			datetime.timedelta(seconds=1.9775390625),
-			datetime.timedelta(minutes=2, seconds=6.5625),
-			datetime.timedelta(hours=2, minutes=15),
-			datetime.timedelta(days=6),
-			datetime.timedelta(days=384),
-			datetime.timedelta(days=24576)  # 384 days * 64
-		]
-
-	def get_hexagrams(self, time_to_zero):
-		hexagrams = []
-		total_seconds = abs(time_to_zero.total_seconds())
-
-		for level in range(6):  # Changed from 5 to 6
-			cycle_length = self.cycles[level]
-			if level == 0:
-				level_2_cycle_length = self.cycles[1]
-				cycle_number_level_2 = int(total_seconds // level_2_cycle_length.total_seconds())
-				cycle_number = (cycle_number_level_2 * 64 + int((total_seconds % level_2_cycle_length.total_seconds()) // cycle_length.total_seconds())) % 64
-			else:
-				cycle_number = int(total_seconds // cycle_length.total_seconds()) % 64
-			
-			time_since_last_change = total_seconds % cycle_length.total_seconds()
-			hexagram_number = (cycle_number % 64) + 1
-			hexagrams.append((
-				level + 1,
-				cycle_length,
-				"h",
-				hexagram_number,
-				HEXAGRAM_NAMES[hexagram_number - 1],
-				time_since_last_change
-			))
-
-		return hexagrams
-
-	def calculate_moving_line(self, time_since_last_change, cycle_length):
-		return int((time_since_last_change // (cycle_length.total_seconds() / 6)) + 1)
\ No newline at end of file
+	def get_snapshot(self, time_to_zero):
+		"""Snapshot of all levels for a time_to_zero timedelta"""
+		return snapshot_at_ticks(timedelta_to_ticks(time_to_zero))
@@ -0,0 +1,82 @@
+"""Precomputed King Wen metadata and derived-hexagram tables.
+
+Hexagrams are numbered 1-64 in King Wen order. A line pattern is 6 bits with
+line 1 (the bottom line) as bit 0 and a solid (yang) line as 1; the lower
+trigram is bits 0-2 and the upper trigram bits 3-5. Every table is built once
+at import, so lookups never touch the HEXAGRAM_NAMES strings.
+"""
+from constants import HEXAGRAM_NAMES
+
+# 3-bit trigram patterns, bottom line first
+CHIEN, TUI, LI, CHEN, SUN, KAN, KEN, KUN = 0b111, 0b011, 0b101, 0b001, 0b110, 0b010, 0b100, 0b000
+
+TRIGRAM_NAMES = {
+	CHIEN: "Chien (Heaven)",
+	TUI: "Tui (Lake)",
+	LI: "Li (Fire)",
+	CHEN: "Chen (Thunder)",
+	SUN: "Sun (Wind)",
+	KAN: "Kan (Water)",
+	KEN: "Ken (Mountain)",
+	KUN: "Kun (Earth)",
+}
+TRIGRAM_GLYPHS = {
+	CHIEN: "☰", TUI: "☱", LI: "☲", CHEN: "☳", SUN: "☴", KAN: "☵", KEN: "☶", KUN: "☷",
+}
+
+# (upper, lower) trigram of each hexagram in King Wen order
+_KING_WEN_TRIGRAMS = (
+	(CHIEN, CHIEN), (KUN, KUN), (KAN, CHEN), (KEN, KAN), (KAN, CHIEN), (CHIEN, KAN), (KUN, KAN), (KAN, KUN),
+	(SUN, CHIEN), (CHIEN, TUI), (KUN, CHIEN), (CHIEN, KUN), (CHIEN, LI), (LI, CHIEN), (KUN, KEN), (CHEN, KUN),
+	(TUI, CHEN), (KEN, SUN), (KUN, TUI), (SUN, KUN), (LI, CHEN), (KEN, LI), (KEN, KUN), (KUN, CHEN),
+	(CHIEN, CHEN), (KEN, CHIEN), (KEN, CHEN), (TUI, SUN), (KAN, KAN), (LI, LI), (TUI, KEN), (CHEN, SUN),
+	(CHIEN, KEN), (CHEN, CHIEN), (LI, KUN), (KUN, LI), (SUN, LI), (LI, TUI), (KAN, KEN), (CHEN, KAN),
+	(KEN, TUI), (SUN, CHEN), (TUI, CHIEN), (CHIEN, SUN), (TUI, KUN), (KUN, SUN), (TUI, KAN), (KAN, SUN),
+	(TUI, LI), (LI, SUN), (CHEN, CHEN), (KEN, KEN), (SUN, KEN), (CHEN, TUI), (CHEN, LI), (LI, KEN),
+	(SUN, SUN), (TUI, TUI), (SUN, KAN), (KAN, TUI), (SUN, TUI), (CHEN, KEN), (KAN, LI), (LI, KAN),
+)
+
+# All tables below are indexed by King Wen number; index 0 is unused
+UPPER_TRIGRAMS = (0,) + tuple(upper for upper, _lower in _KING_WEN_TRIGRAMS)
+LOWER_TRIGRAMS = (0,) + tuple(lower for _upper, lower in _KING_WEN_TRIGRAMS)
+KING_WEN_TO_BINARY = (0,) + tuple(upper << 3 | lower for upper, lower in _KING_WEN_TRIGRAMS)
+BINARY_TO_KING_WEN = tuple(KING_WEN_TO_BINARY.index(pattern, 1) for pattern in range(64))
+SHORT_NAMES = ("",) + tuple(name.split(" - ")[0] for name in HEXAGRAM_NAMES)
+GLYPHS = ("",) + tuple(chr(0x4DC0 + index) for index in range(64))
+
+
+def _reverse_lines(pattern):
+	return int(f"{pattern:06b}"[::-1], 2)
+
+
+# Hexagram reached when moving line N (1-6) changes: CHANGED_HEXAGRAMS[number * 6 + N - 1]
+CHANGED_HEXAGRAMS = (0,) * 6 + tuple(
+	BINARY_TO_KING_WEN[KING_WEN_TO_BINARY[number] ^ (1 << line)]
+	for number in range(1, 65) for line in range(6)
+)
+# Nuclear hexagram: lines 2-4 form the lower trigram and lines 3-5 the upper
+NUCLEAR_HEXAGRAMS = (0,) + tuple(
+	BINARY_TO_KING_WEN[(KING_WEN_TO_BINARY[number] >> 1 & 0b111) | (KING_WEN_TO_BINARY[number] >> 2 & 0b111) << 3]
+	for number in range(1, 65)
+)
+# Inverse hexagram: the figure turned upside down
+INVERSE_HEXAGRAMS = (0,) + tuple(
+	BINARY_TO_KING_WEN[_reverse_lines(KING_WEN_TO_BINARY[number])] for number in range(1, 65)
+)
+
+
+def changed_hexagram(number, moving_line):
+	return CHANGED_HEXAGRAMS[number * 6 + moving_line - 1]
+
+
+def nuclear_hexagram(number):
+	return NUCLEAR_HEXAGRAMS[number]
+
+
+def inverse_hexagram(number):
+	return INVERSE_HEXAGRAMS[number]
+
+
+def short_label(number):
+	"""'12 - Pi' style label used in compact displays"""
+	return f"{number} - {SHORT_NAMES[number]}"
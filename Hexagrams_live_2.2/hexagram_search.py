@@ -0,0 +1,209 @@
+"""Find every interval of a date range where a predicate over the hexagrams holds.
+
+Every level's hexagram and moving line only change where the counter
+|zero - t| crosses a multiple of that level's line length, and each coarser
+boundary is also a boundary of the finer levels. So between consecutive
+multiples of the finest searched line length the whole state is constant, and
+one snapshot per such block decides the predicate for all of it. The blocks
+are split into chunks that a process pool evaluates; matching intervals come
+back merged and in time order.
+
+The predicate receives a HexagramSnapshot and should only read hexagram
+numbers and moving lines of levels at or above finest_level (the countdown
+fields change inside a block). It runs in worker processes, so it must be
+picklable: a module-level function or a SnapshotExpression.
+
+    python hexagram_search.py 2025-01-01 2035-01-01 \\
+        "UPPER_TRIGRAMS[s.hexagram_number(4)] == LOWER_TRIGRAMS[s.hexagram_number(5)]" --finest-level 4
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+import constants
+import hexagram_data
+from hexagram_calculator import CYCLE_TICKS, LINE_TICKS, datetime_to_ticks, snapshot_at_ticks, ticks_to_datetime
+
+# Below this many blocks per worker a pool costs more than it saves
+MIN_CHUNK_BLOCKS = 20000
+CHUNKS_PER_WORKER = 4
+# A chunk checks for cancellation every this many blocks; the caller rechecks this often while waiting
+CANCEL_CHECK_BLOCKS = 4096
+CANCEL_POLL_SECONDS = 0.1
+
+# Set in pool workers by _init_worker, so a cancelled search stops its running chunks too
+_worker_cancel = None
+
+
+class SnapshotExpression:
+	"""Picklable predicate from a Python expression over the snapshot 's'.
+
+	The hexagram_data tables (UPPER_TRIGRAMS, NUCLEAR_HEXAGRAMS, ...) are in
+	scope, e.g. "s.hexagram_number(3) == 24 and s.moving_line(4) == 6".
+	"""
+
+	def __init__(self, expression):
+		self.expression = expression
+		self.code = None
+
+	def __getstate__(self):
+		return {'expression': self.expression}
+
+	def __setstate__(self, state):
+		self.expression = state['expression']
+		self.code = None
+
+	def __call__(self, snapshot):
+		if self.code is None:
+			self.code = compile(self.expression, '<predicate>', 'eval')
+			self.namespace = {name: getattr(hexagram_data, name) for name in dir(hexagram_data) if name.isupper()}
+		self.namespace['s'] = snapshot
+		return eval(self.code, self.namespace)
+
+
+def _block_bounds(zero_ticks, step, block):
+	"""Time interval [start, end) of block j, where the state is constant.
+
+	After the zero date blocks are [Z + j*step, Z + (j+1)*step). Before it the
+	counter runs backwards, so each block is shifted by one tick.
+	"""
+	if block >= 0:
+		return zero_ticks + block * step, zero_ticks + (block + 1) * step
+	return zero_ticks + block * step + 1, min(zero_ticks + (block + 1) * step + 1, zero_ticks)
+
+
+def _init_worker(cancel):
+	global _worker_cancel
+	_worker_cancel = cancel
+
+
+def search_chunk(predicate, zero_ticks, step, first_block, last_block, start, end, cancel=None):
+	"""Merged matching intervals, in ticks since the epoch, for blocks [first_block, last_block).
+
+	Returns early (with the intervals found so far) once cancel, or in a pool
+	worker the search's shared cancel event, is set.
+	"""
+	cancel = cancel if cancel is not None else _worker_cancel
+	intervals = []
+	for block in range(first_block, last_block):
+		if cancel is not None and (block - first_block) % CANCEL_CHECK_BLOCKS == 0 and cancel.is_set():
+			break
+		low, high = _block_bounds(zero_ticks, step, block)
+		low, high = max(low, start), min(high, end)
+		if low >= high or not predicate(snapshot_at_ticks(zero_ticks - low)):
+			continue
+		if intervals and intervals[-1][1] == low:
+			intervals[-1] = (intervals[-1][0], high)
+		else:
+			intervals.append((low, high))
+	return intervals
+
+
+def _chunks(first_block, last_block, count):
+	size = -(-(last_block - first_block) // count)
+	return [(block, min(block + size, last_block)) for block in range(first_block, last_block, size)]
+
+
+def search(predicate, start, end, zero_datetime=None, finest_level=1, include_lines=True, workers=None, progress=None, cancel=None):
+	"""Yield (start, end) datetimes of every maximal interval in [start, end) where predicate holds.
+
+	finest_level is the finest level the predicate reads; with include_lines
+	False it only reads hexagram numbers, so the search steps whole cycles.
+	progress, if given, is called as progress(done_chunks, total_chunks).
+	Setting the threading.Event cancel, or closing the generator, stops the
+	search and its worker processes within about CANCEL_POLL_SECONDS.
+	"""
+	if zero_datetime is None:
+		zero_datetime = constants.ZERO_DATETIME
+	if end <= start:
+		raise ValueError("end must be after start")
+	zero_ticks = datetime_to_ticks(zero_datetime)
+	start_ticks, end_ticks = datetime_to_ticks(start), datetime_to_ticks(end)
+	step = LINE_TICKS[finest_level - 1] if include_lines else CYCLE_TICKS[finest_level - 1]
+	# Blocks overlapping [start, end); the extra block on each side covers the shifted pre-zero bounds
+	first_block = (start_ticks - zero_ticks) // step - 1
+	last_block = (end_ticks - zero_ticks) // step + 2
+
+	workers = workers or os.cpu_count() or 1
+	workers = min(workers, max(1, (last_block - first_block) // MIN_CHUNK_BLOCKS))
+	chunks = _chunks(first_block, last_block, workers * CHUNKS_PER_WORKER if workers > 1 else 1)
+	arguments = [(predicate, zero_ticks, step, low, high, start_ticks, end_ticks) for low, high in chunks]
+
+	def merged(results):
+		pending = None
+		for done, intervals in enumerate(results, start=1):
+			for interval in intervals:
+				if pending is not None and pending[1] == interval[0]:
+					pending = (pending[0], interval[1])
+					continue
+				if pending is not None:
+					yield pending
+				pending = interval
+			if progress:
+				progress(done, len(chunks))
+		if pending is not None:
+			yield pending
+
+	def cancelled():
+		return cancel is not None and cancel.is_set()
+
+	if workers == 1:
+		results = (search_chunk(*chunk_arguments, cancel) for chunk_arguments in arguments)
+		for low, high in merged(results):
+			if cancelled():
+				return
+			yield ticks_to_datetime(low), ticks_to_datetime(high)
+		return
+
+	worker_cancel = multiprocessing.Event()
+	executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(worker_cancel,))
+
+	def ordered_results(futures):
+		# Results are taken in chunk order, so intervals stream out in time order as chunks finish
+		for future in futures:
+			while True:
+				try:
+					yield future.result(timeout=CANCEL_POLL_SECONDS)
+					break
+				except FutureTimeoutError:
+					if cancelled():
+						return
+
+	try:
+		futures = [executor.submit(search_chunk, *chunk_arguments) for chunk_arguments in arguments]
+		for low, high in merged(ordered_results(futures)):
+			if cancelled():
+				return
+			yield ticks_to_datetime(low), ticks_to_datetime(high)
+	finally:
+		# On cancel or close: drop queued chunks and make running ones return at their next check
+		worker_cancel.set()
+		executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Find intervals where a hexagram predicate holds")
+	parser.add_argument("start", type=datetime.datetime.fromisoformat)
+	parser.add_argument("end", type=datetime.datetime.fromisoformat)
+	parser.add_argument("expression", help="Python expression over the snapshot 's'")
+	parser.add_argument("--zero", type=datetime.datetime.fromisoformat, default=constants.ZERO_DATETIME)
+	parser.add_argument("--finest-level", type=int, default=1, choices=range(1, 7))
+	parser.add_argument("--hexagrams-only", action="store_true", help="the expression reads no moving lines")
+	parser.add_argument("--workers", type=int, default=None)
+	args = parser.parse_args()
+
+	def report(done, total):
+		print(f"[{done}/{total}]", file=sys.stderr)
+
+	matches = search(
+		SnapshotExpression(args.expression), args.start, args.end, args.zero,
+		args.finest_level, not args.hexagrams_only, args.workers, report
+	)
+	for start, end in matches:
+		print(f"{start} -> {end}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,144 @@
+"""Exact hexagram and moving-line dwell statistics over a date range.
+
+Every level's hexagram index is floor(counter / cycle) % 64 and its moving line
+floor(counter / line) % 6, where the counter is |zero date - t| in ticks. Both
+are periodic, so the time spent on each index over a range follows from a few
+divisions. The cost is 64 + 6 entries per level, however long the range.
+
+    python hexagram_statistics.py 2025-01-01 2030-01-01 [--zero 2055-07-16] [--format csv|json]
+"""
+import argparse
+import csv
+import datetime
+import io
+import json
+import sys
+import constants
+from hexagram_calculator import CYCLE_TICKS, LEVEL_COUNT, LINE_TICKS, TICKS_PER_SECOND, timedelta_to_ticks
+from hexagram_data import SHORT_NAMES
+
+
+def counter_ranges(start, end, zero_datetime):
+	"""Half-open counter intervals [low, high) covered while t runs over [start, end)"""
+	start_ticks = timedelta_to_ticks(zero_datetime - start)
+	end_ticks = timedelta_to_ticks(zero_datetime - end)
+	ranges = []
+	if start_ticks > 0:
+		# Before the zero date the counter falls from start_ticks towards 0
+		ranges.append((max(end_ticks, 0) + 1, start_ticks + 1))
+	if end_ticks < 0:
+		# After it the counter climbs from 0 again
+		ranges.append((max(-start_ticks, 0), -end_ticks))
+	return ranges
+
+
+def _ticks_below(counter, unit, count):
+	"""Ticks in [0, counter) spent on each index of a floor(x / unit) % count sequence"""
+	full_periods, remainder = divmod(counter, unit * count)
+	return [full_periods * unit + min(max(remainder - index * unit, 0), unit) for index in range(count)]
+
+
+def _blocks_touched(low, high, unit, count):
+	"""Number of distinct blocks of each index that overlap [low, high)"""
+	first, last = low // unit, (high - 1) // unit
+	return [(last - index) // count - (first - 1 - index) // count for index in range(count)]
+
+
+def index_statistics(ranges, unit, count):
+	dwell = [0] * count
+	occurrences = [0] * count
+	for low, high in ranges:
+		if high <= low:
+			continue
+		below_high = _ticks_below(high, unit, count)
+		below_low = _ticks_below(low, unit, count)
+		for index, touched in enumerate(_blocks_touched(low, high, unit, count)):
+			dwell[index] += below_high[index] - below_low[index]
+			occurrences[index] += touched
+	if len(ranges) == 2 and all(high > low for low, high in ranges):
+		# The block around the zero date is one continuous visit seen from both sides
+		occurrences[0] -= 1
+	return dwell, occurrences
+
+
+def compute_statistics(start, end, zero_datetime=None, levels=range(1, LEVEL_COUNT + 1)):
+	"""Dwell ticks and occurrence counts per hexagram and moving line for each level.
+
+	Returns {level: {'hexagram_ticks': [64], 'hexagram_occurrences': [64],
+	'line_ticks': [6], 'line_occurrences': [6]}}, index 0 being hexagram 1 / line 1.
+	"""
+	if zero_datetime is None:
+		zero_datetime = constants.ZERO_DATETIME
+	if end <= start:
+		raise ValueError("end must be after start")
+	ranges = counter_ranges(start, end, zero_datetime)
+	statistics = {}
+	for level in levels:
+		hexagram_ticks, hexagram_occurrences = index_statistics(ranges, CYCLE_TICKS[level - 1], 64)
+		line_ticks, line_occurrences = index_statistics(ranges, LINE_TICKS[level - 1], 6)
+		statistics[level] = {
+			'hexagram_ticks': hexagram_ticks,
+			'hexagram_occurrences': hexagram_occurrences,
+			'line_ticks': line_ticks,
+			'line_occurrences': line_occurrences,
+		}
+	return statistics
+
+
+def statistics_rows(statistics):
+	"""Flat rows: level, kind, number, name, dwell seconds, occurrences"""
+	for level, values in statistics.items():
+		for index, ticks in enumerate(values['hexagram_ticks']):
+			yield (level, 'hexagram', index + 1, SHORT_NAMES[index + 1], ticks / TICKS_PER_SECOND, values['hexagram_occurrences'][index])
+		for index, ticks in enumerate(values['line_ticks']):
+			yield (level, 'line', index + 1, '', ticks / TICKS_PER_SECOND, values['line_occurrences'][index])
+
+
+ROW_FIELDS = ('level', 'kind', 'number', 'name', 'dwell_seconds', 'occurrences')
+
+
+def write_csv(statistics, output):
+	writer = csv.writer(output)
+	writer.writerow(ROW_FIELDS)
+	writer.writerows(statistics_rows(statistics))
+
+
+def write_json(statistics, output, start, end, zero_datetime):
+	json.dump({
+		'start': start.isoformat(),
+		'end': end.isoformat(),
+		'zero_datetime': zero_datetime.isoformat(),
+		'rows': [dict(zip(ROW_FIELDS, row)) for row in statistics_rows(statistics)],
+	}, output, ensure_ascii=False, indent=1)
+
+
+def format_statistics(statistics, output_format, start, end, zero_datetime):
+	output = io.StringIO()
+	if output_format == 'json':
+		write_json(statistics, output, start, end, zero_datetime)
+	else:
+		write_csv(statistics, output)
+	return output.getvalue()
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Exact hexagram dwell statistics for a date range")
+	parser.add_argument("start", type=datetime.datetime.fromisoformat)
+	parser.add_argument("end", type=datetime.datetime.fromisoformat)
+	parser.add_argument("--zero", type=datetime.datetime.fromisoformat, default=constants.ZERO_DATETIME)
+	parser.add_argument("--levels", type=int, nargs="+", default=list(range(1, LEVEL_COUNT + 1)))
+	parser.add_argument("--format", choices=("csv", "json"), default="csv")
+	parser.add_argument("--output", help="file to write instead of stdout")
+	args = parser.parse_args()
+
+	statistics = compute_statistics(args.start, args.end, args.zero, args.levels)
+	text = format_statistics(statistics, args.format, args.start, args.end, args.zero)
+	if args.output:
+		with open(args.output, 'w', encoding='utf-8', newline='') as output:
+			output.write(text)
+	else:
+		sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+	main()
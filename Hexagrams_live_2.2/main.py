@@ -1,13 +1,18 @@
-import threading
 import time
+# Reference point for the time-to-first-frame log, taken before the heavier imports
+LAUNCH_TIME = time.perf_counter()
+import argparse
+import multiprocessing
+import threading
 import signal
 import sys
-import os
 import datetime
 from sound_manager import SoundManager
 from hexagram_calculator import HexagramCalculator
 from vrchat_manager import VRChatManager
 from gui_manager import GUIManager
+from profiler import RuntimeProfiler
+from alerts import Alert, AlertManager
 import constants
 
 class HexagramApp:
@@ -17,36 +22,71 @@ class HexagramApp:
 		constants.UPDATE_HEXAGRAMS = True
 		constants.EXIT_FLAG = False
 		
-		# Ensure sound directory exists before initializing sound manager
-		if not os.path.exists(constants.SOUNDS_DIR):
-			os.makedirs(constants.SOUNDS_DIR)
-		
-		# Initialize previous hexagrams state
-		current_datetime = datetime.datetime.now()
-		time_to_zero = constants.ZERO_DATETIME - current_datetime
-		
-		self.sound_manager = SoundManager()
+		# Managers are created idle; the mixer, sound decoding and the audio worker start after the first frame
+		if constants.ISOLATED_WORKERS:
+			# Audio playback and OSC sends run in their own processes, away from Tk's GIL
+			from worker_processes import AudioWorkerClient, OSCWorkerClient
+			self.sound_manager = AudioWorkerClient(start=False)
+			self.vrchat_manager = OSCWorkerClient()
+		elif constants.ASYNCIO_RUNTIME:
+			from async_runtime import AsyncVRChatManager
+			self.sound_manager = SoundManager(start=False)
+			self.vrchat_manager = AsyncVRChatManager()
+		else:
+			self.sound_manager = SoundManager(start=False)
+			self.vrchat_manager = VRChatManager()
 		self.hexagram_calculator = HexagramCalculator()
-		self.vrchat_manager = VRChatManager()
-		
-		# Calculate initial hexagrams before GUI setup
-		initial_hexagrams = self.hexagram_calculator.get_hexagrams(time_to_zero)
-		constants.previous_hexagrams = {}  # Initialize the dictionary
-		
-		for level in range(1, 7):
-			for hexagram in initial_hexagrams:
-				if hexagram[0] == level:  # if this is the hexagram for current level
-					constants.previous_hexagrams[f'level_{level}'] = hexagram[3]  # Store hexagram number
-					moving_line = int((hexagram[5] // (hexagram[1].total_seconds() / 6)) + 1)
-					constants.previous_hexagrams[f'level_{level}_line'] = moving_line
 		
 		self.gui_manager = GUIManager(self.sound_manager, self.hexagram_calculator, self.vrchat_manager)
+		self.first_frame_logged = False
+		self.show_first_frame()
+		self.profiler = RuntimeProfiler(self.gui_manager.root, self.gui_manager.frame_counts)
+		self.alert_manager = AlertManager(self.sound_manager, self.vrchat_manager, self.gui_manager.show_notification)
+		for alert_settings in constants.ALERTS:
+			self.alert_manager.add(Alert(**alert_settings))
+		self.gui_manager.alert_manager = self.alert_manager
 		
-		self.latest_hexagrams = None
-		self.latest_time_to_zero = None
-		self.setup_threads()
+		self.wakeups = 0
+		self.thread_count = None
+		if constants.ASYNCIO_RUNTIME:
+			# Ticks, chatbox sends and OSC I/O run as tasks on one event loop stepped by Tk
+			from async_runtime import AsyncRuntime
+			self.runtime = AsyncRuntime(self)
+		else:
+			self.runtime = None
+			self.setup_threads()
 		self.setup_signal_handlers()
 
+	def show_first_frame(self):
+		"""Draw the current hexagrams straight away; everything else waits until they are on screen"""
+		snapshot = self.hexagram_calculator.get_snapshot(constants.ZERO_DATETIME - datetime.datetime.now())
+		self.gui_manager.seed_transitions(snapshot)
+		self.latest_snapshot = snapshot
+		self.gui_manager.update_display(snapshot)
+		self.gui_manager.root.bind("<Map>", self.on_window_mapped, add="+")
+
+	def on_window_mapped(self, event):
+		if event.widget is not self.gui_manager.root or self.first_frame_logged:
+			return
+		self.first_frame_logged = True
+		# The widgets' redraws are idle callbacks queued ahead of this one
+		self.gui_manager.root.after_idle(self.on_first_frame)
+
+	def on_first_frame(self):
+		print(f"[HexagramApp] Time to first frame: {(time.perf_counter() - LAUNCH_TIME) * 1000:.0f} ms")
+		self.gui_manager.root.after_idle(self.start_audio)
+
+	def start_audio(self):
+		started = time.perf_counter()
+		try:
+			self.sound_manager.start()
+		except Exception as e:
+			print(f"[HexagramApp] Audio unavailable: {e}")
+		else:
+			print(f"[HexagramApp] Audio started in {(time.perf_counter() - started) * 1000:.0f} ms")
+		# The other hexagram images are decoded while the app is idle, before a change needs them
+		self.gui_manager.root.after_idle(self.gui_manager.preload_hexagram_images, list(range(1, 65)))
+
 	def update_zero_datetime(self, new_datetime):
 		"""
 		Updates the zero datetime and ensures all components are notified
@@ -64,9 +104,8 @@ class HexagramApp:
 				constants.ZERO_DATETIME = new_datetime
 				# Force an immediate update of the display
 				current_datetime = datetime.datetime.now()
-				time_to_zero = constants.ZERO_DATETIME - current_datetime
-				hexagrams = self.hexagram_calculator.get_hexagrams(time_to_zero)
-				self.gui_manager.update_display(hexagrams, time_to_zero)
+				snapshot = self.hexagram_calculator.get_snapshot(constants.ZERO_DATETIME - current_datetime)
+				self.gui_manager.update_display(snapshot)
 				return True
 			return False
 		except ValueError:
@@ -82,44 +121,66 @@ class HexagramApp:
 	def setup_signal_handlers(self):
 		signal.signal(signal.SIGINT, self.signal_handler)
 		signal.signal(signal.SIGTERM, self.signal_handler)
+		# Profiling toggles: hidden Ctrl+Shift+P shortcut, and SIGUSR1 (SIGBREAK on Windows)
+		self.gui_manager.root.bind("<Control-Shift-P>", self.profiler.toggle)
+		profile_signal = getattr(signal, 'SIGUSR1', None) or getattr(signal, 'SIGBREAK', None)
+		if profile_signal is not None:
+			signal.signal(profile_signal, self.profile_signal_handler)
 		self.gui_manager.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+	def send_chatbox_message(self):
+		"""Format the current page from the latest snapshot and send it to the chatbox"""
+		snapshot = self.latest_snapshot
+		if snapshot is None:
+			return
+		level6_days = getattr(self.gui_manager, 'level6_moving_line_days', None)
+		level6_moving_line = getattr(self.gui_manager, 'level6_moving_line_num', None)
+		if constants.CURRENT_PAGE == 1:
+			message = self.vrchat_manager.format_message_page1(snapshot, level6_days, level6_moving_line)
+		elif constants.CURRENT_PAGE == 2:
+			message = self.vrchat_manager.format_message_page2(snapshot)
+		else:
+			message = self.vrchat_manager.format_message_page3(snapshot)
+		self.vrchat_manager.send_message(message)
+
+	def tick(self):
+		"""One calculation tick: display, sounds, avatar parameters and alerts"""
+		current_datetime = datetime.datetime.now()
+		snapshot = self.hexagram_calculator.get_snapshot(constants.ZERO_DATETIME - current_datetime)
+		self.latest_snapshot = snapshot
+		self.gui_manager.update_display(snapshot)
+		self.vrchat_manager.send_avatar_parameters(snapshot)
+		self.alert_manager.on_tick(snapshot)
+
 	def vrchat_update_loop(self):
 		while not constants.EXIT_FLAG and constants.UPDATE_HEXAGRAMS:
-			if self.latest_hexagrams is not None and self.latest_time_to_zero is not None:
-				hexagrams = self.latest_hexagrams
-				time_to_zero = self.latest_time_to_zero
-				level6_days = getattr(self.gui_manager, 'level6_moving_line_days', None)
-				level6_moving_line = getattr(self.gui_manager, 'level6_moving_line_num', None)
-				if constants.CURRENT_PAGE == 1:
-					message = self.vrchat_manager.format_message_page1(hexagrams, time_to_zero, level6_days, level6_moving_line)
-					self.vrchat_manager.send_message(message)
-					for _ in range(20):
-						if constants.EXIT_FLAG or not constants.UPDATE_HEXAGRAMS:
-							break
-						time.sleep(0.1)
-				else:
-					message = self.vrchat_manager.format_message_page2(hexagrams, time_to_zero)
-					self.vrchat_manager.send_message(message)
-					for _ in range(20):
-						if constants.EXIT_FLAG or not constants.UPDATE_HEXAGRAMS:
-							break
-						time.sleep(0.1)
+			if self.latest_snapshot is not None:
+				self.send_chatbox_message()
+				for _ in range(round(constants.CHATBOX_INTERVAL / 0.1)):
+					if constants.EXIT_FLAG or not constants.UPDATE_HEXAGRAMS:
+						break
+					time.sleep(0.1)
+					self.wakeups += 1
 			else:
 				time.sleep(0.1)
+				self.wakeups += 1
 
 	def gui_update_loop(self):
 		while not constants.EXIT_FLAG and constants.UPDATE_HEXAGRAMS:
-			current_datetime = datetime.datetime.now()
-			time_to_zero = constants.ZERO_DATETIME - current_datetime
-			hexagrams = self.hexagram_calculator.get_hexagrams(time_to_zero)
-			self.latest_hexagrams = hexagrams
-			self.latest_time_to_zero = time_to_zero
-			self.gui_manager.update_display(hexagrams, time_to_zero)
+			self.tick()
 			for _ in range(1):
 				if constants.EXIT_FLAG or not constants.UPDATE_HEXAGRAMS:
 					break
-				time.sleep(0.05)
+				time.sleep(constants.TICK_INTERVAL)
+				self.wakeups += 1
+
+	def record_thread_count(self):
+		self.thread_count = threading.active_count()
+
+	def report_runtime_stats(self, elapsed):
+		mode = "asyncio" if self.runtime is not None else "threads"
+		wakeups = self.runtime.wakeups if self.runtime is not None else self.wakeups
+		print(f"[HexagramApp] Runtime ({mode}): {self.thread_count} threads, {wakeups / max(elapsed, 1e-9):.1f} wakeups/s")
 
 	def on_close(self):
 		constants.EXIT_FLAG = True
@@ -131,19 +192,27 @@ class HexagramApp:
 				pass
 
 	def run(self):
-		self.vrchat_thread.start()
-		self.gui_thread.start()
+		if constants.PROFILE_ON_START:
+			self.profiler.start()
+		started = time.monotonic()
+		if self.runtime is not None:
+			self.runtime.start()
+		else:
+			self.vrchat_thread.start()
+			self.gui_thread.start()
+		# Thread count once startup work (image loads, premixing) has settled
+		self.gui_manager.root.after(1000, self.record_thread_count)
 		self.gui_manager.run()
+		self.profiler.stop()
+		if self.runtime is not None:
+			# Tasks are cancelled and awaited, so nothing is left running
+			self.runtime.stop()
 		# Shutdown sequence: set flags, then cleanup
 		# Do NOT join daemon threads; let Python kill them on exit to avoid hanging the GUI
 		# Reason: Joining daemon threads can cause the GUI to freeze if threads are sleeping or blocked.
+		self.report_runtime_stats(time.monotonic() - started)
 		self.sound_manager.cleanup()
-		# Clean up OSC client if possible
-		if hasattr(self.vrchat_manager, 'client') and hasattr(self.vrchat_manager.client, 'close'):
-			try:
-				self.vrchat_manager.client.close()
-			except Exception as e:
-				print(f"[Main] Error closing OSC client: {e}")
+		self.vrchat_manager.close()
 		self.gui_manager.cleanup()
 
 	def cleanup(self):
@@ -159,6 +228,25 @@ class HexagramApp:
 	def signal_handler(self, sig, frame):
 		self.cleanup()
 
+	def profile_signal_handler(self, sig, frame):
+		# Tk calls in the report must happen from the event loop
+		self.gui_manager.root.after(0, self.profiler.toggle)
+
+def parse_args():
+	parser = argparse.ArgumentParser(description="Hexagrams Live")
+	parser.add_argument("--isolated-workers", action="store_true",
+		help="run audio playback and OSC sending in separate worker processes")
+	parser.add_argument("--profile", action="store_true",
+		help="profile CPU and memory from startup; the report is written on exit or Ctrl+Shift+P")
+	parser.add_argument("--asyncio", action="store_true",
+		help="run ticks and OSC I/O as asyncio tasks on the Tk thread instead of polling threads")
+	return parser.parse_args()
+
 if __name__ == "__main__":
+	multiprocessing.freeze_support()
+	args = parse_args()
+	constants.ISOLATED_WORKERS = args.isolated_workers
+	constants.PROFILE_ON_START = args.profile
+	constants.ASYNCIO_RUNTIME = args.asyncio
 	app = HexagramApp()
 	app.run()
\ No newline at end of file
@@ -0,0 +1,132 @@
+import collections
+import datetime
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+import tkinter as tk
+import constants
+
+class RuntimeProfiler:
+	"""On-demand CPU sampling and memory snapshots for a running app.
+
+	Nothing runs until start(): no sampler thread exists and tracemalloc stays
+	off, so a disabled profiler costs nothing. stop() writes a text report to
+	constants.PROFILE_DIR. counters, if given, returns a dict of the app's own
+	running counts, reported as start -> now like the Tk objects.
+	"""
+
+	def __init__(self, root=None, counters=None):
+		self.root = root
+		self.counters = counters
+		self.active = False
+		self.sampler_thread = None
+		self.stop_event = threading.Event()
+		self.stack_counts = collections.defaultdict(collections.Counter)
+		self.sample_count = 0
+		self.thread_names = {}
+		self.started_at = None
+		self.baseline_snapshot = None
+		self.baseline_tk_counts = None
+		self.baseline_counters = None
+
+	def toggle(self, event=None):
+		if self.active:
+			self.stop()
+		else:
+			self.start()
+
+	def start(self):
+		if self.active:
+			return
+		self.active = True
+		self.stack_counts.clear()
+		self.thread_names.clear()
+		self.sample_count = 0
+		self.started_at = datetime.datetime.now()
+		tracemalloc.start(constants.PROFILE_TRACEBACK_DEPTH)
+		self.baseline_snapshot = tracemalloc.take_snapshot()
+		self.baseline_tk_counts = self.count_tk_objects()
+		self.baseline_counters = self.counters() if self.counters else {}
+		self.stop_event.clear()
+		self.sampler_thread = threading.Thread(target=self.sample_loop, name="ProfilerSampler", daemon=True)
+		self.sampler_thread.start()
+		print("[Profiler] Profiling started")
+
+	def stop(self):
+		"""Stop profiling and write the report; returns the report path"""
+		if not self.active:
+			return None
+		self.stop_event.set()
+		self.sampler_thread.join()
+		self.sampler_thread = None
+		snapshot = tracemalloc.take_snapshot()
+		tracemalloc.stop()
+		self.active = False
+		path = self.write_report(snapshot, self.count_tk_objects(), self.counters() if self.counters else {})
+		self.baseline_snapshot = None
+		print(f"[Profiler] Profiling stopped, report written to {path}")
+		return path
+
+	def sample_loop(self):
+		own_id = threading.get_ident()
+		while not self.stop_event.wait(constants.PROFILE_SAMPLE_INTERVAL):
+			# Remember names now; short-lived threads are gone by the time the report is written
+			for thread in threading.enumerate():
+				self.thread_names[thread.ident] = thread.name
+			for thread_id, frame in sys._current_frames().items():
+				if thread_id == own_id:
+					continue
+				stack = []
+				while frame is not None and len(stack) < constants.PROFILE_TRACEBACK_DEPTH:
+					code = frame.f_code
+					stack.append(f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}")
+					frame = frame.f_back
+				self.stack_counts[thread_id][tuple(stack)] += 1
+			self.sample_count += 1
+
+	def count_tk_objects(self):
+		"""Live Tk images and pending after() callbacks; must run on the Tk thread"""
+		counts = {
+			'python_photo_images': sum(1 for obj in gc.get_objects() if isinstance(obj, tk.PhotoImage)),
+		}
+		if self.root is not None:
+			try:
+				counts['tk_images'] = len(self.root.tk.splitlist(self.root.tk.call('image', 'names')))
+				counts['after_callbacks'] = len(self.root.tk.splitlist(self.root.tk.call('after', 'info')))
+			except tk.TclError:
+				pass
+		return counts
+
+	def write_report(self, snapshot, tk_counts, counters):
+		os.makedirs(constants.PROFILE_DIR, exist_ok=True)
+		stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+		path = os.path.abspath(os.path.join(constants.PROFILE_DIR, f"profile-{stamp}.txt"))
+		duration = (datetime.datetime.now() - self.started_at).total_seconds()
+
+		with open(path, 'w', encoding='utf-8') as report:
+			report.write(f"Profile from {self.started_at} ({duration:.1f} s, {self.sample_count} samples)\n\n")
+
+			report.write("== CPU samples per thread (innermost frame first) ==\n")
+			for thread_id, counter in self.stack_counts.items():
+				total = sum(counter.values())
+				report.write(f"\n-- {self.thread_names.get(thread_id, thread_id)} ({total} samples) --\n")
+				for stack, count in counter.most_common(constants.PROFILE_TOP_ENTRIES):
+					report.write(f"{count:6d} {100.0 * count / total:5.1f}%  {stack[0] if stack else '?'}\n")
+					for frame in stack[1:]:
+						report.write(f"{'':15}{frame}\n")
+
+			report.write("\n== Top allocation changes since start ==\n")
+			for stat in snapshot.compare_to(self.baseline_snapshot, 'lineno')[:constants.PROFILE_TOP_ENTRIES]:
+				report.write(f"{stat}\n")
+
+			report.write("\n== Tk objects (start -> now) ==\n")
+			for name, count in tk_counts.items():
+				report.write(f"{name}: {self.baseline_tk_counts.get(name, '?')} -> {count}\n")
+
+			if counters:
+				report.write("\n== App counters (start -> now) ==\n")
+				for name, count in counters.items():
+					report.write(f"{name}: {self.baseline_counters.get(name, '?')} -> {count}\n")
+		return path
@@ -0,0 +1,255 @@
+"""Virtualized list for long Checker results.
+
+A row source answers len(source) and source.row(index). The view holds one
+Text line per visible row. Scrolling rewrites only the lines whose row
+changed, so widget count and redraw cost depend on the window height and not
+on the number of rows.
+
+TransitionRows computes row i from the cycle arithmetic, so a century of
+level 1 changes takes no memory. IntervalRows collects a hexagram_search result
+stream in a background thread as tick pairs, and the view appends whatever
+has arrived on each poll.
+"""
+import threading
+from array import array
+import tkinter as tk
+from tkinter import font as tkfont
+from tkinter import ttk
+import constants
+from hexagram_calculator import LEVEL_COUNT, LINE_TICKS, datetime_to_ticks, snapshot_at_ticks, ticks_to_datetime
+from hexagram_data import short_label
+from zero_date_solver import format_interval
+
+WHEEL_ROWS = 3
+
+
+def _format_ticks(ticks):
+	instant = ticks_to_datetime(ticks)
+	return f"{instant:%Y-%m-%d %H:%M:%S}.{instant.microsecond // 1000:03d}"
+
+
+class TransitionRows:
+	"""Every moving-line change of `level` in [start, end), with the coarser levels changing at the same instant.
+
+	A block of `unit` ticks is entered at zero + 1 - m*unit before the zero
+	date and at zero + m*unit after it (m >= 1), so row i maps straight to its
+	m. A coarser level changes line where m is a multiple of 64**(its distance)
+	and changes hexagram where m is also a multiple of 6 times that.
+	"""
+
+	def __init__(self, level, start_ticks, end_ticks, zero_ticks):
+		self.level = level
+		self.zero_ticks = zero_ticks
+		self.unit = unit = LINE_TICKS[level - 1]
+		# Before the zero date m runs down from before_first; after it, up from after_first
+		self.before_first = (zero_ticks + 1 - start_ticks) // unit
+		self.before = max(0, self.before_first - max(1, (zero_ticks + 1 - end_ticks) // unit + 1) + 1)
+		self.after_first = max(1, -((zero_ticks - start_ticks) // unit))
+		self.after = max(0, (end_ticks - 1 - zero_ticks) // unit - self.after_first + 1)
+		self.done = True
+
+	def __len__(self):
+		return self.before + self.after
+
+	def block(self, index):
+		"""(m, tick) of row index"""
+		if index < self.before:
+			m = self.before_first - index
+			return m, self.zero_ticks + 1 - m * self.unit
+		m = self.after_first + index - self.before
+		return m, self.zero_ticks + m * self.unit
+
+	def row(self, index):
+		m, ticks = self.block(index)
+		snapshot = snapshot_at_ticks(self.zero_ticks - ticks)
+		changes = []
+		for level in range(self.level, LEVEL_COUNT + 1):
+			lines_per_unit = 64 ** (level - self.level)
+			if m % lines_per_unit:
+				break
+			line = snapshot.moving_line(level)
+			if m % (6 * lines_per_unit) == 0:
+				changes.append(f"L{level}: {short_label(snapshot.hexagram_number(level))} line {line}")
+			else:
+				changes.append(f"L{level}: line {line}")
+		return f"{_format_ticks(ticks)}  " + "  ".join(changes)
+
+	def status(self):
+		return f"{len(self):,} changes of level {self.level} and above"
+
+	def cancel(self):
+		pass
+
+
+class IntervalRows:
+	"""(start, end) datetimes from a search stream, appended as they arrive and kept as 16 bytes per row.
+
+	cancel_event is the threading.Event the search was started with, so
+	cancelling stops the search itself and not just the collecting.
+	"""
+
+	def __init__(self, intervals, cancel_event=None):
+		self.ticks = array('q')
+		self.done = False
+		self.cancel_event = cancel_event or threading.Event()
+		self.error = None
+		threading.Thread(target=self.collect, args=(intervals,), daemon=True).start()
+
+	def collect(self, intervals):
+		try:
+			for start, end in intervals:
+				if self.cancel_event.is_set():
+					break
+				# One extend keeps each pair whole for a reader on the Tk thread
+				self.ticks.extend((datetime_to_ticks(start), datetime_to_ticks(end)))
+		except Exception as e:
+			self.error = e
+		finally:
+			# Shuts a search's worker pool down now rather than when the generator is collected
+			intervals.close()
+			self.done = True
+
+	def __len__(self):
+		return len(self.ticks) // 2
+
+	def row(self, index):
+		return format_interval(ticks_to_datetime(self.ticks[2 * index]), ticks_to_datetime(self.ticks[2 * index + 1]))
+
+	def status(self):
+		if self.error is not None:
+			return f"Search failed: {self.error}"
+		return f"{len(self):,} intervals" + ("" if self.done else " (searching...)")
+
+	def cancel(self):
+		self.cancel_event.set()
+
+
+class ResultsView:
+	def __init__(self, parent, rows, on_status=None):
+		self.frame = ttk.Frame(parent)
+		self.text = tk.Text(
+			self.frame, height=rows, wrap='none', font=("Courier", 10),
+			background=constants.DARK_THEME['text_bg'], foreground=constants.DARK_THEME['foreground']
+		)
+		self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+		self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+		self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+		self.text.configure(state='disabled')
+		self.line_height = tkfont.Font(font=self.text.cget('font')).metrics('linespace')
+		self.on_status = on_status
+		self.source = None
+		self.first = 0
+		self.visible = rows
+		self.row_count = 0  # Rows the scrollbar and screen reflect
+		self.shown = []
+		self.poll_job = None
+
+		for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+			self.text.bind(sequence, self.on_wheel)
+		for sequence, rows_moved in (("<Up>", -1), ("<Down>", 1)):
+			self.text.bind(sequence, lambda event, rows_moved=rows_moved: self.scroll_by(rows_moved))
+		self.text.bind("<Prior>", lambda event: self.scroll_by(-self.visible))
+		self.text.bind("<Next>", lambda event: self.scroll_by(self.visible))
+		self.text.bind("<Home>", lambda event: self.scroll_to(0))
+		self.text.bind("<End>", lambda event: self.scroll_to(self.row_count))
+		self.text.bind("<Configure>", self.on_configure)
+
+	def pack(self, **options):
+		self.frame.pack(**options)
+
+	def set_source(self, source):
+		if self.source is not None:
+			self.source.cancel()
+		if self.poll_job is not None:
+			self.text.after_cancel(self.poll_job)
+			self.poll_job = None
+		self.source = source
+		self.first = 0
+		self.refresh()
+		if not source.done:
+			self.poll_job = self.text.after(constants.CHECKER_RESULT_POLL_MS, self.poll)
+
+	def refresh(self):
+		"""Materialize the rows on screen and sync the scrollbar"""
+		total = len(self.source) if self.source is not None else 0
+		self.row_count = total
+		self.first = max(0, min(self.first, total - self.visible))
+		self.write_lines([self.source.row(index) for index in range(self.first, min(total, self.first + self.visible))])
+		self.update_scrollbar()
+		if self.on_status is not None and self.source is not None:
+			self.on_status(self.source.status())
+
+	def update_scrollbar(self):
+		total = self.row_count
+		if total <= self.visible:
+			self.scrollbar.set(0.0, 1.0)
+		else:
+			self.scrollbar.set(self.first / total, (self.first + self.visible) / total)
+
+	def write_lines(self, lines):
+		"""Rewrite only the lines whose row changed; a different line count rewrites the widget"""
+		self.text.configure(state='normal')
+		if len(lines) != len(self.shown):
+			self.text.delete("1.0", tk.END)
+			self.text.insert("1.0", "\n".join(lines))
+		else:
+			for row, (old_line, line) in enumerate(zip(self.shown, lines), start=1):
+				if old_line != line:
+					self.text.delete(f"{row}.0", f"{row}.end")
+					self.text.insert(f"{row}.0", line)
+		self.text.configure(state='disabled')
+		self.shown = lines
+
+	def poll(self):
+		"""Take in rows appended since the last poll; only a screen with room for them is redrawn"""
+		self.poll_job = None
+		source = self.source
+		if source.done:
+			self.refresh()
+			return
+		total = len(source)
+		if total != self.row_count:
+			if self.first + self.visible > self.row_count:
+				self.refresh()
+			else:
+				self.row_count = total
+				self.update_scrollbar()
+				if self.on_status is not None:
+					self.on_status(source.status())
+		self.poll_job = self.text.after(constants.CHECKER_RESULT_POLL_MS, self.poll)
+
+	def scroll_to(self, first):
+		first = max(0, min(first, self.row_count - self.visible))
+		if first != self.first:
+			self.first = first
+			self.refresh()
+		return "break"
+
+	def scroll_by(self, rows):
+		return self.scroll_to(self.first + rows)
+
+	def on_scrollbar(self, *args):
+		if args[0] == 'moveto':
+			self.scroll_to(int(float(args[1]) * self.row_count))
+		elif args[0] == 'scroll':
+			step = self.visible if args[2] == 'pages' else 1
+			self.scroll_by(int(args[1]) * step)
+
+	def on_wheel(self, event):
+		if event.num == 4 or getattr(event, 'delta', 0) > 0:
+			return self.scroll_by(-WHEEL_ROWS)
+		return self.scroll_by(WHEEL_ROWS)
+
+	def on_configure(self, event):
+		padding = 2 * (int(self.text.cget('borderwidth')) + int(self.text.cget('highlightthickness')) + int(self.text.cget('pady')))
+		visible = max(1, (event.height - padding) // self.line_height)
+		if visible != self.visible:
+			self.visible = visible
+			self.refresh()
+
+	def close(self):
+		if self.source is not None:
+			self.source.cancel()
+		if self.poll_job is not None:
+			self.text.after_cancel(self.poll_job)
+			self.poll_job = None
@@ -0,0 +1,205 @@
+"""Headless server sending chatbox pages for many sessions from one process.
+
+Each session has its own zero date, chatbox page and OSC target, so one process
+replaces an app instance per VRChat user or world, without Tk or pygame.
+Sends are driven by a single timer wheel. Every wheel tick computes one
+snapshot per distinct zero date among the due sessions. Pages 1 and 3 are
+formatted and encoded once per second of each zero date's counter; page 2, whose level 1
+hexagram changes faster, once per wheel tick. Sessions that share a zero date
+and page share the same datagram.
+
+    python session_server.py sessions.json
+
+sessions.json holds a list of sessions (or {"sessions": [...]}), e.g.
+    [{"name": "alice", "zero_date": "2055-07-16", "page": 1, "ip": "127.0.0.1", "port": 9000}]
+with optional "interval" seconds between messages (default CHATBOX_INTERVAL).
+"""
+import argparse
+import datetime
+import json
+import signal
+import socket
+import time
+import tracemalloc
+from pythonosc import osc_message_builder
+import constants
+from hexagram_calculator import TICKS_PER_SECOND, datetime_to_ticks, snapshots_at_ticks
+from vrchat_manager import format_message_page1, format_message_page2, format_message_page3
+
+PAGE_FORMATTERS = {1: format_message_page1, 2: format_message_page2, 3: format_message_page3}
+# Pages whose text only changes on whole seconds. Page 2 shows the level 1 hexagram (1.98 s cycle) and
+# the level 2 countdown (126.5625 s cycle), so it is only shared within one wheel tick
+SECOND_CACHED_PAGES = {1, 3}
+
+
+class Session:
+	__slots__ = ('name', 'zero_datetime', 'zero_ticks', 'page', 'target', 'interval', 'errors')
+
+	def __init__(self, name, zero_datetime, page=1, ip=constants.VRCHAT_IP, port=constants.VRCHAT_PORT, interval=None):
+		if page not in PAGE_FORMATTERS:
+			raise ValueError(f"Session {name}: page must be one of {sorted(PAGE_FORMATTERS)}")
+		self.name = name
+		self.zero_datetime = zero_datetime
+		self.zero_ticks = datetime_to_ticks(zero_datetime)
+		self.page = page
+		self.target = (ip, port)
+		self.interval = interval or constants.CHATBOX_INTERVAL
+		self.errors = 0
+
+
+def load_sessions(path):
+	with open(path, encoding='utf-8') as config_file:
+		config = json.load(config_file)
+	if isinstance(config, dict):
+		config = config['sessions']
+	sessions = []
+	for index, settings in enumerate(config):
+		sessions.append(Session(
+			settings.get('name', f"session{index + 1}"),
+			datetime.datetime.fromisoformat(settings['zero_date']),
+			settings.get('page', 1),
+			settings.get('ip', constants.VRCHAT_IP),
+			settings.get('port', constants.VRCHAT_PORT),
+			settings.get('interval'),
+		))
+	return sessions
+
+
+class TimerWheel:
+	"""Hashed timing wheel: O(1) scheduling, and each tick only touches one slot"""
+
+	def __init__(self, resolution, slot_count):
+		self.resolution = resolution
+		self.slots = [[] for _ in range(slot_count)]
+		self.position = 0
+
+	def schedule(self, delay, item):
+		ticks = max(1, round(delay / self.resolution))
+		# Entries further out than one turn wait (ticks - 1) // slot_count extra turns
+		self.slots[(self.position + ticks) % len(self.slots)].append([(ticks - 1) // len(self.slots), item])
+
+	def advance(self):
+		"""Move one slot forward and return the items due now"""
+		self.position = (self.position + 1) % len(self.slots)
+		due = []
+		waiting = []
+		for entry in self.slots[self.position]:
+			if entry[0] == 0:
+				due.append(entry[1])
+			else:
+				entry[0] -= 1
+				waiting.append(entry)
+		self.slots[self.position] = waiting
+		return due
+
+
+class SessionServer:
+	def __init__(self, sessions):
+		self.sessions = sessions
+		self.wheel = TimerWheel(constants.SESSION_WHEEL_RESOLUTION, constants.SESSION_WHEEL_SLOTS)
+		self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self.socket.setblocking(False)
+		self.datagrams = {}  # (zero ticks, page, counter second) -> encoded chatbox message for datagram_second
+		self.datagram_second = None
+		self.running = False
+		self.sends = 0
+		self.formats = 0
+		self.snapshots = 0
+		for index, session in enumerate(sessions):
+			# Spread first sends over one interval so the sessions do not all fire on the same tick
+			self.wheel.schedule(index * constants.SESSION_WHEEL_RESOLUTION % session.interval, session)
+
+	def send_due(self, due):
+		now_ticks = datetime_to_ticks(datetime.datetime.now())
+		second = now_ticks // TICKS_PER_SECOND
+		if second != self.datagram_second:
+			# Page 1 also shows today's date, so nothing is kept past the current wall-clock second
+			self.datagrams.clear()
+			self.datagram_second = second
+		# Pages 1 and 3 show whole seconds of the counter at most. A zero date with a fraction of
+		# a second moves the counter's seconds off the wall clock's, so the key carries the former
+		keys = {
+			session: (session.zero_ticks, session.page, abs(session.zero_ticks - now_ticks) // TICKS_PER_SECOND)
+			for session in due
+		}
+		missing = set(keys.values()) - self.datagrams.keys()
+		batch = {}  # Datagrams of pages that are only valid at this instant
+		if missing:
+			zero_ticks_list = sorted({zero_ticks for zero_ticks, _, _ in missing})
+			snapshots = dict(zip(zero_ticks_list, snapshots_at_ticks([zero_ticks - now_ticks for zero_ticks in zero_ticks_list])))
+			self.snapshots += len(zero_ticks_list)
+			for key in missing:
+				zero_ticks, page, _ = key
+				message = osc_message_builder.OscMessageBuilder(address="/chatbox/input")
+				message.add_arg(PAGE_FORMATTERS[page](snapshots[zero_ticks]))
+				message.add_arg(True)
+				message.add_arg(False)
+				cache = self.datagrams if page in SECOND_CACHED_PAGES else batch
+				cache[key] = message.build().dgram
+				self.formats += 1
+		for session in due:
+			key = keys[session]
+			try:
+				self.socket.sendto(self.datagrams[key] if key in self.datagrams else batch[key], session.target)
+				self.sends += 1
+			except OSError as e:
+				session.errors += 1
+				if session.errors == 1:
+					print(f"[SessionServer] Error sending to {session.name} at {session.target}: {e}")
+			self.wheel.schedule(session.interval, session)
+
+	def run(self):
+		self.running = True
+		stats_due = time.monotonic() + constants.SESSION_STATS_INTERVAL
+		next_tick = time.monotonic()
+		while self.running:
+			next_tick += self.wheel.resolution
+			delay = next_tick - time.monotonic()
+			if delay > 0:
+				time.sleep(delay)
+			else:
+				next_tick = time.monotonic()
+			due = self.wheel.advance()
+			if due:
+				self.send_due(due)
+			if time.monotonic() >= stats_due:
+				self.print_stats(constants.SESSION_STATS_INTERVAL)
+				stats_due += constants.SESSION_STATS_INTERVAL
+		self.socket.close()
+
+	def stop(self, *args):
+		self.running = False
+
+	def print_stats(self, elapsed):
+		zero_dates = len({session.zero_ticks for session in self.sessions})
+		print(
+			f"[SessionServer] {len(self.sessions)} sessions, {zero_dates} zero dates: "
+			f"{self.sends / elapsed:.1f} sends/s, {self.formats / elapsed:.1f} formats/s, "
+			f"{self.snapshots / elapsed:.1f} snapshots/s"
+		)
+		self.sends = self.formats = self.snapshots = 0
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Headless multi-session chatbox server")
+	parser.add_argument("config", help="JSON list of sessions")
+	args = parser.parse_args()
+
+	tracemalloc.start()
+	sessions = load_sessions(args.config)
+	session_bytes = tracemalloc.get_traced_memory()[0]
+	server = SessionServer(sessions)
+	total_bytes = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	print(
+		f"[SessionServer] {len(sessions)} sessions loaded, {session_bytes / max(len(sessions), 1):.0f} bytes per session "
+		f"({total_bytes / max(len(sessions), 1):.0f} including scheduling)"
+	)
+
+	signal.signal(signal.SIGINT, server.stop)
+	signal.signal(signal.SIGTERM, server.stop)
+	server.run()
+
+
+if __name__ == "__main__":
+	main()
@@ -1,10 +1,29 @@
-import pygame
 import constants
+import io
 import os
+import threading
+import time
+from asset_pack import get_asset_pack
+
+# Importing pygame loads SDL, so it is imported by SoundManager.start rather than here
+pygame = None
+# Pre-mixing sums samples with numpy, which is optional; without it coincident cues play separately
+numpy = None
+
+def cue_priority(sound_key):
+	"""Higher levels outrank lower ones, and a hexagram change outranks its level's line change"""
+	level = int(sound_key[len('level'):].split('_')[0])
+	return level * 2 + (0 if sound_key.endswith('_line') else 1)
+
+def cue_enabled(level, line=False):
+	"""Whether the sound for a level (or its moving line) is currently switched on"""
+	if not constants.AUDIO_PLAYBACK_ALLOWED:
+		return False
+	suffix = '_LINE' if line else ''
+	return getattr(constants, f'PLAY_AUDIO_LEVEL_{level}{suffix}_ENABLED', False)
 
 class SoundManager:
-	def __init__(self):
-		pygame.mixer.init()
+	def __init__(self, start=True):
 		self.sound_files = {
 			'level1': "level1.mp3",
 			'level2': "level2.mp3",
@@ -18,12 +37,48 @@ class SoundManager:
 			'level5_line': "level5_line.mp3"
 		}
 		self.sounds = {}
+		self.premixed = {}  # Sorted tuple of sound keys -> single pre-mixed Sound
+		self.pending_mixes = set()
+		self.unmixable = set()  # Key groups whose mix failed; they always play as separate voices
+		self.premix_enabled = False
+		self.voice_count = constants.MAX_AUDIO_VOICES
+		self.channels = []
+		self.channel_cues = [None] * self.voice_count
+		self.channel_priority = [0] * self.voice_count
+		self.channel_started = [0.0] * self.voice_count
+		self.started = False
+		if start:
+			self.start()
+
+	def start(self):
+		"""Open the mixer and decode the sounds; cues played before this are dropped"""
+		global pygame, numpy
+		import pygame
+		pygame.mixer.init()
+		pygame.mixer.set_num_channels(self.voice_count)
+		self.channels = [pygame.mixer.Channel(i) for i in range(self.voice_count)]
+		self.started = True
 		self.load_sounds()
+		try:
+			import numpy
+		except ImportError:
+			print("numpy is not installed, coincident cues will not be pre-mixed")
+		# The mix works on signed 16-bit samples only
+		self.premix_enabled = numpy is not None and pygame.mixer.get_init()[1] == -16
+		if self.premix_enabled:
+			threading.Thread(target=self.warm_premixed_cache, daemon=True).start()
 
 	def load_sounds(self):
 		"""Load all sound files"""
+		pack = get_asset_pack()
+		if pack is None:
+			os.makedirs(constants.SOUNDS_DIR, exist_ok=True)
 		for key, file_name in self.sound_files.items():
 			try:
+				pack_key = f"sounds/{file_name}"
+				if pack is not None and pack_key in pack:
+					self.sounds[key] = pygame.mixer.Sound(file=io.BytesIO(pack.view(pack_key)))
+					continue
 				sound_path = os.path.join(constants.SOUNDS_DIR, file_name)
 				self.sounds[key] = pygame.mixer.Sound(sound_path)
 			except Exception as e:
@@ -31,40 +86,109 @@ class SoundManager:
 
 	def play_level_sound(self, level):
 		"""Play sound for a specific level"""
-		if not constants.AUDIO_PLAYBACK_ALLOWED:
-			return
-
-		sound_key = f'level{level}'
-		if sound_key in self.sounds:
-			if level == 1 and constants.PLAY_AUDIO_LEVEL_1_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 2 and constants.PLAY_AUDIO_LEVEL_2_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 3 and constants.PLAY_AUDIO_LEVEL_3_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 4 and constants.PLAY_AUDIO_LEVEL_4_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 5 and constants.PLAY_AUDIO_LEVEL_5_ENABLED:
-				self.sounds[sound_key].play()
+		if cue_enabled(level):
+			self.play_cues([f'level{level}'])
 
 	def play_line_sound(self, level):
 		"""Play moving line sound for a specific level"""
-		if not constants.AUDIO_PLAYBACK_ALLOWED:
+		if cue_enabled(level, line=True):
+			self.play_cues([f'level{level}_line'])
+
+	def play_cues(self, sound_keys):
+		"""Play all cues that fall on the same tick as one voice"""
+		if not constants.AUDIO_PLAYBACK_ALLOWED or not sound_keys:
 			return
+		self.start_voice(tuple(sorted(sound_keys)))
+
+	def start_voice(self, sound_keys):
+		sound_keys = tuple(key for key in sound_keys if key in self.sounds)
+		if not sound_keys:
+			return
+		if len(sound_keys) == 1:
+			self.play_on_channel(sound_keys, self.sounds[sound_keys[0]])
+			return
+		sound = self.premixed.get(sound_keys)
+		if sound is not None:
+			self.play_on_channel(sound_keys, sound)
+			return
+		# Not mixed yet: mix in the background and play the parts separately this once
+		if self.premix_enabled and sound_keys not in self.pending_mixes and sound_keys not in self.unmixable:
+			self.pending_mixes.add(sound_keys)
+			threading.Thread(target=self.premix, args=(sound_keys,), daemon=True).start()
+		for key in sorted(sound_keys, key=cue_priority, reverse=True):
+			self.play_on_channel((key,), self.sounds[key])
+
+	def play_on_channel(self, sound_keys, sound):
+		channel = self.allocate_channel(sound_keys)
+		if channel is not None:
+			self.channels[channel].play(sound)
+
+	def allocate_channel(self, sound_keys):
+		"""Pick a channel for a cue, stealing the weakest voice when all are busy.
+
+		A cue that is still sounding from its last trigger is restarted on its own
+		channel, so fast level 1 line cues never stack up.
+		"""
+		priority = max(cue_priority(key) for key in sound_keys)
+		now = time.monotonic()
+		free = None
+		weakest = None
+		for index, channel in enumerate(self.channels):
+			busy = channel.get_busy()
+			if busy and self.channel_cues[index] == sound_keys:
+				free = index
+				break
+			if not busy:
+				if free is None:
+					free = index
+			elif weakest is None or (self.channel_priority[index], self.channel_started[index]) < (self.channel_priority[weakest], self.channel_started[weakest]):
+				weakest = index
+		if free is None:
+			if weakest is None or self.channel_priority[weakest] > priority:
+				return None
+			self.channels[weakest].stop()
+			free = weakest
+		self.channel_cues[free] = sound_keys
+		self.channel_priority[free] = priority
+		self.channel_started[free] = now
+		return free
+
+	def premix(self, sound_keys):
+		"""Mix several loaded sounds into one Sound and cache it under their keys"""
+		try:
+			# numpy does the summing in C, so the GIL is not held for the length of the mix
+			buffers = [pygame.sndarray.array(self.sounds[key]) for key in sound_keys]
+			mixed = numpy.zeros((max(len(buffer) for buffer in buffers),) + buffers[0].shape[1:], dtype=numpy.int32)
+			for buffer in buffers:
+				mixed[:len(buffer)] += buffer
+			numpy.clip(mixed, -32768, 32767, out=mixed)
+			self.premixed[sound_keys] = pygame.sndarray.make_sound(mixed.astype(numpy.int16))
+		except Exception as e:
+			self.unmixable.add(sound_keys)
+			print(f"Error pre-mixing sounds {sound_keys}, playing them separately from now on: {e}")
+		finally:
+			self.pending_mixes.discard(sound_keys)
+
+	def warm_premixed_cache(self):
+		"""Pre-mix the enabled cues that coincide when each level changes hexagram.
 
-		sound_key = f'level{level}_line'
-		if sound_key in self.sounds:
-			if level == 1 and constants.PLAY_AUDIO_LEVEL_1_LINE_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 2 and constants.PLAY_AUDIO_LEVEL_2_LINE_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 3 and constants.PLAY_AUDIO_LEVEL_3_LINE_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 4 and constants.PLAY_AUDIO_LEVEL_4_LINE_ENABLED:
-				self.sounds[sound_key].play()
-			elif level == 5 and constants.PLAY_AUDIO_LEVEL_5_LINE_ENABLED:
-				self.sounds[sound_key].play()
+		A level N hexagram change always lands on a hexagram and line change of
+		every lower level, so these are the combinations heard most often.
+		"""
+		for top_level in range(2, 7):
+			sound_keys = []
+			for level in range(1, top_level + 1):
+				if cue_enabled(level):
+					sound_keys.append(f'level{level}')
+				if cue_enabled(level, line=True):
+					sound_keys.append(f'level{level}_line')
+			sound_keys = tuple(sorted(key for key in sound_keys if key in self.sounds))
+			if (len(sound_keys) > 1 and sound_keys not in self.premixed and sound_keys not in self.pending_mixes
+					and sound_keys not in self.unmixable):
+				self.pending_mixes.add(sound_keys)
+				self.premix(sound_keys)
 
 	def cleanup(self):
 		"""Clean up pygame mixer"""
-		pygame.mixer.quit()
\ No newline at end of file
+		if self.started:
+			pygame.mixer.quit()
@@ -0,0 +1,298 @@
+"""Zoomable, pannable timeline of the slower levels.
+
+Each level is a horizontal band coloured by hexagram, with marks where the
+moving line changes. Bands are cut into fixed-width tiles per zoom level and
+every tile is rendered once into a PhotoImage. Its pixel columns come straight
+from the counter arithmetic (no per-instant snapshots). Panning only moves
+canvas items and adds tiles that scrolled into view; a tile already rendered
+comes from the cache.
+
+When a column spans several hexagrams (a fine level at a coarse zoom) its
+colour is the mean of the hexagrams it covers, so the band reads as a blend
+instead of aliasing.
+"""
+import colorsys
+import datetime
+from collections import OrderedDict
+import tkinter as tk
+from tkinter import ttk
+import constants
+from hexagram_calculator import (
+	CYCLE_TICKS, LINE_TICKS, TICKS_PER_DAY, TICKS_PER_HOUR, TICKS_PER_MINUTE, datetime_to_ticks, ticks_to_datetime
+)
+from hexagram_data import LOWER_TRIGRAMS, UPPER_TRIGRAMS
+
+LABEL_WIDTH = 70
+RULER_HEIGHT = 20
+BAND_GAP = 6
+BOUNDARY_COLOR = "#101010"
+LINE_MARK_COLOR = "#000000"
+NOW_COLOR = "#ff4040"
+
+# Zoom level z shows MIN_TICKS_PER_PIXEL * 2**z ticks per pixel: one minute per
+# pixel at the closest, a full level 6 cycle across ~1000 pixels at the furthest
+MIN_TICKS_PER_PIXEL = TICKS_PER_MINUTE
+ZOOM_LEVELS = (CYCLE_TICKS[5] // 1000 // MIN_TICKS_PER_PIXEL).bit_length() + 1
+
+# Ruler spacing candidates, finest first
+RULER_STEPS = (
+	(TICKS_PER_HOUR, "%H:%M"),
+	(6 * TICKS_PER_HOUR, "%m-%d %H:%M"),
+	(TICKS_PER_DAY, "%Y-%m-%d"),
+	(7 * TICKS_PER_DAY, "%Y-%m-%d"),
+	(30 * TICKS_PER_DAY, "%Y-%m-%d"),
+	(365 * TICKS_PER_DAY, "%Y-%m"),
+	(3652 * TICKS_PER_DAY, "%Y"),
+)
+
+
+def _hexagram_rgb(number):
+	"""Hue from the upper trigram, lightness from the lower, so related hexagrams look related"""
+	hue = UPPER_TRIGRAMS[number] / 8
+	lightness = 0.30 + LOWER_TRIGRAMS[number] * 0.05
+	return tuple(round(channel * 255) for channel in colorsys.hls_to_rgb(hue, lightness, 0.65))
+
+
+def _hex_color(rgb):
+	return "#%02x%02x%02x" % rgb
+
+
+# Colour per hexagram index (0 = hexagram 1), plus running sums over two periods
+# so the mean colour of any run of consecutive hexagrams is one subtraction
+HEXAGRAM_RGB = tuple(_hexagram_rgb(number) for number in range(1, 65))
+HEXAGRAM_COLORS = tuple(_hex_color(rgb) for rgb in HEXAGRAM_RGB)
+_RGB_SUMS = [(0, 0, 0)]
+for _rgb in HEXAGRAM_RGB * 2:
+	_RGB_SUMS.append(tuple(total + channel for total, channel in zip(_RGB_SUMS[-1], _rgb)))
+MEAN_COLOR = _hex_color(tuple(total // 64 for total in _RGB_SUMS[64]))
+
+
+def _mean_color(first_index, count):
+	"""Mean colour of count consecutive hexagram indexes starting at first_index (0-63)"""
+	if count >= 64:
+		return MEAN_COLOR
+	high, low = _RGB_SUMS[first_index + count], _RGB_SUMS[first_index]
+	return _hex_color(tuple((high[channel] - low[channel]) // count for channel in range(3)))
+
+
+def _counter_range(t0, t1, zero_ticks):
+	"""Counter values [low, high) covered while t runs over [t0, t1)"""
+	if t1 <= zero_ticks:
+		return zero_ticks - t1 + 1, zero_ticks - t0 + 1
+	if t0 >= zero_ticks:
+		return t0 - zero_ticks, t1 - zero_ticks
+	return 0, max(zero_ticks - t0, t1 - zero_ticks) + 1
+
+
+def tile_columns(level, first_ticks, ticks_per_pixel, width, zero_ticks):
+	"""Colour and line-change flag for each pixel column of a band tile.
+
+	Columns start at first_ticks (ticks since the epoch) and are
+	ticks_per_pixel wide.
+	"""
+	cycle = CYCLE_TICKS[level - 1]
+	line = LINE_TICKS[level - 1]
+	# Boundaries and line marks only help while they are a few pixels apart
+	show_boundaries = cycle >= 4 * ticks_per_pixel
+	show_lines = line >= 3 * ticks_per_pixel
+	columns = []
+	t0 = first_ticks
+	for _ in range(width):
+		t1 = t0 + ticks_per_pixel
+		low, high = _counter_range(t0, t1, zero_ticks)
+		first, last = low // cycle, (high - 1) // cycle
+		if first == last:
+			color = HEXAGRAM_COLORS[first % 64]
+		elif show_boundaries:
+			color = BOUNDARY_COLOR
+		else:
+			color = _mean_color(first % 64, last - first + 1)
+		columns.append((color, show_lines and low // line != (high - 1) // line))
+		t0 = t1
+	return columns
+
+
+class TimelineView:
+	def __init__(self, root):
+		self.window = tk.Toplevel(root)
+		self.window.title("Hexagram Timeline")
+		self.window.configure(background=constants.DARK_THEME['background'])
+		self.window.geometry("1100x260")
+		self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+		self.levels = constants.TIMELINE_LEVELS
+		self.tile_width = constants.TIMELINE_TILE_WIDTH
+		self.band_height = constants.TIMELINE_BAND_HEIGHT
+		self.tiles = OrderedDict()  # (zero ticks, zoom, level, tile index) -> PhotoImage
+		self.tile_items = {}  # (level, tile index) -> canvas item at the current zoom
+		self.zero_ticks = datetime_to_ticks(constants.ZERO_DATETIME)
+		self.zoom = ZOOM_LEVELS // 2
+		self.view_left = 0  # Pixel coordinate of the canvas's left band edge at this zoom
+		self.drag_x = None
+		self.refresh_job = None
+
+		toolbar = ttk.Frame(self.window)
+		toolbar.pack(fill=tk.X, padx=10, pady=5)
+		ttk.Button(toolbar, text="Zoom In", command=lambda: self.set_zoom(self.zoom - 1)).pack(side=tk.LEFT, padx=5)
+		ttk.Button(toolbar, text="Zoom Out", command=lambda: self.set_zoom(self.zoom + 1)).pack(side=tk.LEFT, padx=5)
+		ttk.Button(toolbar, text="Now", command=self.center_on_now).pack(side=tk.LEFT, padx=5)
+		self.scale_label = ttk.Label(toolbar, text="")
+		self.scale_label.pack(side=tk.LEFT, padx=10)
+
+		self.canvas = tk.Canvas(
+			self.window, background=constants.DARK_THEME['background'], highlightthickness=0,
+			height=RULER_HEIGHT + len(self.levels) * (self.band_height + BAND_GAP)
+		)
+		self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+		self.canvas.bind("<ButtonPress-1>", self.on_drag_start)
+		self.canvas.bind("<B1-Motion>", self.on_drag)
+		self.canvas.bind("<MouseWheel>", self.on_wheel)
+		self.canvas.bind("<Button-4>", self.on_wheel)
+		self.canvas.bind("<Button-5>", self.on_wheel)
+		self.canvas.bind("<Configure>", lambda event: self.update_view())
+
+		for row, level in enumerate(self.levels):
+			y = self.band_y(row)
+			self.canvas.create_rectangle(0, y, LABEL_WIDTH, y + self.band_height, fill=constants.DARK_THEME['background'], width=0, tags="overlay")
+			self.canvas.create_text(5, y + self.band_height // 2, text=f"Level {level}", anchor="w", fill=constants.DARK_THEME['foreground'], tags="overlay")
+
+		self.center_on_now()
+		self.refresh()
+
+	@property
+	def ticks_per_pixel(self):
+		return MIN_TICKS_PER_PIXEL << self.zoom
+
+	def band_y(self, row):
+		return RULER_HEIGHT + row * (self.band_height + BAND_GAP)
+
+	def visible_width(self):
+		return max(self.canvas.winfo_width() - LABEL_WIDTH, self.tile_width)
+
+	def tile_image(self, level, index):
+		key = (self.zero_ticks, self.zoom, level, index)
+		image = self.tiles.get(key)
+		if image is not None:
+			self.tiles.move_to_end(key)
+			return image
+		width = self.tile_width
+		columns = tile_columns(level, index * width * self.ticks_per_pixel, self.ticks_per_pixel, width, self.zero_ticks)
+		plain_row = "{" + " ".join(color for color, _ in columns) + "}"
+		marked_row = "{" + " ".join(LINE_MARK_COLOR if mark else color for color, mark in columns) + "}"
+		mark_top = self.band_height * 2 // 3
+		image = tk.PhotoImage(master=self.canvas, width=width, height=self.band_height)
+		# One row of data is tiled down each region instead of sending every pixel
+		image.put(plain_row, to=(0, 0, width, mark_top))
+		image.put(marked_row, to=(0, mark_top, width, self.band_height))
+		self.tiles[key] = image
+		if len(self.tiles) > constants.TIMELINE_TILE_CACHE_SIZE:
+			self.tiles.popitem(last=False)
+		return image
+
+	def update_view(self):
+		"""Place tiles covering the visible span and drop canvas items that scrolled away"""
+		width = self.tile_width
+		first_index = self.view_left // width
+		last_index = (self.view_left + self.visible_width()) // width
+		wanted = set()
+		for row, level in enumerate(self.levels):
+			for index in range(first_index, last_index + 1):
+				wanted.add((level, index))
+				if (level, index) not in self.tile_items:
+					x = LABEL_WIDTH + index * width - self.view_left
+					self.tile_items[(level, index)] = self.canvas.create_image(
+						x, self.band_y(row), image=self.tile_image(level, index), anchor="nw", tags="tile"
+					)
+		for key in [key for key in self.tile_items if key not in wanted]:
+			self.canvas.delete(self.tile_items.pop(key))
+		self.draw_ruler()
+		self.draw_now_marker()
+		self.canvas.tag_raise("overlay")
+
+	def draw_ruler(self):
+		self.canvas.delete("ruler")
+		ticks_per_pixel = self.ticks_per_pixel
+		step, date_format = next(
+			((step, date_format) for step, date_format in RULER_STEPS if step >= 120 * ticks_per_pixel), RULER_STEPS[-1]
+		)
+		start = self.view_left * ticks_per_pixel
+		end = start + self.visible_width() * ticks_per_pixel
+		for ticks in range(-(-start // step) * step, end, step):
+			x = LABEL_WIDTH + ticks // ticks_per_pixel - self.view_left
+			self.canvas.create_line(x, RULER_HEIGHT - 4, x, RULER_HEIGHT, fill=constants.DARK_THEME['foreground'], tags="ruler")
+			self.canvas.create_text(
+				x + 2, 2, text=f"{ticks_to_datetime(ticks):{date_format}}", anchor="nw",
+				fill=constants.DARK_THEME['foreground'], tags="ruler"
+			)
+
+	def draw_now_marker(self):
+		self.canvas.delete("now")
+		x = LABEL_WIDTH + datetime_to_ticks(datetime.datetime.now()) // self.ticks_per_pixel - self.view_left
+		self.canvas.create_line(x, RULER_HEIGHT, x, self.band_y(len(self.levels)), fill=NOW_COLOR, width=2, tags="now")
+
+	def redraw(self):
+		self.canvas.delete("tile")
+		self.tile_items.clear()
+		days_per_pixel = self.ticks_per_pixel / TICKS_PER_DAY
+		scale = f"{days_per_pixel:.2f} days" if days_per_pixel >= 1 else f"{self.ticks_per_pixel / TICKS_PER_MINUTE:.0f} min"
+		self.scale_label.config(text=f"1 px = {scale}")
+		self.update_view()
+
+	def pan(self, dx):
+		self.view_left -= dx
+		self.canvas.move("tile", dx, 0)
+		self.update_view()
+
+	def set_zoom(self, zoom, anchor_x=None):
+		"""Change zoom keeping the instant under anchor_x (default: the view centre) in place"""
+		zoom = max(0, min(ZOOM_LEVELS - 1, zoom))
+		if zoom == self.zoom:
+			return
+		if anchor_x is None:
+			anchor_x = LABEL_WIDTH + self.visible_width() // 2
+		offset = anchor_x - LABEL_WIDTH
+		anchor_ticks = (self.view_left + offset) * self.ticks_per_pixel
+		self.zoom = zoom
+		self.view_left = anchor_ticks // self.ticks_per_pixel - offset
+		self.redraw()
+
+	def center_on_now(self):
+		now = datetime_to_ticks(datetime.datetime.now())
+		self.view_left = now // self.ticks_per_pixel - self.visible_width() // 2
+		self.redraw()
+
+	def on_drag_start(self, event):
+		self.drag_x = event.x
+
+	def on_drag(self, event):
+		if self.drag_x is not None and event.x != self.drag_x:
+			self.pan(event.x - self.drag_x)
+			self.drag_x = event.x
+
+	def on_wheel(self, event):
+		zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+		self.set_zoom(self.zoom - 1 if zoom_in else self.zoom + 1, event.x)
+
+	def refresh(self):
+		"""Move the now marker, and re-render if the zero date was changed elsewhere"""
+		zero_ticks = datetime_to_ticks(constants.ZERO_DATETIME)
+		if zero_ticks != self.zero_ticks:
+			self.zero_ticks = zero_ticks
+			self.tiles.clear()
+			self.redraw()
+		else:
+			self.draw_now_marker()
+		self.refresh_job = self.window.after(1000, self.refresh)
+
+	def exists(self):
+		return self.window is not None and bool(self.window.winfo_exists())
+
+	def lift(self):
+		self.window.lift()
+
+	def close(self):
+		if self.refresh_job is not None:
+			self.window.after_cancel(self.refresh_job)
+		self.tiles.clear()
+		self.window.destroy()
+		self.window = None
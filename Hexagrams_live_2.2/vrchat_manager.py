@@ -1,94 +1,138 @@
 import datetime
-from pythonosc import udp_client
+import time
+from pythonosc import osc_bundle_builder, osc_message_builder, udp_client
 import constants
+from avatar_parameters import AvatarParameterStream
+from hexagram_calculator import CYCLE_TICKS, TICKS_PER_DAY, TICKS_PER_HOUR, TICKS_PER_SECOND
+from hexagram_data import SHORT_NAMES
 
 class VRChatManager:
-	def __init__(self):
-		self.client = udp_client.SimpleUDPClient(constants.VRCHAT_IP, constants.VRCHAT_PORT)
+	def __init__(self, connect=True):
+		# connect=False leaves the socket to a subclass that sends some other way
+		self.client = udp_client.SimpleUDPClient(constants.VRCHAT_IP, constants.VRCHAT_PORT) if connect else None
+		self.avatar_parameters = AvatarParameterStream()
 
 	def send_message(self, message):
 		if not constants.SEND_TO_VRCHAT_ENABLED or constants.EXIT_FLAG:
 			return
 		try:
-			self.client.send_message("/chatbox/input", [message, True, False])
+			self.send_osc("/chatbox/input", [message, True, False])
 			print("Message sent to VRChat")
 		except Exception as e:
 			if not constants.EXIT_FLAG:
 				print(f"[VRChatManager] Error sending message to VRChat: {e}")
 			pass
 
-	def format_message_page1(self, hexagrams, time_to_zero, level6_days=None, level6_moving_line=None):
-		current_date = datetime.datetime.now().date()
-		days_to_zero = round(time_to_zero.total_seconds() / 86400)
-		hours_to_zero = int((time_to_zero.total_seconds() % 86400) // 3600)
-		
-		message = f"Date: {current_date}\nDays_to_0: {days_to_zero}d{hours_to_zero}h\n"
-		
-		# Find level 3 for the Change line
-		for level, cycle_length, cycle_name, hexagram_number, hexagram_name, time_since_last_change in hexagrams:
-			if level == 3:
-				time_to_next_change = datetime.timedelta(seconds=time_since_last_change) - cycle_length
-				time_time = (cycle_length - abs(time_to_next_change))
-				hours = int(abs(time_time.seconds // 3600))
-				minutes = int(abs((time_time.seconds % 3600) // 60))
-				seconds = int(abs(time_time.seconds % 60))
-				message += f"Change: {hours:02d}:{minutes:02d}:{seconds:02d}\n"
-				break
-
-		# Add levels 4 and 5 as before
-		for level in [4, 5]:
-			for l, cycle_length, cycle_name, hexagram_number, hexagram_name, time_since_last_change in hexagrams:
-				if l == level:
-					hexagram_first_name = hexagram_name.split(" - ")[0]
-					moving_line = (time_since_last_change // (cycle_length.total_seconds() / 6)) + 1
-					days = cycle_length.total_seconds() / 86400
-					message += f"L {level}: {days:.0f} d, {hexagram_number}-{hexagram_first_name} - {moving_line}\n"
-					break
-
-		# Add level 6 using the exact values from the GUI for days and moving line
-		if level6_days is not None and level6_moving_line is not None:
-			# Find the level 6 hexagram name and number
-			for l, cycle_length, cycle_name, hexagram_number, hexagram_name, time_since_last_change in hexagrams:
-				if l == 6:
-					hexagram_first_name = hexagram_name.split(" - ")[0]
-					message += f"L 6: {level6_days} d, {hexagram_number}-{hexagram_first_name} - {level6_moving_line}\n"
-					break
-		else:
-			for l, cycle_length, cycle_name, hexagram_number, hexagram_name, time_since_last_change in hexagrams:
-				if l == 6:
-					line_change_interval = cycle_length.total_seconds() / 6
-					time_until_next_line_change = line_change_interval - (time_since_last_change % line_change_interval)
-					days = int(time_until_next_line_change // 86400)
-					moving_line = int((time_since_last_change // line_change_interval) + 1)
-					hexagram_first_name = hexagram_name.split(" - ")[0]
-					message += f"L 6: {days} d, {hexagram_number}-{hexagram_first_name} - {moving_line}\n"
-					break
-
-		return message
-
-	def format_message_page2(self, hexagrams, time_to_zero):
-		message = ""
-		for level, cycle_length, _cycle_name, hexagram_number, hexagram_name, time_since_last_change in hexagrams:
-			if level > 3:
-				continue
-				
-			hexagram_first_name = hexagram_name.split(" - ")[0]
-			moving_line = (time_since_last_change // (cycle_length.total_seconds() / 6)) + 1
-
-			if level == 1:
-				cycle_length_str = f"{cycle_length.total_seconds():.2f}"
-				message += f"L {level}: {cycle_length_str} s, {hexagram_number} - {hexagram_first_name}\n"
-			elif level == 2:
-				minutes = int(abs(time_since_last_change // 60))
-				seconds = int(abs(time_since_last_change % 60))
-				message += f"L 2: change {minutes:02d}:{seconds:02d}\n"
-				message += f"L {level}: {cycle_length.total_seconds():.2f} s, {hexagram_number} - {hexagram_first_name} - {moving_line}\n"
-			elif level == 3:
-				hours = int(abs(time_since_last_change // 3600))
-				minutes = int(abs((time_since_last_change % 3600) // 60))
-				seconds = int(abs(time_since_last_change % 60))
-				message += f"L 3 change {hours:02d}:{minutes:02d}:{seconds:02d}\n"
-				cycle_length_str = f"{cycle_length.total_seconds() / 3600:.2f}"
-				message += f"L {level}: {cycle_length_str} h, {hexagram_number} - {hexagram_first_name} - {moving_line}\n"
-
-		return message
\ No newline at end of file
+	def send_avatar_parameters(self, snapshot):
+		"""Send the avatar parameters that changed since the last call as one OSC bundle"""
+		if not constants.SEND_AVATAR_PARAMETERS_ENABLED or constants.EXIT_FLAG:
+			return
+		messages = self.avatar_parameters.changes(snapshot, time.monotonic())
+		if not messages:
+			return
+		try:
+			self.send_osc_bundle(messages)
+		except Exception as e:
+			if not constants.EXIT_FLAG:
+				print(f"[VRChatManager] Error sending avatar parameters to VRChat: {e}")
+
+	def send_osc(self, address, args):
+		self.client.send_message(address, args)
+
+	def send_osc_bundle(self, messages):
+		"""Send (address, value) pairs together in a single UDP packet"""
+		self.client.send(self.build_bundle(messages))
+
+	def build_bundle(self, messages):
+		bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+		for address, value in messages:
+			message = osc_message_builder.OscMessageBuilder(address=address)
+			message.add_arg(value)
+			bundle.add_content(message.build())
+		return bundle.build()
+
+	def close(self):
+		"""Close the OSC client socket"""
+		if hasattr(self.client, 'close'):
+			try:
+				self.client.close()
+			except Exception as e:
+				print(f"[VRChatManager] Error closing OSC client: {e}")
+
+	def format_message_page1(self, snapshot, level6_days=None, level6_moving_line=None):
+		return format_message_page1(snapshot, level6_days, level6_moving_line)
+
+	def format_message_page2(self, snapshot):
+		return format_message_page2(snapshot)
+
+	def format_message_page3(self, snapshot):
+		return format_message_page3(snapshot)
+
+
+# Chatbox pages, shared by the app and the headless session server
+def format_message_page1(snapshot, level6_days=None, level6_moving_line=None):
+	current_date = datetime.datetime.now().date()
+	days_to_zero = round(snapshot.ticks_to_zero / TICKS_PER_DAY)
+	hours_to_zero = snapshot.ticks_to_zero % TICKS_PER_DAY // TICKS_PER_HOUR
+	
+	message = f"Date: {current_date}\nDays_to_0: {days_to_zero}d{hours_to_zero}h\n"
+	
+	# Level 3 countdown for the Change line
+	seconds = snapshot.ticks_to_hexagram_change(3) // TICKS_PER_SECOND
+	message += f"Change: {seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}\n"
+
+	# Add levels 4 and 5 as before
+	for level in [4, 5]:
+		hexagram_first_name = snapshot.short_name(level)
+		days = CYCLE_TICKS[level - 1] / TICKS_PER_DAY
+		message += f"L {level}: {days:.0f} d, {snapshot.hexagram_number(level)}-{hexagram_first_name} - {snapshot.moving_line(level)}\n"
+
+	# Add level 6 using the exact values from the GUI for days and moving line
+	if level6_days is None or level6_moving_line is None:
+		level6_days = snapshot.ticks_to_line_change(6) // TICKS_PER_DAY
+		level6_moving_line = snapshot.moving_line(6)
+	hexagram_first_name = snapshot.short_name(6)
+	message += f"L 6: {level6_days} d, {snapshot.hexagram_number(6)}-{hexagram_first_name} - {level6_moving_line}\n"
+
+	return fit_chatbox(message)
+
+
+def format_message_page2(snapshot):
+	message = ""
+	for level in range(1, 4):
+		hexagram_number = snapshot.hexagram_number(level)
+		hexagram_first_name = snapshot.short_name(level)
+		moving_line = snapshot.moving_line(level)
+		seconds = snapshot.ticks_to_hexagram_change(level) // TICKS_PER_SECOND
+
+		if level == 1:
+			cycle_length_str = f"{CYCLE_TICKS[0] / TICKS_PER_SECOND:.2f}"
+			message += f"L {level}: {cycle_length_str} s, {hexagram_number} - {hexagram_first_name}\n"
+		elif level == 2:
+			message += f"L 2: change {seconds // 60:02d}:{seconds % 60:02d}\n"
+			message += f"L {level}: {CYCLE_TICKS[1] / TICKS_PER_SECOND:.2f} s, {hexagram_number} - {hexagram_first_name} - {moving_line}\n"
+		elif level == 3:
+			message += f"L 3 change {seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}\n"
+			cycle_length_str = f"{CYCLE_TICKS[2] / TICKS_PER_HOUR:.2f}"
+			message += f"L {level}: {cycle_length_str} h, {hexagram_number} - {hexagram_first_name} - {moving_line}\n"
+
+	return fit_chatbox(message)
+
+
+def format_message_page3(snapshot):
+	"""Derived hexagrams for the slower levels, one line each: hexagram.line > changed-Name N nuclear I inverse"""
+	message = ""
+	for level in range(3, 7):
+		changed = snapshot.changed_hexagram(level)
+		message += (
+			f"L{level} {snapshot.hexagram_number(level)}.{snapshot.moving_line(level)}>{changed}-{SHORT_NAMES[changed]}"
+			f" N{snapshot.nuclear_hexagram(level)} I{snapshot.inverse_hexagram(level)}\n"
+		)
+	return fit_chatbox(message)
+
+
+def fit_chatbox(message):
+	"""Drop whole trailing lines until the message fits VRChat's chatbox limit"""
+	while len(message) > constants.CHATBOX_MAX_LENGTH:
+		message = message[:message.rstrip("\n").rfind("\n") + 1]
+	return message
@@ -0,0 +1,222 @@
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+import constants
+from sound_manager import SoundManager
+from vrchat_manager import VRChatManager
+
+# Minimum seconds between restarts of a crashed worker, so a worker that dies on
+# startup (missing audio device, bad OSC address) cannot spin in a restart loop
+RESTART_DELAY = 1.0
+# Messages waiting for the sender thread before new ones are dropped
+WORKER_QUEUE_SIZE = 256
+
+
+def audio_worker_main(connection, sounds_dir):
+	"""Own the pygame mixer and play the cue groups received over the pipe"""
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+	constants.SOUNDS_DIR = sounds_dir
+	sound_manager = SoundManager()
+	try:
+		while True:
+			try:
+				command, payload = connection.recv()
+			except EOFError:
+				break
+			if command == 'stop':
+				break
+			if command == 'cues':
+				sound_manager.start_voice(payload)
+	finally:
+		sound_manager.cleanup()
+
+
+def osc_worker_main(connection, ip, port):
+	"""Own the OSC socket and send the (address, args) pairs and bundles received over the pipe"""
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+	constants.VRCHAT_IP = ip
+	constants.VRCHAT_PORT = port
+	vrchat_manager = VRChatManager()
+	try:
+		while True:
+			try:
+				command, payload = connection.recv()
+			except EOFError:
+				break
+			if command == 'stop':
+				break
+			if command == 'send':
+				address, args = payload
+				try:
+					vrchat_manager.send_osc(address, args)
+				except Exception as e:
+					print(f"[OSCWorker] Error sending {address}: {e}")
+			elif command == 'bundle':
+				try:
+					vrchat_manager.send_osc_bundle(payload)
+				except Exception as e:
+					print(f"[OSCWorker] Error sending bundle of {len(payload)} messages: {e}")
+	finally:
+		vrchat_manager.close()
+
+
+class WorkerProcess:
+	"""A child process fed over a one-way pipe, restarted automatically if it dies.
+
+	send() only queues the message. A sender thread owns the pipe and does every
+	step that can block: starting the process, writing to the pipe and restarting
+	a worker that died or broke the pipe. A stalled worker therefore costs the
+	caller nothing; once WORKER_QUEUE_SIZE messages are waiting, new ones are dropped.
+	"""
+
+	def __init__(self, name, target, args=()):
+		self.name = name
+		self.target = target
+		self.args = args
+		self.process = None
+		self.connection = None
+		self.last_start = 0.0
+		self.restarts = 0
+		self.dropped = 0
+		self.queue = queue.Queue(maxsize=WORKER_QUEUE_SIZE)
+		self.sender_thread = None
+		self.stopping = False
+
+	def start(self):
+		"""Start the sender thread, which starts the worker process"""
+		if self.sender_thread is not None:
+			return
+		self.stopping = False
+		self.sender_thread = threading.Thread(target=self.sender_loop, name=f"{self.name}Sender", daemon=True)
+		self.sender_thread.start()
+
+	def start_process(self):
+		receiver, sender = multiprocessing.Pipe(duplex=False)
+		self.process = multiprocessing.Process(
+			target=self.target, args=(receiver,) + self.args, name=self.name, daemon=True
+		)
+		self.process.start()
+		receiver.close()
+		self.connection = sender
+		self.last_start = time.monotonic()
+
+	def ensure_running(self):
+		"""Restart the worker if it has died; returns False while waiting out the restart delay"""
+		if self.process is not None and self.process.is_alive():
+			return True
+		if self.stopping or time.monotonic() - self.last_start < RESTART_DELAY:
+			return False
+		if self.process is not None:
+			print(f"[{self.name}] Worker exited with code {self.process.exitcode}, restarting")
+			self.restarts += 1
+			self.connection.close()
+		self.start_process()
+		return True
+
+	def send(self, command, payload=None):
+		"""Queue a message for the worker without blocking; dropped if the queue is full"""
+		if constants.EXIT_FLAG:
+			return
+		try:
+			self.queue.put_nowait((command, payload))
+		except queue.Full:
+			self.dropped += 1
+			if self.dropped == 1:
+				print(f"[{self.name}] Worker is not keeping up, dropping messages")
+
+	def sender_loop(self):
+		self.ensure_running()
+		while True:
+			message = self.queue.get()
+			if message is None:
+				self.send_now(('stop', None), retry=False)
+				return
+			if self.ensure_running():
+				self.send_now(message)
+
+	def send_now(self, message, retry=True):
+		try:
+			self.connection.send(message)
+		except (BrokenPipeError, EOFError, OSError) as e:
+			if not retry or self.stopping:
+				return
+			# The pipe is broken whether or not the process still runs; retry once on a fresh worker
+			self.restart()
+			try:
+				self.connection.send(message)
+			except (BrokenPipeError, EOFError, OSError) as e:
+				print(f"[{self.name}] Dropped {message[0]!r} after a restart: {e}")
+
+	def restart(self):
+		"""Replace the worker and its pipe now, without waiting out the restart delay"""
+		print(f"[{self.name}] Pipe to the worker broke, restarting")
+		if self.process.is_alive():
+			self.process.terminate()
+		self.process.join(timeout=0.1)
+		self.connection.close()
+		self.restarts += 1
+		self.start_process()
+
+	def stop(self, timeout=1.0):
+		"""Send the queued messages and a stop command, then wait for the worker to exit"""
+		if self.sender_thread is None:
+			return
+		self.stopping = True
+		try:
+			self.queue.put(None, timeout=timeout)
+		except queue.Full:
+			pass
+		self.sender_thread.join(timeout)
+		# Still running means the sender is blocked on a stalled worker; terminating it breaks the pipe
+		if self.process is not None:
+			self.process.join(timeout)
+			if self.process.is_alive():
+				self.process.terminate()
+				self.process.join(timeout)
+		self.sender_thread.join(timeout)
+		if self.connection is not None:
+			self.connection.close()
+		self.process = None
+		self.connection = None
+		self.sender_thread = None
+		self.queue = queue.Queue(maxsize=WORKER_QUEUE_SIZE)
+
+
+class AudioWorkerClient(SoundManager):
+	"""SoundManager stand-in that forwards each tick's cue group to a separate audio process"""
+
+	def __init__(self, start=True):
+		# Parent state stays idle (no mixer, no sounds); inherited helpers forward through start_voice
+		super().__init__(start=False)
+		self.worker = WorkerProcess('AudioWorker', audio_worker_main, (constants.SOUNDS_DIR,))
+		if start:
+			self.start()
+
+	def start(self):
+		self.worker.start()
+
+	def start_voice(self, sound_keys):
+		self.worker.send('cues', sound_keys)
+
+	def cleanup(self):
+		self.worker.stop()
+
+
+class OSCWorkerClient(VRChatManager):
+	"""VRChatManager stand-in that formats locally and sends through a separate OSC process"""
+
+	def __init__(self):
+		super().__init__(connect=False)
+		self.worker = WorkerProcess('OSCWorker', osc_worker_main, (constants.VRCHAT_IP, constants.VRCHAT_PORT))
+		self.worker.start()
+
+	def send_osc(self, address, args):
+		self.worker.send('send', (address, args))
+
+	def send_osc_bundle(self, messages):
+		self.worker.send('bundle', messages)
+
+	def close(self):
+		self.worker.stop()
@@ -0,0 +1,52 @@
+"""Evaluate one instant against several zero dates at once.
+
+The zero dates are converted to ticks once, when the list is set. A frame then
+costs one subtraction per zero date plus a single snapshots_at_ticks pass, and
+no datetime arithmetic.
+"""
+import datetime
+from hexagram_calculator import FIELD_COUNT, HEXAGRAM_NUMBER, LEVEL_COUNT, MOVING_LINE, TICKS_PER_DAY, datetime_to_ticks, snapshots_at_ticks
+
+COMPARISON_HEADER = f"{'Zero Date':<21}{'Days to 0':>10}" + "".join(f"  L{level:<5}" for level in range(1, LEVEL_COUNT + 1))
+
+
+def parse_zero_dates(text):
+	"""Zero dates from text, one per line or comma separated, as YYYY-MM-DD[ HH:MM:SS]"""
+	zero_datetimes = []
+	for part in text.replace(",", "\n").splitlines():
+		if part.strip():
+			zero_datetimes.append(datetime.datetime.fromisoformat(part.strip()))
+	return zero_datetimes
+
+
+# Hexagram number and moving line of every level, in snapshot.values order
+_ROW_FIELDS = tuple(
+	(level - 1) * FIELD_COUNT + field for level in range(1, LEVEL_COUNT + 1) for field in (HEXAGRAM_NUMBER, MOVING_LINE)
+)
+_ROW_FORMAT = "%s  %10.2f" + "  %2d.%d  " * LEVEL_COUNT
+
+
+def _format_row(zero_label, snapshot):
+	"""Compact row: zero date, days to it, and hexagram.moving line per level"""
+	values = snapshot.values
+	return _ROW_FORMAT % ((zero_label, snapshot.ticks_to_zero / TICKS_PER_DAY) + tuple([values[index] for index in _ROW_FIELDS]))
+
+
+class ZeroDateComparison:
+	def __init__(self, zero_datetimes):
+		self.set_zero_datetimes(zero_datetimes)
+
+	def set_zero_datetimes(self, zero_datetimes):
+		self.zero_datetimes = list(zero_datetimes)
+		self.zero_ticks = [datetime_to_ticks(zero_datetime) for zero_datetime in self.zero_datetimes]
+		self.zero_labels = [f"{zero_datetime:%Y-%m-%d %H:%M:%S}" for zero_datetime in self.zero_datetimes]
+
+	def snapshots_at_ticks(self, now_ticks):
+		"""Snapshots for every zero date at an instant given in ticks since the epoch"""
+		return snapshots_at_ticks([zero_ticks - now_ticks for zero_ticks in self.zero_ticks])
+
+	def format_rows(self, now_ticks):
+		return [
+			_format_row(zero_label, snapshot)
+			for zero_label, snapshot in zip(self.zero_labels, self.snapshots_at_ticks(now_ticks))
+		]
@@ -0,0 +1,134 @@
+"""Find every zero date consistent with observed hexagrams.
+
+An observation says that at datetime t, level L showed hexagram h (and
+optionally moving line n). With x = |zero - t| in ticks, that holds exactly
+when x lies in one of the periodic intervals
+
+    [m * 64 * cycle + (h - 1) * cycle + (n - 1) * line,  ... + width)
+
+where width is one line if n is given, otherwise one whole cycle. The solver
+starts from the search window and refines it one observation at a time,
+coarsest level first. Each step only enumerates the periodic intervals that
+fall inside the candidates left by the previous step.
+"""
+import datetime
+from itertools import islice
+from hexagram_calculator import CYCLE_TICKS, LINE_TICKS, TICKS_PER_MICROSECOND, datetime_to_ticks, ticks_to_datetime
+
+OBSERVATION_FORMAT = "YYYY-MM-DD HH:MM:SS level hexagram [line]"
+
+
+def parse_observation(text):
+	"""Parse 'YYYY-MM-DD HH:MM:SS level hexagram [line]' into an observation tuple"""
+	parts = text.split()
+	if len(parts) not in (4, 5):
+		raise ValueError(f"Expected '{OBSERVATION_FORMAT}', got '{text}'")
+	observed_at = datetime.datetime.strptime(f"{parts[0]} {parts[1]}", "%Y-%m-%d %H:%M:%S")
+	level, hexagram = int(parts[2]), int(parts[3])
+	line = int(parts[4]) if len(parts) == 5 else None
+	if not 1 <= level <= 6 or not 1 <= hexagram <= 64 or (line is not None and not 1 <= line <= 6):
+		raise ValueError(f"Level must be 1-6, hexagram 1-64 and line 1-6: '{text}'")
+	return (observed_at, level, hexagram, line)
+
+
+def _counter_intervals(level, hexagram, line, low, high):
+	"""Periodic counter intervals [a, b) matching an observation that overlap [low, high)"""
+	cycle = CYCLE_TICKS[level - 1]
+	period = 64 * cycle
+	offset = (hexagram - 1) * cycle
+	width = cycle
+	if line is not None:
+		offset += (line - 1) * LINE_TICKS[level - 1]
+		width = LINE_TICKS[level - 1]
+	start = offset + max(0, (low - offset - width) // period + 1) * period
+	while start < high:
+		yield max(start, low), min(start + width, high)
+		start += period
+
+
+def observation_intervals(observation, low, high, limit=None):
+	"""Zero-date intervals [low', high') within [low, high) consistent with one observation.
+
+	With a limit, each side of the observation stops after that many intervals.
+	"""
+	observed_at, level, hexagram, line = observation
+	observed = datetime_to_ticks(observed_at)
+	intervals = []
+	# Zero date at or after the observation: counter = zero - observed
+	if high > observed:
+		base = max(low, observed)
+		for start, end in islice(_counter_intervals(level, hexagram, line, base - observed, high - observed), limit):
+			intervals.append((observed + start, observed + end))
+	# Zero date before it: counter = observed - zero, so zero = observed - counter
+	if low < observed:
+		top = min(high, observed)
+		for start, end in islice(_counter_intervals(level, hexagram, line, observed - top + 1, observed - low + 1), limit):
+			intervals.append((observed - end + 1, observed - start + 1))
+	intervals.sort()
+	return intervals
+
+
+def _merge(intervals):
+	merged = []
+	for start, end in intervals:
+		if merged and start <= merged[-1][1]:
+			merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+		else:
+			merged.append((start, end))
+	return merged
+
+
+def solve_zero_dates(observations, window_start, window_end, max_intervals=10000):
+	"""Every zero-date interval in [window_start, window_end) matching all observations.
+
+	Returns (intervals, truncated) where intervals is a list of (start, end)
+	datetimes and truncated is True when more than max_intervals candidates
+	remained at some step (add a coarser observation or narrow the window).
+	"""
+	if window_end <= window_start:
+		raise ValueError("Search window end must be after its start")
+	# Coarsest first, so fine levels only scan inside already narrow candidates
+	ordered = sorted(observations, key=lambda obs: (obs[1], obs[3] is not None), reverse=True)
+	candidates = [(datetime_to_ticks(window_start), datetime_to_ticks(window_end))]
+	truncated = False
+	for observation in ordered:
+		refined = []
+		for low, high in candidates:
+			refined.extend(observation_intervals(observation, low, high, max_intervals - len(refined) + 1))
+			if len(refined) > max_intervals:
+				truncated = True
+				break
+		candidates = _merge(refined[:max_intervals])
+		if not candidates:
+			break
+	# Datetimes have microsecond resolution: round starts up so every returned instant matches
+	results = []
+	for low, high in candidates:
+		low = -(-low // TICKS_PER_MICROSECOND) * TICKS_PER_MICROSECOND
+		if low < high:
+			results.append((ticks_to_datetime(low), ticks_to_datetime(high)))
+	return results, truncated
+
+
+def representative_zero_date(start, end):
+	"""A readable zero date inside [start, end): midnight, else a whole second, else start"""
+	midnight = datetime.datetime.combine(start.date(), datetime.time())
+	if midnight < start:
+		midnight += datetime.timedelta(days=1)
+	if midnight < end:
+		return midnight
+	whole_second = start.replace(microsecond=0)
+	if whole_second < start:
+		whole_second += datetime.timedelta(seconds=1)
+	return whole_second if whole_second < end else start
+
+
+def format_interval(start, end):
+	span = (end - start).total_seconds()
+	if span >= 86400:
+		span_text = f"{span / 86400:.2f} d"
+	elif span >= 1:
+		span_text = f"{span:.3f} s"
+	else:
+		span_text = f"{span * 1000:.3f} ms"
+	return f"{start} -> {end} ({span_text})"